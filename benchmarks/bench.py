@@ -0,0 +1,293 @@
+"""Offline benchmarks for the subtitle pipeline stages.
+
+Generates a synthetic test video with ffmpeg's lavfi sources (or uses
+``--input``), then times each stage on it: audio extraction, VAD, Whisper
+(tiny model by default), translation through the offline FakeBackend,
+SRT writing and burning. Every stage runs in a fresh process that first
+loads just its inputs, so peak memory is measured per stage. Results are
+written as JSON and can be compared against a stored baseline:
+
+    python -m benchmarks.bench --seconds 120 --out results.json
+    python -m benchmarks.bench --save-baseline benchmarks/baseline.json
+    python -m benchmarks.bench --baseline benchmarks/baseline.json
+
+The synthetic audio is a tone, so transcription numbers measure
+throughput, not accuracy. Baselines are machine specific; record one on
+the machine you compare on.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+from config import ENCODER_PRESETS
+from engine import FakeBackend
+from engine.audio import SAMPLE_RATE, extract_audio, probe_duration
+from engine.burn import burn_subtitles
+from engine.metrics import StageTimer
+from engine.subtitles import write_subtitles
+from engine.transcribe import load_model, transcribe
+from engine.translate import translate_segments
+from engine.translation_cache import TranslationCache
+from engine.vad import skip_silence
+
+STAGES = ["extract", "vad", "model_load", "transcribe", "translate", "srt", "burn"]
+
+# Slowdowns smaller than this are timer noise, whatever the percentage.
+NOISE_SECONDS = 0.05
+
+
+def make_fixture(path, seconds, size="1280x720"):
+    """Write a test-pattern video with a tone soundtrack using lavfi."""
+    cmd = [
+        "ffmpeg", "-y", "-v", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate=25",
+        "-f", "lavfi", "-i", "sine=frequency=220:sample_rate=44100",
+        "-t", str(seconds),
+        "-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p",
+        "-c:a", "aac", "-shortest",
+        path,
+    ]
+    subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL)
+
+
+def synthetic_segments(count, seconds):
+    """Evenly spaced segments with distinct, sentence-like text."""
+    step = seconds / count
+    return [
+        {
+            "id": i,
+            "start": i * step,
+            "end": (i + 0.9) * step,
+            "text": f" This is synthetic subtitle line number {i} for the benchmark.",
+        }
+        for i in range(count)
+    ]
+
+
+def _stage_inputs(stage, video_path, seconds, work_dir, args):
+    """Prepare what ``stage`` consumes, untimed."""
+    state = {"segments": synthetic_segments(args.segments, seconds)}
+    if stage in ("vad", "transcribe"):
+        state["audio"] = extract_audio(video_path)
+    if stage == "transcribe":
+        state["model"] = load_model(args.model)
+    if stage == "burn":
+        state["srt_path"] = os.path.join(work_dir, "bench.srt")
+        write_subtitles(state["segments"], state["srt_path"])
+    return state
+
+
+def run_stage(stage, video_path, seconds, work_dir, args):
+    """Prepare the inputs of one stage, then run and measure it.
+
+    Meant to run in a fresh process (see ``run_stages``): ``peak_rss_mb``
+    is that process's high-water mark, and ``rss_growth_mb`` how far the
+    stage raised it above what its inputs already took.
+    """
+    state = _stage_inputs(stage, video_path, seconds, work_dir, args)
+    segments = state["segments"]
+
+    def measure(units, unit, fn):
+        timer = StageTimer(stage)
+        fn()
+        event = timer.event(seconds)
+        before = timer.usage[2]
+        return {
+            "wall_seconds": event["wall_seconds"],
+            "cpu_seconds": event["cpu_seconds"],
+            "child_cpu_seconds": event["child_cpu_seconds"],
+            "peak_rss_mb": event["peak_rss_mb"],
+            "rss_growth_mb": (
+                round(event["peak_rss_mb"] - before, 1) if before is not None else None
+            ),
+            "units": units,
+            "unit": unit,
+            "throughput": (
+                round(units / event["wall_seconds"], 3) if event["wall_seconds"] else None
+            ),
+        }
+
+    if stage == "extract":
+        return measure(seconds, "audio s", lambda: extract_audio(video_path))
+    if stage == "vad":
+        return measure(seconds, "audio s", lambda: skip_silence(state["audio"]))
+    if stage == "model_load":
+        return measure(1, "load", lambda: load_model(args.model))
+    if stage == "transcribe":
+        audio = state["audio"][:int(args.transcribe_seconds * SAMPLE_RATE)]
+        return measure(
+            len(audio) / SAMPLE_RATE, "audio s",
+            lambda: transcribe(state["model"], audio, "original"),
+        )
+    if stage == "translate":
+        # A fresh cache per run, so every run translates cold.
+        cache = TranslationCache(
+            os.path.join(work_dir, f"translations-{time.perf_counter_ns()}.sqlite")
+        )
+        return measure(
+            len(segments), "segments",
+            lambda: translate_segments(
+                [dict(s) for s in segments], "es",
+                backend=FakeBackend(), cache=cache, verbose=False,
+            ),
+        )
+    if stage == "srt":
+        srt_path = os.path.join(work_dir, "bench.srt")
+        return measure(len(segments), "segments", lambda: write_subtitles(segments, srt_path))
+    out = os.path.join(work_dir, "burned" + os.path.splitext(video_path)[1])
+    return measure(
+        seconds, "video s",
+        lambda: burn_subtitles(video_path, state["srt_path"], out, encoder_preset=args.preset),
+    )
+
+
+def run_stages(video_path, seconds, work_dir, args):
+    """Run the selected stages once. Returns {stage: measurement}.
+
+    Each stage runs in its own fresh process, so its memory figures are
+    not inflated by whatever earlier stages held on to (``ru_maxrss``
+    only ever grows).
+    """
+    selected = {"extract", *args.stages}
+    if "transcribe" in selected:
+        selected.add("model_load")
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for stage in STAGES:
+        if stage not in selected:
+            continue
+        with context.Pool(1) as pool:
+            result = pool.apply(run_stage, (stage, video_path, seconds, work_dir, args))
+        results[stage] = result
+        print(f"  {stage:<11} {result['wall_seconds']:8.3f}s  "
+              f"{result['throughput'] or 0:10.1f} {result['unit']}/s  "
+              f"{result['peak_rss_mb'] or 0:8.1f} MB")
+    return results
+
+
+def best_of(runs):
+    """Per stage, keep the run with the lowest wall time."""
+    best = {}
+    for run in runs:
+        for stage, result in run.items():
+            if stage not in best or result["wall_seconds"] < best[stage]["wall_seconds"]:
+                best[stage] = result
+    return best
+
+
+def compare(current, baseline, time_threshold, memory_threshold):
+    """Print a comparison table; return the stages that regressed."""
+    regressions = []
+    print(f"\n{'stage':<11} {'baseline':>10} {'current':>10} {'change':>8}  memory")
+    for stage, result in current["stages"].items():
+        base = baseline["stages"].get(stage)
+        if not base:
+            print(f"{stage:<11} {'-':>10} {result['wall_seconds']:>9.3f}s {'new':>8}")
+            continue
+        change = result["wall_seconds"] / base["wall_seconds"] - 1 if base["wall_seconds"] else 0.0
+        flags = []
+        slower_by = result["wall_seconds"] - base["wall_seconds"]
+        if change > time_threshold and slower_by > NOISE_SECONDS:
+            flags.append("SLOWER")
+        memory = ""
+        if base.get("peak_rss_mb") and result.get("peak_rss_mb"):
+            memory_change = result["peak_rss_mb"] / base["peak_rss_mb"] - 1
+            memory = f"{memory_change:+.0%}"
+            if memory_change > memory_threshold:
+                flags.append("MORE MEMORY")
+        if flags:
+            regressions.append(stage)
+        print(
+            f"{stage:<11} {base['wall_seconds']:>9.3f}s {result['wall_seconds']:>9.3f}s "
+            f"{change:>+8.0%}  {memory:<6} {' '.join(flags)}"
+        )
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.bench",
+        description="Benchmark the subtitle pipeline stages on a synthetic video.",
+    )
+    parser.add_argument("--input", help="Benchmark this video instead of a synthetic one.")
+    parser.add_argument("--seconds", type=float, default=60,
+                        help="Length of the synthetic video.")
+    parser.add_argument("--size", default="1280x720", help="Synthetic video resolution.")
+    parser.add_argument("--stages", nargs="+", default=STAGES, choices=STAGES,
+                        help="Stages to run (extract always runs).")
+    parser.add_argument("--model", default="tiny", help="Whisper model for transcribe.")
+    parser.add_argument("--transcribe-seconds", type=float, default=30,
+                        help="Audio fed to Whisper (it dominates the run time).")
+    parser.add_argument("--segments", type=int, default=2000,
+                        help="Synthetic segments for translate/srt/burn.")
+    parser.add_argument("--preset", default="fast", choices=list(ENCODER_PRESETS),
+                        help="Encoder preset for burn.")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per stage; the fastest is kept.")
+    parser.add_argument("--out", default="benchmark_results.json", help="Results file.")
+    parser.add_argument("--baseline", help="Compare against this results file.")
+    parser.add_argument("--save-baseline", help="Also write the results here.")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed slowdown per stage (0.15 = 15%%).")
+    parser.add_argument("--memory-threshold", type=float, default=0.25,
+                        help="Allowed peak memory growth per stage.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    with tempfile.TemporaryDirectory(prefix="subtitle-bench-") as work_dir:
+        if args.input:
+            video_path = args.input
+            seconds = probe_duration(video_path)
+        else:
+            video_path = os.path.join(work_dir, "fixture.mp4")
+            seconds = args.seconds
+            print(f"Generating {seconds:g}s {args.size} test video...")
+            make_fixture(video_path, seconds, args.size)
+
+        runs = []
+        for i in range(args.repeat):
+            print(f"Run {i + 1}/{args.repeat}:")
+            runs.append(run_stages(video_path, seconds, work_dir, args))
+
+    results = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "input": args.input or f"lavfi testsrc2 {args.size}",
+            "seconds": seconds,
+            "model": args.model,
+            "segments": args.segments,
+            "preset": args.preset,
+            "repeat": args.repeat,
+        },
+        "stages": best_of(runs),
+    }
+    for path in filter(None, [args.out, args.save_baseline]):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.memory_threshold)
+        if regressions:
+            print(f"\nRegressions in: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
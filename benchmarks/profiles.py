@@ -0,0 +1,170 @@
+"""Speed vs. accuracy of the decoding profiles.
+
+Transcribes a reference clip with every profile in DECODING_PROFILES and
+reports the real-time factor (transcription time / audio length, lower is
+faster) next to the word error rate against a reference transcript:
+
+    python -m benchmarks.profiles --input clip.mp4 --reference clip.srt
+    python -m benchmarks.profiles --input clip.wav --reference clip.txt \\
+        --model small --profiles fast accurate --out profiles.json
+    python -m benchmarks.profiles --input clip.mp4 --reference clip.srt --asr faster-whisper
+
+The reference is a subtitle file (SRT, WebVTT or ASS) or plain text.
+Words are compared after lowercasing and dropping punctuation. Use a clip
+of a minute or two with a careful transcript; numbers are only
+comparable on the same machine.
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+
+from config import ASR_BACKEND, DECODING_PROFILES
+from engine.asr import ASR_BACKENDS
+from engine.audio import SAMPLE_RATE, extract_audio
+from engine.subtitles import read_subtitles
+from engine.transcribe import (
+    decode_options,
+    load_model,
+    model_cache,
+    transcribe,
+)
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s']|(?<!\w)'|'(?!\w)")
+
+
+def normalize_words(text):
+    """Lowercased words without punctuation (apostrophes inside words stay)."""
+    return _PUNCTUATION_RE.sub(" ", text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """Word-level edit distance divided by the reference length."""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        current = [i]
+        for j, other in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,                    # deletion
+                current[j - 1] + 1,                 # insertion
+                previous[j - 1] + (word != other),  # substitution
+            ))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def read_reference(path):
+    if os.path.splitext(path)[1].lower() == ".txt":
+        with open(path, encoding="utf-8-sig") as f:
+            return f.read()
+    return " ".join(segment["text"] for segment in read_subtitles(path))
+
+
+def run_profile(name, audio, reference, args):
+    """Load the model and transcribe ``audio`` with one profile.
+
+    Returns the fastest of ``args.repeat`` runs as a result dict.
+    """
+    profile = DECODING_PROFILES[name]
+    options = decode_options(name)
+    model_cache.clear()  # time a cold load, quantization included
+    start = time.perf_counter()
+    model = load_model(args.model, quantize=profile["quantize"], backend=args.asr)
+    load_seconds = time.perf_counter() - start
+    model.set_threads(profile["threads"])
+
+    best = None
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        result = transcribe(model, audio, "original", language=args.language, options=options)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result)
+    model.set_threads(None)
+
+    elapsed, result = best
+    audio_seconds = len(audio) / SAMPLE_RATE
+    text = " ".join(segment["text"] for segment in result["segments"])
+    return {
+        "load_seconds": round(load_seconds, 3),
+        "transcribe_seconds": round(elapsed, 3),
+        "rtf": round(elapsed / audio_seconds, 4),
+        "wer": round(word_error_rate(reference, text), 4),
+        "words": len(normalize_words(text)),
+        "language": result["language"],
+    }
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.profiles",
+        description="Compare decoding profiles by real-time factor and word error rate.",
+    )
+    parser.add_argument("--input", required=True, help="Reference audio or video clip.")
+    parser.add_argument("--reference", required=True,
+                        help="Reference transcript (.srt/.vtt/.ass or .txt).")
+    parser.add_argument("--model", default="base", help="Whisper model size.")
+    parser.add_argument("--asr", default=ASR_BACKEND, choices=list(ASR_BACKENDS),
+                        help="Speech recognition engine.")
+    parser.add_argument("--profiles", nargs="+", default=list(DECODING_PROFILES),
+                        choices=list(DECODING_PROFILES), help="Profiles to compare.")
+    parser.add_argument("--language",
+                        help="Spoken language code (default: detected by Whisper).")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Transcriptions per profile; the fastest is kept.")
+    parser.add_argument("--out", default="profile_results.json", help="Results file.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    reference = read_reference(args.reference)
+    if not normalize_words(reference):
+        print(f"Reference {args.reference} has no words.", file=sys.stderr)
+        return 2
+    audio = extract_audio(args.input)
+    audio_seconds = len(audio) / SAMPLE_RATE
+
+    results = {}
+    for name in args.profiles:
+        print(f"Profile {name}:")
+        results[name] = run_profile(name, audio, reference, args)
+
+    print(f"\n{'profile':<10} {'load':>8} {'RTF':>8} {'WER':>8}")
+    for name, result in results.items():
+        print(
+            f"{name:<10} {result['load_seconds']:>7.2f}s {result['rtf']:>8.3f} "
+            f"{result['wer']:>8.1%}"
+        )
+
+    output = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "input": args.input,
+            "reference": args.reference,
+            "seconds": round(audio_seconds, 3),
+            "model": args.model,
+            "asr": args.asr,
+            "repeat": args.repeat,
+        },
+        "profiles": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""Startup import-time report.
+
+Imports a module in a fresh interpreter with ``python -X importtime`` and
+reports the total time and the slowest imports. Fails if one of the
+engine's heavy dependencies (torch, whisper, faster_whisper,
+deep_translator, ...) is imported eagerly, or if the total exceeds ``--max-ms``:
+
+    python -m benchmarks.startup                 # what app.py imports
+    python -m benchmarks.startup -m engine --max-ms 400
+"""
+
+import argparse
+import subprocess
+import sys
+
+from engine.warmup import HEAVY_MODULES
+
+
+def import_times(module):
+    """Import ``module`` in a new interpreter.
+
+    Returns:
+        {module name: (self_us, cumulative_us)} from ``-X importtime``.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, stdin=subprocess.DEVNULL,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr.strip()[-2000:]}")
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:  # the header line
+            continue
+        times[fields[2].strip()] = (self_us, cumulative_us)
+    return times
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.startup",
+        description="Report how long importing the application takes.",
+    )
+    parser.add_argument("-m", "--module", default="gui",
+                        help="Module to import (default: gui, as app.py does).")
+    parser.add_argument("--repeat", type=int, default=5,
+                        help="Fresh imports to run; the fastest is reported.")
+    parser.add_argument("--top", type=int, default=15, help="Slowest imports to list.")
+    parser.add_argument("--max-ms", type=float, help="Fail if the import takes longer.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    runs = [import_times(args.module) for _ in range(args.repeat)]
+    times = min(runs, key=lambda t: t[args.module][1])
+    total_ms = times[args.module][1] / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms ({len(times)} modules)\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+    for name, (self_us, cumulative_us) in slowest[:args.top]:
+        print(f"{cumulative_us / 1000:>10.1f}ms {self_us / 1000:>8.1f}ms  {name}")
+
+    failed = False
+    eager = [name for name in HEAVY_MODULES if name in times]
+    if eager:
+        print(f"\nImported at startup but should load lazily: {', '.join(eager)}")
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print(f"\nStartup import took {total_ms:.1f} ms, over the {args.max_ms:g} ms budget.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,111 @@
-from .settings import MODEL_OPTIONS, SUPPORTED_VIDEO_FORMATS, WINDOW_TITLE, WINDOW_SIZE, LANGUAGE_OPTIONS
+from .settings import (
+    MODEL_OPTIONS,
+    ASR_BACKEND,
+    DECODING_PROFILES,
+    DEFAULT_DECODING_PROFILE,
+    SUPPORTED_VIDEO_FORMATS,
+    WINDOW_TITLE,
+    WINDOW_SIZE,
+    WARMUP_ON_START,
+    WARMUP_DELAY_MS,
+    UI_TICK_MS,
+    LOG_MAX_LINES,
+    GUI_LOG_DIR,
+    GUI_LOG_FILES_KEPT,
+    LANGUAGE_OPTIONS,
+    AUDIO_MEMMAP_THRESHOLD_SECONDS,
+    MODEL_CACHE_BUDGET_MB,
+    LANGUAGE_DETECT_WINDOWS,
+    LANGUAGE_DETECT_MODEL,
+    LANGUAGE_DETECT_CHUNKED_MODEL,
+    TRANSCRIBE_WORKERS,
+    TRANSCRIBE_CHUNK_SECONDS,
+    CHUNK_OVERLAP_SECONDS,
+    STREAMING_ENABLED,
+    STREAM_WINDOW_SECONDS,
+    RESEGMENT_ENABLED,
+    SUBTITLE_MAX_CHARS_PER_LINE,
+    SUBTITLE_MAX_LINES,
+    SUBTITLE_MAX_DURATION,
+    SUBTITLE_MIN_GAP,
+    VAD_ENABLED,
+    VAD_ENERGY_MARGIN_DB,
+    VAD_MIN_SPEECH_SECONDS,
+    VAD_MIN_SILENCE_SECONDS,
+    VAD_PAD_SECONDS,
+    TRANSLATION_BACKEND,
+    TRANSLATION_BATCH_CHARS,
+    TRANSLATION_CACHE_MAX_MB,
+    TRANSLATION_CONCURRENCY,
+    TRANSLATION_MAX_RETRIES,
+    TRANSLATION_RETRY_BASE_SECONDS,
+    TRANSCRIPT_CACHE_MAX_MB,
+    ENCODER_PRESETS,
+    DEFAULT_ENCODER_PRESET,
+    BURN_PARALLEL_PARTS,
+    MIN_BURN_PART_SECONDS,
+    OUTPUT_MODES,
+    CACHE_DIR,
+    SCRATCH_DIR,
+    SCRATCH_QUOTA_MB,
+    RESUME_ENABLED,
+    JOBS_DIR,
+    JOB_CHECKPOINT_MAX_AGE_DAYS,
+    METRICS_LOG_PATH,
+)
 
-__all__ = ["MODEL_OPTIONS", "SUPPORTED_VIDEO_FORMATS", "WINDOW_TITLE", "WINDOW_SIZE", "LANGUAGE_OPTIONS"]
+__all__ = [
+    "MODEL_OPTIONS",
+    "ASR_BACKEND",
+    "DECODING_PROFILES",
+    "DEFAULT_DECODING_PROFILE",
+    "SUPPORTED_VIDEO_FORMATS",
+    "WINDOW_TITLE",
+    "WINDOW_SIZE",
+    "WARMUP_ON_START",
+    "WARMUP_DELAY_MS",
+    "UI_TICK_MS",
+    "LOG_MAX_LINES",
+    "GUI_LOG_DIR",
+    "GUI_LOG_FILES_KEPT",
+    "LANGUAGE_OPTIONS",
+    "AUDIO_MEMMAP_THRESHOLD_SECONDS",
+    "MODEL_CACHE_BUDGET_MB",
+    "LANGUAGE_DETECT_WINDOWS",
+    "LANGUAGE_DETECT_MODEL",
+    "LANGUAGE_DETECT_CHUNKED_MODEL",
+    "TRANSCRIBE_WORKERS",
+    "TRANSCRIBE_CHUNK_SECONDS",
+    "CHUNK_OVERLAP_SECONDS",
+    "STREAMING_ENABLED",
+    "STREAM_WINDOW_SECONDS",
+    "RESEGMENT_ENABLED",
+    "SUBTITLE_MAX_CHARS_PER_LINE",
+    "SUBTITLE_MAX_LINES",
+    "SUBTITLE_MAX_DURATION",
+    "SUBTITLE_MIN_GAP",
+    "VAD_ENABLED",
+    "VAD_ENERGY_MARGIN_DB",
+    "VAD_MIN_SPEECH_SECONDS",
+    "VAD_MIN_SILENCE_SECONDS",
+    "VAD_PAD_SECONDS",
+    "TRANSLATION_BACKEND",
+    "TRANSLATION_BATCH_CHARS",
+    "TRANSLATION_CACHE_MAX_MB",
+    "TRANSLATION_CONCURRENCY",
+    "TRANSLATION_MAX_RETRIES",
+    "TRANSLATION_RETRY_BASE_SECONDS",
+    "TRANSCRIPT_CACHE_MAX_MB",
+    "ENCODER_PRESETS",
+    "DEFAULT_ENCODER_PRESET",
+    "BURN_PARALLEL_PARTS",
+    "MIN_BURN_PART_SECONDS",
+    "OUTPUT_MODES",
+    "CACHE_DIR",
+    "SCRATCH_DIR",
+    "SCRATCH_QUOTA_MB",
+    "RESUME_ENABLED",
+    "JOBS_DIR",
+    "JOB_CHECKPOINT_MAX_AGE_DAYS",
+    "METRICS_LOG_PATH",
+]
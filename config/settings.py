@@ -1,3 +1,5 @@
+import os
+
 # Model   | Parameters  | Relative Speed |
 # --------|-------------|----------------|
 # tiny    | 39M         | Fastest        |
@@ -14,6 +16,130 @@ MODEL_OPTIONS = {
     "large (1550M - Slowest/Most Accurate)": "large",
 }
 
+# Speech recognition engine (engine/asr.py): "whisper" is OpenAI's PyTorch
+# implementation, "faster-whisper" runs the same models on CTranslate2 with
+# int8 weights on CPU (much faster; pip install faster-whisper), "fake" is
+# a deterministic stand-in for tests.
+ASR_BACKEND = "whisper"
+
+# Decoding profiles trade accuracy for speed. Keys other than "threads" and
+# "quantize" are passed to Whisper's transcribe:
+#   beam_size    beam search width (None = greedy decoding)
+#   best_of      candidates sampled when falling back to a temperature > 0
+#   temperature  fallback schedule, retried when a window decodes badly
+#   condition_on_previous_text  prompt each window with the previous text
+#                (better continuity, but can repeat itself on hard audio)
+#   threads      PyTorch CPU threads per worker (None = default)
+#   quantize     int8 dynamic quantization of the model (CPU only)
+DECODING_PROFILES = {
+    "fast": {
+        "beam_size": None, "best_of": None, "temperature": (0.0, 0.4, 0.8),
+        "condition_on_previous_text": False, "threads": None, "quantize": True,
+    },
+    "balanced": {
+        "beam_size": None, "best_of": 5, "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True, "threads": None, "quantize": False,
+    },
+    "accurate": {
+        "beam_size": 5, "best_of": 5, "temperature": (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        "condition_on_previous_text": True, "threads": None, "quantize": False,
+    },
+}
+# "accurate" is how transcription always ran (beam of 5); the faster
+# profiles are opt-in.
+DEFAULT_DECODING_PROFILE = "accurate"
+
+# Loaded models are kept warm between jobs; least recently used ones are
+# evicted once their combined weights exceed this budget.
+MODEL_CACHE_BUDGET_MB = 4096
+
+# Before the full decode, the spoken language is detected on up to
+# LANGUAGE_DETECT_WINDOWS 30 s windows spread over the speech. It decides
+# whether Whisper transcribes or translates and lets translations go
+# straight from the spoken language to each target. LANGUAGE_DETECT_MODEL
+# (None = the job's model) can name a smaller model. Chunked jobs, where
+# the main process does not otherwise load a model and every worker holds
+# its own, use LANGUAGE_DETECT_CHUNKED_MODEL instead of the job's model
+# when it is smaller. 0 windows turns detection off.
+LANGUAGE_DETECT_WINDOWS = 3
+LANGUAGE_DETECT_MODEL = None
+LANGUAGE_DETECT_CHUNKED_MODEL = "base"
+
+# Chunked transcription: with more than one worker, long audio is split at
+# silences into ~TRANSCRIBE_CHUNK_SECONDS windows decoded in parallel
+# processes (CPU only; each worker loads its own model).
+TRANSCRIBE_WORKERS = 1
+TRANSCRIBE_CHUNK_SECONDS = 300
+CHUNK_OVERLAP_SECONDS = 1.0
+
+# Streaming: transcribe in ~STREAM_WINDOW_SECONDS windows and translate/write
+# subtitles for each window while the next one is decoding.
+STREAMING_ENABLED = True
+STREAM_WINDOW_SECONDS = 60
+
+# Voice activity detection: silent and non-speech (music, steady noise)
+# regions are cut out before transcription and timestamps remapped after.
+VAD_ENABLED = True
+VAD_ENERGY_MARGIN_DB = 10.0     # speech must be this far above the noise floor
+VAD_MIN_SPEECH_SECONDS = 0.25   # shorter bursts are ignored
+VAD_MIN_SILENCE_SECONDS = 0.5   # shorter pauses are bridged
+VAD_PAD_SECONDS = 0.2           # context kept around each speech region
+
+# Translation: lines are packed into requests of up to TRANSLATION_BATCH_CHARS
+# and results are cached on disk under CACHE_DIR.
+TRANSLATION_BACKEND = "google"
+TRANSLATION_BATCH_CHARS = 4500
+TRANSLATION_CACHE_MAX_MB = 64
+TRANSLATION_CONCURRENCY = 4
+TRANSLATION_MAX_RETRIES = 4
+TRANSLATION_RETRY_BASE_SECONDS = 1.0
+
+# Transcripts are cached per input file, model and decoding options so
+# re-runs with different styling or languages skip Whisper entirely.
+TRANSCRIPT_CACHE_MAX_MB = 256
+
+# libx264 settings for hard-burning subtitles. "threads": 0 lets ffmpeg use
+# every core. Soft subtitles (output mode "soft") skip re-encoding entirely.
+ENCODER_PRESETS = {
+    "fast": {"preset": "veryfast", "crf": 23, "threads": 0},
+    "balanced": {"preset": "medium", "crf": 21, "threads": 0},
+    "quality": {"preset": "slow", "crf": 18, "threads": 0},
+}
+DEFAULT_ENCODER_PRESET = "balanced"
+
+# Parallel burn: split the video at keyframes into this many ranges encoded
+# by separate ffmpeg processes (1 = single process). Ranges are never
+# shorter than MIN_BURN_PART_SECONDS.
+BURN_PARALLEL_PARTS = 1
+MIN_BURN_PART_SECONDS = 30
+
+OUTPUT_MODES = {
+    "Hard burn (re-encode)": "burn",
+    "Soft track (fast, no re-encode)": "soft",
+}
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "subtitle-generator")
+
+# Each job gets its own scratch folder for intermediate files (spilled
+# audio, subtitles only needed for the video). None uses the system temp
+# folder; point it at a fast disk or a tmpfs such as "/dev/shm" if it is
+# large enough. A job fails early rather than growing past SCRATCH_QUOTA_MB.
+SCRATCH_DIR = None
+SCRATCH_QUOTA_MB = 4096
+
+# Finished work of each job (transcribed windows, translations, burned
+# parts, and the extracted audio once a job stops or fails) is checkpointed
+# under JOBS_DIR until the job succeeds, so it resumes when run again. The
+# audio and burned parts count against SCRATCH_QUOTA_MB. Checkpoints of
+# jobs that are never re-run are deleted after JOB_CHECKPOINT_MAX_AGE_DAYS.
+RESUME_ENABLED = True
+JOBS_DIR = os.path.join(CACHE_DIR, "jobs")
+JOB_CHECKPOINT_MAX_AGE_DAYS = 7
+
+# Append per-stage timing/resource events as JSON lines to this file
+# (None = off). The CLI's --metrics flag sets it per run.
+METRICS_LOG_PATH = None
+
 SUPPORTED_VIDEO_FORMATS = "*.mp4 *.mkv *.avi *.mov *.flv *.wmv *.webm *.m4v *.mpg *.mpeg *.3gp *.ts"
 
 LANGUAGE_OPTIONS = {
@@ -35,5 +161,30 @@ LANGUAGE_OPTIONS = {
     "Polish": "pl",
 }
 
+# Re-cut Whisper's segments into readable cues using word timestamps
+# (requested from Whisper while this is on).
+RESEGMENT_ENABLED = True
+SUBTITLE_MAX_CHARS_PER_LINE = 42
+SUBTITLE_MAX_LINES = 2
+SUBTITLE_MAX_DURATION = 7.0
+SUBTITLE_MIN_GAP = 0.08
+
+# Audio longer than this is decoded into a memory-mapped file instead of RAM
+# (16 kHz float32 mono is ~230 MB per hour).
+AUDIO_MEMMAP_THRESHOLD_SECONDS = 60 * 60
+
 WINDOW_TITLE = "Video Subtitle Generator"
-WINDOW_SIZE = "620x800"
+WINDOW_SIZE = "620x840"
+
+# Whisper, torch and the translator are imported on first use. With
+# WARMUP_ON_START the GUI imports them (and loads the selected model) in
+# the background WARMUP_DELAY_MS after the window appears.
+WARMUP_ON_START = True
+WARMUP_DELAY_MS = 300
+
+# The GUI applies worker updates once per tick. The log box keeps the last
+# LOG_MAX_LINES lines; the full log of each session goes to GUI_LOG_DIR.
+UI_TICK_MS = 50
+LOG_MAX_LINES = 500
+GUI_LOG_DIR = os.path.join(CACHE_DIR, "logs")
+GUI_LOG_FILES_KEPT = 10
@@ -1,3 +1,24 @@
 from .engine import SubtitleEngine
+from .burn import hex_to_ass
+from .transcribe import model_cache, preload_model
+from .translate import TranslationBackend, FakeBackend, GoogleBackend
+from .asr import AsrBackend, WhisperBackend, FasterWhisperBackend, FakeAsrBackend
+from .metrics import JsonLinesSink, MemorySink
+from .warmup import warm_up
 
-__all__ = ["SubtitleEngine"]
+__all__ = [
+    "SubtitleEngine",
+    "hex_to_ass",
+    "model_cache",
+    "preload_model",
+    "TranslationBackend",
+    "FakeBackend",
+    "GoogleBackend",
+    "AsrBackend",
+    "WhisperBackend",
+    "FasterWhisperBackend",
+    "FakeAsrBackend",
+    "JsonLinesSink",
+    "MemorySink",
+    "warm_up",
+]
@@ -0,0 +1,333 @@
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from config import ASR_BACKEND
+from .audio import SAMPLE_RATE
+
+# Approximate parameter counts, for the model cache budget of engines
+# whose weights are not visible from Python.
+MODEL_PARAMETERS = {
+    "tiny": 39e6,
+    "base": 74e6,
+    "small": 244e6,
+    "medium": 769e6,
+    "large": 1550e6,
+}
+
+
+def _segment(index, start, end, text, words=None):
+    segment = {"id": index, "start": float(start), "end": float(end), "text": text}
+    if words is not None:
+        segment["words"] = words
+    return segment
+
+
+def _print_segment(segment):
+    print(f"[{segment['start']:.2f} --> {segment['end']:.2f}] {segment['text'].strip()}")
+
+
+class AsrBackend(ABC):
+    """Base class for speech recognition engines.
+
+    An instance is one loaded model. ``transcribe`` returns openai-whisper's
+    result schema whatever the engine: ``{"text", "segments", "language"}``
+    with segments holding "id", "start", "end", "text" and, when
+    ``word_timestamps`` is on, "words" (dicts with "word", "start", "end"
+    and "probability"). The rest of the pipeline relies on nothing else.
+
+    Subclasses must implement ``transcribe`` and ``language_probs`` (an
+    incomplete one fails when it is created) and may take decoding
+    options they do not support as no-ops.
+    """
+
+    name = "base"
+    # Heavy imports of the engine, loaded lazily (see ``warm_up``).
+    modules = ()
+
+    def __init__(self, model_size, device, quantize=False, threads=None):
+        self.model_size = model_size
+        self.device = device
+        # Approximate memory held by the model, for the cache budget.
+        self.nbytes = 0
+
+    @staticmethod
+    def default_device():
+        return "cpu"
+
+    @classmethod
+    def variant(cls, device, quantize, threads):
+        """Load-time settings besides size and device that yield a
+        different model, as a tuple of labels (part of the cache key)."""
+        return ()
+
+    def set_threads(self, threads):
+        """Set the CPU threads used for decoding; None restores the default."""
+
+    @abstractmethod
+    def language_probs(self, audio):
+        """Spoken language probabilities for up to 30 s of audio, as {code: p}."""
+
+    @abstractmethod
+    def transcribe(self, audio, task="transcribe", language=None,
+                   initial_prompt=None, verbose=False, **options):
+        """Decode ``audio`` (16 kHz mono float32) into the result schema above."""
+
+
+def _model_nbytes(model):
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+def quantize_int8(model):
+    """Dynamically quantize the model's linear layers to int8, in place.
+
+    Weights are stored as int8 and activations quantized on the fly, which
+    speeds up CPU inference at a small cost in accuracy. Whisper's Linear
+    subclass only adds a dtype cast that is a no-op in fp32, so its layers
+    are turned into plain ``nn.Linear`` for PyTorch to recognise them.
+    """
+    import torch
+    from whisper.model import Linear
+
+    for module in model.modules():
+        if type(module) is Linear:
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+_default_threads = None
+
+
+class WhisperBackend(AsrBackend):
+    """OpenAI's reference implementation (PyTorch).
+
+    With ``quantize`` on CPU the linear layers are dynamically quantized
+    to int8.
+    """
+
+    name = "whisper"
+    modules = ("torch", "whisper")
+
+    def __init__(self, model_size, device, quantize=False, threads=None):
+        super().__init__(model_size, device)
+        import whisper
+
+        self.model = whisper.load_model(model_size, device=device)
+        # Counted at fp32 size even when quantized: an overestimate,
+        # so the budget errs on the side of evicting.
+        self.nbytes = _model_nbytes(self.model)
+        if self.variant(device, quantize, threads):
+            self.model = quantize_int8(self.model)
+
+    @staticmethod
+    def default_device():
+        import torch
+
+        return "cuda" if torch.cuda.is_available() else "cpu"
+
+    @classmethod
+    def variant(cls, device, quantize, threads):
+        # Dynamic quantization only speeds up CPU inference; threads are
+        # set per job (``set_threads``) rather than at load time.
+        return ("int8",) if quantize and device == "cpu" else ()
+
+    def set_threads(self, threads):
+        global _default_threads
+        import torch
+
+        if _default_threads is None:
+            _default_threads = torch.get_num_threads()
+        torch.set_num_threads(threads or _default_threads)
+
+    def language_probs(self, audio):
+        import whisper
+
+        samples = whisper.pad_or_trim(np.asarray(audio, dtype=np.float32))
+        mel = whisper.log_mel_spectrogram(samples, self.model.dims.n_mels).to(self.model.device)
+        _, probs = self.model.detect_language(mel)
+        return probs
+
+    def transcribe(self, audio, task="transcribe", language=None,
+                   initial_prompt=None, verbose=False, **options):
+        return self.model.transcribe(
+            audio, task=task, language=language, initial_prompt=initial_prompt,
+            verbose=verbose, **options
+        )
+
+
+class FasterWhisperBackend(AsrBackend):
+    """Whisper on CTranslate2 through faster-whisper (1.1 or newer).
+
+    Weights are int8 on CPU, which together with CTranslate2's fused
+    kernels decodes several times faster than the PyTorch implementation
+    at near-identical accuracy. On CUDA it runs in float16, or int8 with
+    float16 activations when ``quantize`` is set. The CPU thread count is
+    fixed when the model loads.
+    """
+
+    name = "faster-whisper"
+    modules = ("ctranslate2", "faster_whisper")
+
+    def __init__(self, model_size, device, quantize=False, threads=None):
+        super().__init__(model_size, device)
+        from faster_whisper import WhisperModel
+
+        compute_type = self._compute_type(device, quantize)
+        self.model = WhisperModel(
+            model_size, device=device, compute_type=compute_type, cpu_threads=threads or 0,
+        )
+        parameters = MODEL_PARAMETERS.get(model_size.split("-")[0].split(".")[0], 1550e6)
+        self.nbytes = int(parameters * (1 if compute_type.startswith("int8") else 2))
+
+    @staticmethod
+    def default_device():
+        import ctranslate2
+
+        return "cuda" if ctranslate2.get_cuda_device_count() else "cpu"
+
+    @staticmethod
+    def _compute_type(device, quantize):
+        if device == "cpu":
+            return "int8"
+        return "int8_float16" if quantize else "float16"
+
+    @classmethod
+    def variant(cls, device, quantize, threads):
+        labels = (cls._compute_type(device, quantize),)
+        if threads and device == "cpu":
+            labels += (f"{threads} threads",)
+        return labels
+
+    def language_probs(self, audio):
+        _, _, probs = self.model.detect_language(np.asarray(audio, dtype=np.float32))
+        return dict(probs)
+
+    def transcribe(self, audio, task="transcribe", language=None,
+                   initial_prompt=None, verbose=False, beam_size=None, best_of=None,
+                   temperature=0.0, **options):
+        if best_of is not None:
+            options["best_of"] = best_of
+        if not isinstance(temperature, (int, float)):
+            temperature = list(temperature)
+        pieces, info = self.model.transcribe(
+            np.asarray(audio, dtype=np.float32),
+            task=task,
+            language=language,
+            initial_prompt=initial_prompt,
+            # openai-whisper decodes greedily without a beam size;
+            # faster-whisper would default to a beam of 5.
+            beam_size=beam_size or 1,
+            temperature=temperature,
+            vad_filter=False,  # silence is already cut out (see vad.py)
+            **options
+        )
+        segments = []
+        for piece in pieces:
+            words = None
+            if piece.words is not None:
+                words = [
+                    {"word": w.word, "start": w.start, "end": w.end, "probability": w.probability}
+                    for w in piece.words
+                ]
+            segment = _segment(len(segments), piece.start, piece.end, piece.text, words)
+            if verbose:
+                _print_segment(segment)
+            segments.append(segment)
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": info.language,
+        }
+
+
+class FakeAsrBackend(AsrBackend):
+    """Deterministic recognizer for tests; needs no model or dependencies.
+
+    Every stretch of sound (samples above ``threshold``, bridging gaps
+    shorter than ``gap_seconds``) becomes one segment, or several of at
+    most ``segment_seconds``, saying how long it is ("[en] " in front when
+    asked to translate). Segments depend only on where the sound is, so
+    decoding the audio whole or in windows gives the same timeline. The
+    spoken language is ``language`` unless one is given.
+    """
+
+    name = "fake"
+    language = "en"
+    segment_seconds = 5.0
+    threshold = 1e-3
+    gap_seconds = 0.2
+
+    def __init__(self, model_size, device, quantize=False, threads=None):
+        super().__init__(model_size, device)
+        self.calls = []
+
+    def language_probs(self, audio):
+        return {self.language: 1.0}
+
+    def _sounds(self, audio):
+        """(start, end) sample ranges of the stretches of sound."""
+        loud = np.flatnonzero(np.abs(np.asarray(audio, dtype=np.float32)) > self.threshold)
+        if not len(loud):
+            return []
+        breaks = np.flatnonzero(np.diff(loud) > self.gap_seconds * SAMPLE_RATE)
+        starts = np.concatenate([loud[:1], loud[breaks + 1]])
+        ends = np.concatenate([loud[breaks], loud[-1:]]) + 1
+        return list(zip(starts.tolist(), ends.tolist()))
+
+    def transcribe(self, audio, task="transcribe", language=None,
+                   initial_prompt=None, verbose=False, word_timestamps=False, **options):
+        self.calls.append({
+            "task": task, "language": language, "samples": len(audio),
+            "word_timestamps": word_timestamps,
+        })
+        prefix = "[en] " if task == "translate" else ""
+        segments = []
+        for start, end in self._sounds(audio):
+            begin, finish = start / SAMPLE_RATE, end / SAMPLE_RATE
+            pieces = max(1, int(np.ceil((finish - begin) / self.segment_seconds)))
+            step = (finish - begin) / pieces
+            for k in range(pieces):
+                piece_start = begin + k * step
+                text = f" {prefix}Sound of {step:.1f} seconds."
+                words = None
+                if word_timestamps:
+                    tokens = text.split()
+                    duration = step / len(tokens)
+                    words = [
+                        {
+                            "word": " " + token,
+                            "start": piece_start + j * duration,
+                            "end": piece_start + (j + 1) * duration,
+                            "probability": 1.0,
+                        }
+                        for j, token in enumerate(tokens)
+                    ]
+                segment = _segment(len(segments), piece_start, piece_start + step, text, words)
+                if verbose:
+                    _print_segment(segment)
+                segments.append(segment)
+        return {
+            "text": "".join(s["text"] for s in segments),
+            "segments": segments,
+            "language": language or self.language,
+        }
+
+
+ASR_BACKENDS = {
+    "whisper": WhisperBackend,
+    "faster-whisper": FasterWhisperBackend,
+    "fake": FakeAsrBackend,
+}
+
+
+def get_asr_backend(backend=None):
+    """Resolve a backend name (or pass through an AsrBackend subclass)."""
+    if isinstance(backend, type) and issubclass(backend, AsrBackend):
+        return backend
+    name = backend or ASR_BACKEND
+    if name not in ASR_BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {name!r}")
+    return ASR_BACKENDS[name]
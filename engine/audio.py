@@ -1,17 +1,160 @@
-from moviepy import VideoFileClip
+import json
+import os
+import subprocess
+import tempfile
 
+import numpy as np
 
-def extract_audio(video_path, audio_path, progress_callback=None, stop_check=None):
-    """Extract audio track from a video file to a WAV file."""
+from config import AUDIO_MEMMAP_THRESHOLD_SECONDS
+from . import ffmpeg
+
+SAMPLE_RATE = 16000
+BYTES_PER_SAMPLE = 4
+READ_CHUNK_SECONDS = 30
+
+
+def probe_duration(video_path):
+    """Return the container duration in seconds, or None if unknown."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries", "format=duration",
+        "-of", "json",
+        video_path,
+    ]
+    try:
+        out = ffmpeg.run(cmd, capture_output=True, text=True, check=True).stdout
+        return float(json.loads(out)["format"]["duration"])
+    except (OSError, subprocess.CalledProcessError, KeyError, ValueError):
+        return None
+
+
+class _AudioBuffer:
+    """Growable float32 sample buffer, optionally backed by a memory map."""
+
+    def __init__(self, capacity, path=None):
+        self.path = path
+        self.array = self._allocate(max(capacity, SAMPLE_RATE))
+
+    def _allocate(self, samples):
+        if self.path is None:
+            return np.empty(samples, dtype=np.float32)
+        with open(self.path, "ab") as f:
+            f.truncate(samples * BYTES_PER_SAMPLE)
+        return np.memmap(self.path, dtype=np.float32, mode="r+", shape=(samples,))
+
+    def grow(self, used_samples):
+        """Double the capacity, keeping the first ``used_samples`` samples."""
+        old = self.array
+        if self.path is None:
+            self.array = np.empty(len(old) * 2, dtype=np.float32)
+            self.array[:used_samples] = old[:used_samples]
+        else:
+            old.flush()
+            samples = len(old) * 2
+            # Unmap before the file is resized: Windows refuses to truncate
+            # a file that is still mapped.
+            self.array = old = None
+            self.array = self._allocate(samples)
+
+    def trim(self, samples):
+        """Shrink the buffer to its first ``samples`` samples and return them.
+
+        The unused tail is released rather than kept alive behind a view.
+        """
+        if self.path is None:
+            self.array.resize(samples, refcheck=False)
+            return self.array
+        self.array.flush()
+        self.array = None
+        with open(self.path, "r+b") as f:
+            f.truncate(samples * BYTES_PER_SAMPLE)
+        if not samples:
+            return np.empty(0, dtype=np.float32)
+        self.array = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(samples,))
+        return self.array
+
+    def bytes_view(self):
+        return memoryview(self.array).cast("B")
+
+
+def extract_audio(video_path, audio_path=None, progress_callback=None, stop_check=None,
+                  reserve=None, duration=None):
+    """Decode the audio track of a video into a 16 kHz mono float32 array.
+
+    A single ffmpeg process writes raw PCM to a pipe which is read straight
+    into a NumPy buffer, ready to be handed to Whisper. Inputs longer than
+    AUDIO_MEMMAP_THRESHOLD_SECONDS are spilled into a memory-mapped file at
+    ``audio_path`` instead of being held in RAM; ``reserve`` (if given) is
+    called with the number of bytes before that file is created or grown.
+    ``duration`` saves an ffprobe run when the caller already probed it.
+    """
     if progress_callback:
         progress_callback(0, "Extracting audio...")
     print("Extracting audio...")
 
-    video = VideoFileClip(video_path)
-    video.audio.write_audiofile(audio_path, logger=None)
-    video.close()
+    if duration is None:
+        duration = probe_duration(video_path)
+    expected = int(duration * SAMPLE_RATE) if duration else 0
+    spill = (
+        audio_path is not None and duration is not None
+        and duration > AUDIO_MEMMAP_THRESHOLD_SECONDS
+    )
+    # Leave a little headroom: container durations are approximate.
+    capacity = expected + SAMPLE_RATE
+    if spill and reserve:
+        reserve(capacity * BYTES_PER_SAMPLE)
+    buffer = _AudioBuffer(capacity, audio_path if spill else None)
+
+    cmd = [
+        "ffmpeg", "-nostdin", "-v", "error",
+        "-i", video_path,
+        "-vn", "-ac", "1", "-ar", str(SAMPLE_RATE),
+        "-f", "f32le", "-",
+    ]
+    chunk_bytes = READ_CHUNK_SECONDS * SAMPLE_RATE * BYTES_PER_SAMPLE
+
+    with tempfile.TemporaryFile() as stderr:
+        process = ffmpeg.popen(cmd, stdout=subprocess.PIPE, stderr=stderr)
+        filled = 0
+        try:
+            view = buffer.bytes_view()
+            while True:
+                if stop_check and stop_check():
+                    process.kill()
+                    raise InterruptedError("Process stopped by user.")
+                if filled == len(view):
+                    if spill and reserve:
+                        reserve(len(view))
+                    view.release()
+                    buffer.grow(filled // BYTES_PER_SAMPLE)
+                    view = buffer.bytes_view()
+                n = process.stdout.readinto(view[filled:filled + chunk_bytes])
+                if not n:
+                    break
+                filled += n
+                if progress_callback and expected:
+                    done = min(filled / BYTES_PER_SAMPLE / expected, 1.0)
+                    progress_callback(done * 10)
+            view.release()
+        finally:
+            process.stdout.close()
+            process.wait()
+
+        if process.returncode != 0:
+            stderr.seek(0)
+            detail = stderr.read().decode(errors="replace").strip()
+            raise RuntimeError(
+                "ffmpeg failed to extract audio. "
+                "Make sure ffmpeg is installed and in PATH."
+                + (f"\n{detail}" if detail else "")
+            )
+
+    audio = buffer.trim(filled // BYTES_PER_SAMPLE)
+    if spill:
+        print(f"Audio spilled to memory-mapped file: {os.path.abspath(audio_path)}")
 
     if progress_callback:
         progress_callback(10)
     if stop_check and stop_check():
         raise InterruptedError("Process stopped by user.")
+    return audio
@@ -1,59 +1,181 @@
-import subprocess
+import os
+
+from config import ENCODER_PRESETS, DEFAULT_ENCODER_PRESET
+from .audio import probe_duration
+from .ffmpeg import FFmpegProcess, encode_summary, watch
+from .subtitles import SubtitleStyle, dump_subtitles, read_subtitles, subtitle_format
+from .workspace import Workspace
+
+# Subtitle codec for each container that can carry text subtitle tracks.
+SOFT_SUBTITLE_CODECS = {
+    ".mp4": "mov_text",
+    ".m4v": "mov_text",
+    ".mov": "mov_text",
+    ".mkv": "srt",
+    ".webm": "webvtt",
+}
+
+# Players expect ISO 639-2 codes in the track language tag.
+_ISO639_2 = {
+    "en": "eng", "es": "spa", "fr": "fra", "de": "deu", "pt": "por",
+    "it": "ita", "ru": "rus", "zh": "chi", "zh-CN": "chi", "ja": "jpn",
+    "ko": "kor", "ar": "ara", "hi": "hin", "tr": "tur", "nl": "nld",
+    "pl": "pol",
+}
+
+
+def hex_to_ass(hex_color):
+    """Convert #RRGGBB to ASS &H00BBGGRR format used by FFmpeg."""
+    h = hex_color.lstrip("#")
+    r, g, b = h[0:2], h[2:4], h[4:6]
+    return f"&H00{b}{g}{r}".upper()
+
+
+def encoder_args(preset_name=DEFAULT_ENCODER_PRESET, output_path=""):
+    """ffmpeg encoder arguments for a named entry of ENCODER_PRESETS.
+
+    WebM can't carry H.264, so it keeps ffmpeg's default VP9 encoder in
+    constant-quality mode with the preset's CRF.
+    """
+    preset = ENCODER_PRESETS[preset_name]
+    if output_path.lower().endswith(".webm"):
+        return ["-crf", str(preset["crf"]), "-b:v", "0", "-threads", str(preset["threads"])]
+    return [
+        "-c:v", "libx264",
+        "-preset", preset["preset"],
+        "-crf", str(preset["crf"]),
+        "-threads", str(preset["threads"]),
+    ]
+
+
+def subtitle_filter(subtitle_path):
+    """Build the ffmpeg ``subtitles=`` filter for a subtitle file."""
+    escaped = subtitle_path.replace("\\", "/").replace(":", "\\:")
+    return f"subtitles='{escaped}'"
+
+
+def styled_subtitles(subtitle_path, ass_path, font_name=None, primary_color=None,
+                     background_box=False):
+    """Convert a subtitle file to ASS with the burn style in its header."""
+    dump_subtitles(
+        read_subtitles(subtitle_path), ass_path,
+        SubtitleStyle(font_name, primary_color, background_box),
+    )
 
 
 def burn_subtitles(video_path, srt_path, output_video_path,
                    progress_callback=None, stop_check=None,
-                   font_name=None, primary_color=None, background_box=False):
-    """Burn an SRT subtitle file into a video using ffmpeg."""
+                   font_name=None, primary_color=None, background_box=False,
+                   encoder_preset=DEFAULT_ENCODER_PRESET, duration=None, workspace=None):
+    """Burn an SRT (or WebVTT/ASS) subtitle file into a video using ffmpeg.
+
+    The subtitles are converted to an ASS file carrying the font, colour
+    and box style, then the video is re-encoded with libx264 using
+    ``encoder_preset`` from ENCODER_PRESETS; audio is copied. Progress,
+    fps, speed and an ETA are reported from ffmpeg's ``-progress`` output.
+    ``duration`` (if known) saves probing the video again.
+
+    The ASS file goes in the job's ``workspace``, or in a workspace of its
+    own that is removed afterwards.
+    """
     if progress_callback:
         progress_callback(80, "Burning subtitles into video...")
-    print("Burning subtitles into video (ffmpeg)...")
-
-    srt_escaped = srt_path.replace("\\", "/").replace(":", "\\:")
-
-    style_parts = []
-    if font_name:
-        safe_font = font_name.replace("'", "").replace("\\", "")
-        style_parts.append(f"FontName={safe_font}")
-    if primary_color:
-        style_parts.append(f"PrimaryColour={primary_color}")
-    if background_box:
-        style_parts.append("BorderStyle=3")
-        style_parts.append("BackColour=&H80000000")
-
-    vf_filter = f"subtitles='{srt_escaped}'"
-    if style_parts:
-        vf_filter += f":force_style='{','.join(style_parts)}'"
-
-    cmd = [
-        "ffmpeg", "-y",
-        "-i", video_path,
-        "-vf", vf_filter,
-        "-c:a", "copy",
-        output_video_path
-    ]
-    process = subprocess.Popen(
-        cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        text=True,
-        creationflags=subprocess.CREATE_NO_WINDOW
-    )
-    for line in process.stdout:
-        if stop_check and stop_check():
-            process.kill()
-            raise InterruptedError("Process stopped by user.")
-        line = line.strip()
-        if line.startswith("frame="):
-            print(line)
-    process.wait()
-
-    if process.returncode != 0:
-        raise RuntimeError(
-            "ffmpeg failed to burn subtitles. "
-            "Make sure ffmpeg is installed and in PATH."
+    print(f"Burning subtitles into video (ffmpeg, '{encoder_preset}' preset)...")
+
+    if duration is None:
+        duration = probe_duration(video_path)
+    owns_workspace = workspace is None
+    if owns_workspace:
+        workspace = Workspace(prefix="subtitle-burn-")
+    try:
+        ass_path = workspace.path("subtitles.ass")
+        styled_subtitles(srt_path, ass_path, font_name, primary_color, background_box)
+        cmd = [
+            "ffmpeg", "-y", "-v", "error",
+            "-i", video_path,
+            "-vf", subtitle_filter(ass_path),
+            *encoder_args(encoder_preset, output_video_path),
+            "-c:a", "copy",
+            output_video_path
+        ]
+        process = FFmpegProcess(cmd)
+        try:
+            elapsed = watch(
+                [process], duration, progress_callback, stop_check,
+                status="Burning subtitles into video...",
+            )
+            if process.returncode != 0:
+                raise RuntimeError(
+                    "ffmpeg failed to burn subtitles. "
+                    "Make sure ffmpeg is installed and in PATH.\n" + process.error_output()
+                )
+        finally:
+            process.close()
+    finally:
+        if owns_workspace:
+            workspace.cleanup()
+
+    print(f"Subtitles burned successfully: {encode_summary([process], duration, elapsed)}.")
+    if progress_callback:
+        progress_callback(95)
+
+
+def soft_subtitle_path(output_video_path):
+    """Switch to .mkv if the output container can't hold subtitle tracks."""
+    base, ext = os.path.splitext(output_video_path)
+    if ext.lower() in SOFT_SUBTITLE_CODECS:
+        return output_video_path
+    print(f"{ext} cannot carry subtitle tracks; writing .mkv instead.")
+    return base + ".mkv"
+
+
+def mux_subtitles(video_path, tracks, output_video_path,
+                  progress_callback=None, stop_check=None, duration=None):
+    """Add subtitle files to a video as selectable tracks in one ffmpeg pass.
+
+    Audio and video are stream-copied, so this takes seconds.
+
+    Args:
+        tracks: List of (srt_path, language_code) pairs, in track order.
+        duration: Video duration if already known, for progress.
+    """
+    if progress_callback:
+        progress_callback(80, "Muxing subtitle tracks into video...")
+    print(f"Muxing {len(tracks)} subtitle track(s) into video (ffmpeg)...")
+
+    container = os.path.splitext(output_video_path)[1].lower()
+    codec = SOFT_SUBTITLE_CODECS[container]
+    if container == ".mkv":
+        # Matroska stores all three formats natively; keep ASS styling.
+        codec = {"ass": "ass", "vtt": "webvtt"}.get(subtitle_format(tracks[0][0]), "srt")
+    cmd = ["ffmpeg", "-y", "-v", "error", "-i", video_path]
+    for srt_path, _ in tracks:
+        cmd += ["-i", srt_path]
+    cmd += ["-map", "0:v?", "-map", "0:a?"]
+    for i in range(len(tracks)):
+        cmd += ["-map", str(i + 1)]
+    cmd += ["-c", "copy", "-c:s", codec]
+    for i, (_, language) in enumerate(tracks):
+        if language:
+            cmd += [f"-metadata:s:s:{i}", f"language={_ISO639_2.get(language, language)}"]
+    cmd.append(output_video_path)
+
+    if duration is None:
+        duration = probe_duration(video_path)
+    process = FFmpegProcess(cmd)
+    try:
+        watch(
+            [process], duration, progress_callback, stop_check,
+            status="Muxing subtitle tracks into video...",
         )
+        if process.returncode != 0:
+            raise RuntimeError(
+                "ffmpeg failed to mux subtitles. "
+                "Make sure ffmpeg is installed and in PATH.\n" + process.error_output()
+            )
+    finally:
+        process.close()
 
-    print("Subtitles burned successfully.")
+    print("Subtitle tracks muxed successfully.")
     if progress_callback:
         progress_callback(95)
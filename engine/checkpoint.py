@@ -0,0 +1,255 @@
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from config import JOBS_DIR, JOB_CHECKPOINT_MAX_AGE_DAYS
+from .transcript_cache import file_fingerprint, pack_transcript, unpack_transcript
+
+MANIFEST_VERSION = 1
+
+
+def content_digest(path):
+    """SHA-256 of a file's bytes (unlike ``file_fingerprint``, which is
+    based on size and mtime, it survives rewriting the same content)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def prune_checkpoints(root=JOBS_DIR, max_age_days=JOB_CHECKPOINT_MAX_AGE_DAYS):
+    """Delete checkpoints of jobs that were abandoned ``max_age_days`` ago."""
+    if not os.path.isdir(root):
+        return
+    cutoff = time.time() - max_age_days * 86400
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def has_pending_checkpoint(video_path, root=JOBS_DIR):
+    """True if an unfinished job on this input (as it is now) left a
+    checkpoint, whatever settings it ran with."""
+    if not os.path.isdir(root):
+        return False
+    video_path = os.path.abspath(video_path)
+    for name in os.listdir(root):
+        try:
+            with open(os.path.join(root, name, "manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if (manifest.get("input") == video_path
+                and manifest.get("fingerprint") == file_fingerprint(video_path)):
+            return True
+    return False
+
+
+class JobCheckpoint:
+    """Durable record of a job's finished work, so a stopped or crashed job
+    can resume instead of starting over.
+
+    Each job has a folder under ``root`` named after the input path and
+    the settings that shape its transcript. ``manifest.json`` holds the
+    input fingerprint and what is done; the artifacts sit next to it:
+
+    - ``audio.f32``: the extracted audio of a job that stopped or failed
+      before its transcript was complete
+    - ``batch-NNNNN.json.gz``: transcribed windows (before VAD remapping)
+    - ``transcript.json.gz``: the complete transcript
+    - ``track-<language>.json.gz``: finished translations
+    - ``burn/``: finished parts of a parallel burn
+
+    The detected spoken language is kept in the manifest itself.
+    Files are written under a temporary name and renamed, then the
+    manifest is updated, so a crash at any point leaves a consistent
+    checkpoint. A checkpoint whose input fingerprint no longer matches is
+    wiped. ``discard()`` removes the folder once the job has succeeded.
+    """
+
+    def __init__(self, video_path, settings, root=JOBS_DIR):
+        prune_checkpoints(root)
+        video_path = os.path.abspath(video_path)
+        ident = json.dumps([video_path, settings], sort_keys=True)
+        self.directory = os.path.join(root, hashlib.sha256(ident.encode()).hexdigest()[:24])
+        fingerprint = file_fingerprint(video_path)
+
+        self.manifest = self._read_manifest()
+        if self.manifest and self.manifest.get("fingerprint") != fingerprint:
+            print("Input changed since the interrupted run; discarding its checkpoint.")
+            self.discard()
+            self.manifest = None
+        if self.manifest is None:
+            self.manifest = {
+                "version": MANIFEST_VERSION,
+                "input": video_path,
+                "fingerprint": fingerprint,
+                "created": time.time(),
+                "stages": {},
+            }
+        os.makedirs(self.directory, exist_ok=True)
+
+    @property
+    def stages(self):
+        return self.manifest["stages"]
+
+    def describe(self):
+        """Short summary of the saved work, e.g. for a "Resuming" message."""
+        parts = []
+        transcript = self.stages.get("transcript", {})
+        if transcript.get("done"):
+            parts.append("transcript")
+        elif transcript.get("batches"):
+            parts.append(f"{transcript['batches']} transcribed window(s)")
+        elif "audio" in self.stages:
+            parts.append("extracted audio")
+        if self.stages.get("translations"):
+            parts.append("translations: " + ", ".join(self.stages["translations"]))
+        if "burn" in self.stages:
+            parts.append("burned parts")
+        return "; ".join(parts)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self):
+        try:
+            with open(self.path("manifest.json"), encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def _save_manifest(self):
+        self.manifest["updated"] = time.time()
+        tmp = self.path("manifest.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=1)
+        os.replace(tmp, self.path("manifest.json"))
+
+    def _write(self, name, data):
+        tmp = self.path(name + ".tmp")
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path(name))
+
+    def _read(self, name):
+        with gzip.open(self.path(name), "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _remove(self, name):
+        try:
+            os.remove(self.path(name))
+        except OSError:
+            pass
+
+    # ── Audio ────────────────────────────────────────────────────────
+
+    def load_audio(self):
+        """The saved audio as a copy-on-write memory map, or None."""
+        if "audio" not in self.stages or not os.path.exists(self.path("audio.f32")):
+            return None
+        return np.memmap(
+            self.path("audio.f32"), dtype=np.float32, mode="c",
+            shape=(self.stages["audio"]["samples"],),
+        )
+
+    def save_audio(self, audio):
+        tmp = self.path("audio.f32.tmp")
+        np.asarray(audio, dtype=np.float32).tofile(tmp)
+        os.replace(tmp, self.path("audio.f32"))
+        self.stages["audio"] = {"samples": len(audio)}
+        self._save_manifest()
+
+    # ── Transcript ───────────────────────────────────────────────────
+
+    def save_language(self, language, probability):
+        """Record the detected spoken language as ``stages["language"]``."""
+        self.stages["language"] = [language, probability]
+        self._save_manifest()
+
+    def batches(self):
+        """The transcribed windows saved so far, as (segments, language)."""
+        count = self.stages.get("transcript", {}).get("batches", 0)
+        batches = []
+        next_id = 0
+        for i in range(count):
+            result = unpack_transcript(self._read(f"batch-{i:05d}.json.gz"))
+            for segment in result["segments"]:
+                segment["id"] = next_id
+                next_id += 1
+            batches.append((result["segments"], result["language"]))
+        return batches
+
+    def add_batch(self, segments, language):
+        count = self.stages.get("transcript", {}).get("batches", 0)
+        self._write(
+            f"batch-{count:05d}.json.gz",
+            pack_transcript({"segments": segments, "language": language}),
+        )
+        self.stages["transcript"] = {"batches": count + 1}
+        self._save_manifest()
+
+    def transcript(self):
+        """The complete transcript, or None if transcription did not finish."""
+        if not self.stages.get("transcript", {}).get("done"):
+            return None
+        return unpack_transcript(self._read("transcript.json.gz"))
+
+    def save_transcript(self, result):
+        """Record the complete transcript and drop the audio and windows."""
+        self._write("transcript.json.gz", pack_transcript(result))
+        count = self.stages.get("transcript", {}).get("batches", 0)
+        self.stages["transcript"] = {"done": True}
+        self.stages.pop("audio", None)
+        self._save_manifest()
+        self._remove("audio.f32")
+        for i in range(count):
+            self._remove(f"batch-{i:05d}.json.gz")
+
+    # ── Translations ─────────────────────────────────────────────────
+
+    def track(self, language):
+        """Saved subtitle cues for ``language``, or None."""
+        if language not in self.stages.get("translations", []):
+            return None
+        return self._read(f"track-{language}.json.gz")
+
+    def save_track(self, language, segments):
+        self._write(
+            f"track-{language}.json.gz",
+            [{"id": s["id"], "start": s["start"], "end": s["end"], "text": s["text"]}
+             for s in segments],
+        )
+        done = self.stages.setdefault("translations", [])
+        if language not in done:
+            done.append(language)
+        self._save_manifest()
+
+    # ── Burn ─────────────────────────────────────────────────────────
+
+    def burn_dir(self, params):
+        """Folder for burned parts, emptied if ``params`` changed since they were made."""
+        directory = self.path("burn")
+        if self.stages.get("burn", {}).get("params") != params:
+            shutil.rmtree(directory, ignore_errors=True)
+            self.stages["burn"] = {"params": params}
+            self._save_manifest()
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    def discard(self):
+        """Delete the checkpoint (after success, or when it is stale)."""
+        shutil.rmtree(self.directory, ignore_errors=True)
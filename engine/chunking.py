@@ -0,0 +1,113 @@
+import numpy as np
+
+from .audio import SAMPLE_RATE
+
+FRAME_SECONDS = 0.03
+# Frames converted at a time, so a memory-mapped input is never copied
+# into RAM whole.
+ENERGY_BLOCK_FRAMES = 8192
+
+
+def frame_energy(audio, frame_seconds=FRAME_SECONDS, sample_rate=SAMPLE_RATE):
+    """Return the RMS energy of consecutive non-overlapping frames."""
+    frame = max(1, int(frame_seconds * sample_rate))
+    n_frames = len(audio) // frame
+    energy = np.empty(n_frames, dtype=np.float32)
+    for lo in range(0, n_frames, ENERGY_BLOCK_FRAMES):
+        hi = min(n_frames, lo + ENERGY_BLOCK_FRAMES)
+        frames = np.asarray(audio[lo * frame:hi * frame], dtype=np.float32).reshape(-1, frame)
+        energy[lo:hi] = np.sqrt(np.mean(frames * frames, axis=1))
+    return energy
+
+
+def split_on_silence(audio, chunk_seconds, search_seconds=5.0,
+                     sample_rate=SAMPLE_RATE):
+    """Split audio into windows of roughly ``chunk_seconds`` each.
+
+    Every cut is moved to the quietest frame within ``search_seconds`` of
+    its nominal position so that words are not split in half.
+
+    Returns:
+        List of (start_sample, end_sample) pairs covering the whole input.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * sample_rate)
+    if chunk <= 0 or total <= chunk:
+        return [(0, total)]
+
+    frame = max(1, int(FRAME_SECONDS * sample_rate))
+    energy = frame_energy(audio, FRAME_SECONDS, sample_rate)
+    search = int(search_seconds / FRAME_SECONDS)
+
+    cuts = [0]
+    while total - cuts[-1] > chunk:
+        target = (cuts[-1] + chunk) // frame
+        lo = max(cuts[-1] // frame + 1, target - search)
+        hi = min(len(energy), target + search + 1)
+        if lo >= hi:
+            cut = cuts[-1] + chunk
+        else:
+            cut = (lo + int(np.argmin(energy[lo:hi]))) * frame
+        cuts.append(cut)
+    cuts.append(total)
+    return list(zip(cuts[:-1], cuts[1:]))
+
+
+def pad_windows(windows, overlap_seconds, total, sample_rate=SAMPLE_RATE):
+    """Extend each window by ``overlap_seconds`` on both sides for context."""
+    pad = int(overlap_seconds * sample_rate)
+    return [(max(0, start - pad), min(total, end + pad)) for start, end in windows]
+
+
+class SegmentStitcher:
+    """Incrementally merges per-window segments into one global timeline.
+
+    Windows must be added in order. Segments decoded from the overlapping
+    padding are kept only by the window that owns their midpoint, so each
+    stretch of speech appears once.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.count = 0
+        self.last_end = None
+
+    def add(self, owned, decoded, segments):
+        """Accept the segments of one window.
+
+        Args:
+            owned: (start_sample, end_sample) this window is responsible for.
+            decoded: (start_sample, end_sample) actually sent to the model;
+                segment times are relative to its start.
+
+        Returns:
+            The newly accepted segments with global timestamps and ids.
+        """
+        offset = decoded[0] / self.sample_rate
+        owned_start = owned[0] / self.sample_rate
+        owned_end = owned[1] / self.sample_rate
+        accepted = []
+        for segment in segments:
+            start = segment["start"] + offset
+            end = segment["end"] + offset
+            midpoint = (start + end) / 2
+            if not owned_start <= midpoint < owned_end:
+                continue
+            if self.last_end is not None and start < self.last_end:
+                start = self.last_end
+            merged = dict(segment, id=self.count, start=start, end=max(start, end))
+            if "words" in segment:
+                merged["words"] = [
+                    dict(w, start=w["start"] + offset, end=w["end"] + offset)
+                    for w in segment["words"]
+                ]
+            accepted.append(merged)
+            self.count += 1
+            self.last_end = merged["end"]
+        return accepted
+
+    def skip(self, segments):
+        """Account for already stitched segments (e.g. restored from a checkpoint)."""
+        self.count += len(segments)
+        if segments:
+            self.last_end = segments[-1]["end"]
@@ -0,0 +1,293 @@
+"""Headless command-line interface: ``python -m engine``.
+
+Processes any number of videos (files, globs or folders) through a job
+queue. Each job worker keeps its Whisper model warm between videos, and a
+JSON summary with per-stage timings is written at the end.
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from config import (
+    MODEL_OPTIONS,
+    SUPPORTED_VIDEO_FORMATS,
+    LANGUAGE_OPTIONS,
+    ENCODER_PRESETS,
+    DEFAULT_ENCODER_PRESET,
+    DECODING_PROFILES,
+    DEFAULT_DECODING_PROFILE,
+    BURN_PARALLEL_PARTS,
+    ASR_BACKEND,
+    TRANSCRIBE_WORKERS,
+)
+from .asr import ASR_BACKENDS
+from .burn import SOFT_SUBTITLE_CODECS, hex_to_ass
+from .checkpoint import has_pending_checkpoint
+from .engine import SubtitleEngine, language_srt_path
+from .metrics import JsonLinesSink
+
+VIDEO_EXTENSIONS = {ext.lstrip("*") for ext in SUPPORTED_VIDEO_FORMATS.split()}
+PROGRESS_PRINT_SECONDS = 5
+
+
+def find_videos(patterns):
+    """Expand files, globs and directories into a sorted list of videos."""
+    found = []
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True) or [pattern]
+        for path in matches:
+            if os.path.isdir(path):
+                for root, _, files in os.walk(path):
+                    found += [
+                        os.path.join(root, name) for name in files
+                        if os.path.splitext(name)[1].lower() in VIDEO_EXTENSIONS
+                    ]
+            elif os.path.isfile(path):
+                found.append(path)
+            else:
+                print(f"No such file: {path}", file=sys.stderr)
+    return sorted(dict.fromkeys(os.path.abspath(p) for p in found))
+
+
+def plan_outputs(video_path, output_dir, languages, do_srt, do_burn, output_mode,
+                 subtitle_format="srt"):
+    """Return (srt_path, output_video_path, expected_files) for one video."""
+    folder = output_dir or os.path.dirname(video_path)
+    name, ext = os.path.splitext(os.path.basename(video_path))
+    srt_path = os.path.join(folder, f"{name}.{subtitle_format}")
+    video_out = os.path.join(folder, name + "_subtitled" + ext)
+    if output_mode == "soft" and ext.lower() not in SOFT_SUBTITLE_CODECS:
+        video_out = os.path.splitext(video_out)[0] + ".mkv"
+
+    expected = []
+    if do_srt:
+        if len(languages) > 1:
+            expected += [language_srt_path(srt_path, lang) for lang in languages]
+        else:
+            expected.append(srt_path)
+    if do_burn:
+        expected.append(video_out)
+    return srt_path, video_out, expected
+
+
+def is_up_to_date(video_path, outputs):
+    """True if every output is newer than the input and no interrupted job
+    on the input is waiting to be resumed (its outputs may be partial)."""
+    if not outputs:
+        return False
+    source_mtime = os.path.getmtime(video_path)
+    return all(
+        os.path.exists(path) and os.path.getmtime(path) >= source_mtime
+        for path in outputs
+    ) and not has_pending_checkpoint(video_path)
+
+
+def run_job(job):
+    """Process one video; runs inside a job worker. Returns a summary dict."""
+    video_path = job["video_path"]
+    label = os.path.basename(video_path)
+    summary = {"input": video_path, "status": "done"}
+    srt_path, video_out, expected = plan_outputs(
+        video_path, job["output_dir"], job["languages"],
+        job["do_srt"], job["do_burn"], job["output_mode"], job["format"],
+    )
+
+    if not job["force"] and is_up_to_date(video_path, expected):
+        print(f"[{label}] Up to date, skipping.")
+        summary.update(status="skipped", outputs=expected)
+        return summary
+
+    last_status = [None, None, 0.0]  # text, stage, time printed
+
+    def on_progress(value, status_text=None):
+        # Encodes update their status (fps, ETA, ...) several times a second;
+        # within one stage, print at most every PROGRESS_PRINT_SECONDS.
+        if not status_text or status_text == last_status[0]:
+            return
+        stage = status_text.split("...")[0]
+        now = time.monotonic()
+        if stage == last_status[1] and now - last_status[2] < PROGRESS_PRINT_SECONDS:
+            return
+        last_status[:] = [status_text, stage, now]
+        print(f"[{label}] {int(value):3d}% {status_text}", flush=True)
+
+    engine = SubtitleEngine(
+        progress_callback=on_progress,
+        workers=job["workers"],
+        vad=job["vad"],
+        burn_parts=job["burn_parts"],
+        scratch_dir=job["scratch_dir"],
+        sinks=[JsonLinesSink(job["metrics"])] if job["metrics"] else None,
+        resume=job["resume"],
+        asr_backend=job["asr"],
+    )
+    languages = job["languages"]
+    start = time.perf_counter()
+    try:
+        srt_result, video_result, language = engine.generate(
+            video_path=video_path,
+            model_size=job["model"],
+            srt_path=srt_path,
+            target_language=languages if len(languages) > 1 else languages[0],
+            output_video_path=video_out if job["do_burn"] else None,
+            do_srt=job["do_srt"],
+            do_burn=job["do_burn"],
+            subtitle_font=job["font"],
+            primary_color=job["color"],
+            background_box=job["box"],
+            output_mode=job["output_mode"],
+            encoder_preset=job["encoder_preset"],
+            decoding_profile=job["profile"],
+        )
+        outputs = list(srt_result.values()) if isinstance(srt_result, dict) else [srt_result]
+        summary.update(
+            outputs=[p for p in outputs + [video_result] if p],
+            language=language,
+        )
+    except Exception as e:
+        print(f"[{label}] Failed: {e}", file=sys.stderr)
+        summary.update(status="failed", error=str(e))
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    summary["timings"] = {k: round(v, 3) for k, v in engine.timings.items()}
+    return summary
+
+
+def build_parser():
+    languages = sorted(set(LANGUAGE_OPTIONS.values()))
+    parser = argparse.ArgumentParser(
+        prog="python -m engine",
+        description="Generate, translate and burn subtitles for videos without a GUI.",
+    )
+    parser.add_argument("inputs", nargs="+", help="Video files, glob patterns or folders.")
+    parser.add_argument("-m", "--model", default="base",
+                        choices=list(MODEL_OPTIONS.values()), help="Whisper model size.")
+    parser.add_argument("--profile", default=DEFAULT_DECODING_PROFILE,
+                        choices=list(DECODING_PROFILES),
+                        help="Decoding profile: speed vs. accuracy of transcription.")
+    parser.add_argument("--asr", default=ASR_BACKEND, choices=list(ASR_BACKENDS),
+                        help="Speech recognition engine (faster-whisper: int8 on CPU).")
+    parser.add_argument("-l", "--language", action="append", dest="languages",
+                        choices=languages, metavar="CODE",
+                        help="Target language (repeat for several). "
+                             f"One of: {', '.join(languages)}. Default: en.")
+    parser.add_argument("-o", "--output-dir", help="Output folder (default: next to each video).")
+    parser.add_argument("-f", "--format", default="srt", choices=["srt", "vtt", "ass"],
+                        help="Subtitle file format (ass carries --font/--color/--box).")
+    parser.add_argument("--no-srt", dest="do_srt", action="store_false",
+                        help="Don't keep .srt files (only useful with --burn/--soft).")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--burn", action="store_true", help="Burn subtitles into the video.")
+    output.add_argument("--soft", action="store_true",
+                        help="Mux subtitles as selectable tracks (no re-encode).")
+    parser.add_argument("--preset", default=DEFAULT_ENCODER_PRESET,
+                        choices=list(ENCODER_PRESETS), help="Encoder preset for --burn.")
+    parser.add_argument("--burn-parts", type=int, default=BURN_PARALLEL_PARTS,
+                        help="Split --burn into N keyframe-aligned parts encoded in parallel.")
+    parser.add_argument("--font", help="Subtitle font name for --burn.")
+    parser.add_argument("--color", help="Subtitle text color as #RRGGBB for --burn.")
+    parser.add_argument("--box", action="store_true", help="Draw a background box for --burn.")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="Videos processed concurrently (each in its own process).")
+    parser.add_argument("--workers", type=int, default=TRANSCRIBE_WORKERS,
+                        help="Transcription worker processes per video.")
+    parser.add_argument("--no-vad", dest="vad", action="store_false",
+                        help="Transcribe silent and non-speech regions too.")
+    parser.add_argument("--scratch-dir",
+                        help="Folder for per-job intermediate files (e.g. /dev/shm).")
+    parser.add_argument("--metrics",
+                        help="Append per-stage timing/resource events to this JSONL file.")
+    parser.add_argument("--force", action="store_true",
+                        help="Reprocess videos whose outputs are already up to date.")
+    parser.add_argument("--no-resume", dest="resume", action="store_false",
+                        help="Start over instead of resuming interrupted jobs.")
+    parser.add_argument("--summary", default="subtitle_summary.json",
+                        help="Where to write the JSON job summary.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if not args.do_srt and not (args.burn or args.soft):
+        print("Nothing to do: --no-srt needs --burn or --soft.", file=sys.stderr)
+        return 2
+
+    videos = find_videos(args.inputs)
+    if not videos:
+        print("No videos found.", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    jobs = [
+        {
+            "video_path": path,
+            "output_dir": args.output_dir,
+            "model": args.model,
+            "profile": args.profile,
+            "asr": args.asr,
+            "languages": list(dict.fromkeys(args.languages or ["en"])),
+            "do_srt": args.do_srt,
+            "format": args.format,
+            "do_burn": args.burn or args.soft,
+            "output_mode": "soft" if args.soft else "burn",
+            "encoder_preset": args.preset,
+            "burn_parts": args.burn_parts,
+            "font": args.font,
+            "color": hex_to_ass(args.color) if args.color else None,
+            "box": args.box,
+            "workers": args.workers,
+            "vad": args.vad,
+            "scratch_dir": args.scratch_dir,
+            "metrics": args.metrics,
+            "force": args.force,
+            "resume": args.resume,
+        }
+        for path in videos
+    ]
+    print(f"{len(jobs)} video(s) queued, {args.jobs} at a time.")
+
+    start = time.perf_counter()
+    results = []
+    try:
+        if args.jobs <= 1:
+            # In-process: the model cache keeps the model warm across videos.
+            for job in jobs:
+                results.append(run_job(job))
+        else:
+            with ProcessPoolExecutor(
+                max_workers=args.jobs,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as executor:
+                futures = [executor.submit(run_job, job) for job in jobs]
+                for future in as_completed(futures):
+                    results.append(future.result())
+    except KeyboardInterrupt:
+        print("Interrupted; writing summary for finished jobs.", file=sys.stderr)
+
+    counts = {status: 0 for status in ("done", "skipped", "failed")}
+    stage_totals = {}
+    for result in results:
+        counts[result["status"]] += 1
+        for stage, seconds in result.get("timings", {}).items():
+            stage_totals[stage] = round(stage_totals.get(stage, 0.0) + seconds, 3)
+
+    summary = {
+        "total_seconds": round(time.perf_counter() - start, 3),
+        "counts": counts,
+        "stage_seconds": stage_totals,
+        "jobs": sorted(results, key=lambda r: r["input"]),
+    }
+    with open(args.summary, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+
+    print(
+        f"Done: {counts['done']} processed, {counts['skipped']} skipped, "
+        f"{counts['failed']} failed. Summary: {args.summary}"
+    )
+    return 1 if counts["failed"] else 0
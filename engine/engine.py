@@ -1,10 +1,62 @@
+import copy
+import functools
 import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-from .audio import extract_audio
-from .transcribe import load_model, transcribe
-from .translate import translate_segments
-from .srt import build_srt
-from .burn import burn_subtitles
+from config import (
+    TRANSCRIBE_WORKERS,
+    TRANSCRIBE_CHUNK_SECONDS,
+    VAD_ENABLED,
+    TRANSLATION_BACKEND,
+    STREAMING_ENABLED,
+    STREAM_WINDOW_SECONDS,
+    DEFAULT_ENCODER_PRESET,
+    BURN_PARALLEL_PARTS,
+    SCRATCH_DIR,
+    SCRATCH_QUOTA_MB,
+    METRICS_LOG_PATH,
+    RESEGMENT_ENABLED,
+    RESUME_ENABLED,
+    LANGUAGE_DETECT_WINDOWS,
+    LANGUAGE_DETECT_MODEL,
+    LANGUAGE_DETECT_CHUNKED_MODEL,
+    DECODING_PROFILES,
+    DEFAULT_DECODING_PROFILE,
+    ASR_BACKEND,
+)
+from .asr import MODEL_PARAMETERS, get_asr_backend
+from .audio import BYTES_PER_SAMPLE, SAMPLE_RATE, extract_audio, probe_duration
+from .transcribe import (
+    collect_segments,
+    decode_options,
+    detect_language,
+    iter_transcribe,
+    iter_transcribe_chunked,
+    language_name,
+    load_model,
+    transcribe,
+)
+from .transcript_cache import TranscriptCache, file_fingerprint
+from .translate import translate_segments, translation_code
+from .translation_cache import TranslationCache
+from .subtitles import SubtitleStyle, SubtitleWriter, write_subtitles
+from .burn import burn_subtitles, mux_subtitles, soft_subtitle_path
+from .parallel_burn import burn_subtitles_parallel
+from .vad import skip_silence
+from .workspace import Workspace
+from .resegment import resegment, wrap_text
+from .metrics import JsonLinesSink, StageCosts, StageTimer, WeightedProgress
+from .checkpoint import JobCheckpoint, content_digest
+
+
+def language_srt_path(srt_path, language):
+    """Return ``name.<language>.srt`` next to ``srt_path``."""
+    base, ext = os.path.splitext(srt_path)
+    return f"{base}.{language}{ext}"
 
 
 class SubtitleEngine:
@@ -14,59 +66,689 @@ class SubtitleEngine:
         progress_callback: Called with (value, status_text) to report progress.
         stop_check: Called to check if the user requested a stop.
             Should return True if the process should stop.
+        workers: Number of processes used to transcribe long audio in
+            chunks. 1 keeps the single-call serial path.
+        chunk_seconds: Target length of each transcription chunk.
+        vad: Skip silent and non-speech regions before transcription.
+        translation_backend: Name from ``translate.BACKENDS`` or a
+            TranslationBackend instance (e.g. FakeBackend in tests).
+        transcript_cache: TranscriptCache to reuse transcripts across runs;
+            None uses the default on-disk cache, False disables it.
+        streaming: Translate and write subtitles window by window while
+            transcription is still running, so SRT files fill up early.
+        burn_parts: Number of keyframe-aligned ranges hard burning is
+            split into and encoded in parallel. 1 uses a single ffmpeg.
+        scratch_dir: Where each generate() call creates its private
+            workspace for intermediate files (None: system temp folder).
+        scratch_quota_mb: Size limit of that workspace (None: no limit).
+        sinks: Callables receiving a dict event after every stage (wall
+            and CPU time, peak RSS, audio seconds, real-time factor) and
+            once per job. Events also go to METRICS_LOG_PATH if it is set.
+        stage_costs: StageCosts used to weight progress by how long each
+            stage really takes; None uses the default on-disk figures,
+            False keeps the fixed progress bands.
+        resegment: Re-cut Whisper's segments into cues limited by line
+            length, line count and duration using word timestamps.
+        resume: Keep a JobCheckpoint of finished work (audio, transcribed
+            windows, translations, burned parts) so that running a
+            stopped or crashed job again continues where it left off.
+        asr_backend: Name from ``asr.ASR_BACKENDS`` or an AsrBackend
+            subclass (e.g. FakeAsrBackend in tests).
     """
 
-    def __init__(self, progress_callback=None, stop_check=None):
+    def __init__(self, progress_callback=None, stop_check=None,
+                 workers=TRANSCRIBE_WORKERS, chunk_seconds=TRANSCRIBE_CHUNK_SECONDS,
+                 vad=VAD_ENABLED, translation_backend=TRANSLATION_BACKEND,
+                 transcript_cache=None, streaming=STREAMING_ENABLED,
+                 burn_parts=BURN_PARALLEL_PARTS, scratch_dir=SCRATCH_DIR,
+                 scratch_quota_mb=SCRATCH_QUOTA_MB, sinks=None, stage_costs=None,
+                 resegment=RESEGMENT_ENABLED, resume=RESUME_ENABLED,
+                 asr_backend=ASR_BACKEND):
         self.progress_callback = progress_callback
         self.stop_check = stop_check
+        self.workers = workers
+        self.chunk_seconds = chunk_seconds
+        self.vad = vad
+        self.translation_backend = translation_backend
+        if transcript_cache is None:
+            transcript_cache = TranscriptCache()
+        self.transcript_cache = transcript_cache
+        self.streaming = streaming
+        self.burn_parts = burn_parts
+        self.scratch_dir = scratch_dir
+        self.scratch_quota_mb = scratch_quota_mb
+        self.sinks = list(sinks or [])
+        if METRICS_LOG_PATH:
+            self.sinks.append(JsonLinesSink(METRICS_LOG_PATH))
+        if stage_costs is None:
+            stage_costs = StageCosts()
+        self.stage_costs = stage_costs
+        self.resegment = resegment
+        self.resume = resume
+        self.asr_backend = get_asr_backend(asr_backend)
+        # Wall-clock seconds per stage of the last generate() call.
+        self.timings = {}
+        # Progress callback for the current job (weighted by stage cost).
+        self._progress = progress_callback
+        self._audio_seconds = None
+        self._checkpoint = None
+        # Spoken language of the current job's audio, once known.
+        self._spoken = None
+        # Audio extracted by the current job, checkpointed only if the job
+        # does not finish.
+        self._extracted = None
+        # Decoding profile of the current job and its Whisper options.
+        self._profile = DECODING_PROFILES[DEFAULT_DECODING_PROFILE]
+        self._decode_options = decode_options(word_timestamps=resegment)
+
+    @contextmanager
+    def _stage(self, name):
+        timer = StageTimer(name)
+        try:
+            yield
+        finally:
+            event = timer.event(self._audio_seconds)
+            self.timings[name] = self.timings.get(name, 0.0) + event["wall_seconds"]
+            self._emit(event)
+
+    def _emit(self, event):
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except Exception as e:  # metrics must never break a job
+                print(f"Metrics sink failed: {e}")
 
     def generate(self, video_path, model_size, srt_path,
                  target_language="en", output_video_path=None,
                  do_srt=True, do_burn=False, subtitle_font=None,
-                 primary_color=None, background_box=False):
+                 primary_color=None, background_box=False, output_mode="burn",
+                 encoder_preset=DEFAULT_ENCODER_PRESET,
+                 decoding_profile=DEFAULT_DECODING_PROFILE):
         """Run the full generation pipeline.
 
         Args:
-            target_language: "en" for English (Whisper built-in),
+            srt_path: Subtitle output path; a .vtt or .ass extension writes
+                      WebVTT or ASS (styled like the burn) instead of SRT.
+            target_language: "en" for English (Whisper built-in when
+                             it is the only target),
                              "original" to keep spoken language,
-                             any other lang code for post-translation.
+                             any other lang code for post-translation
+                             straight from the spoken language.
+                             A list of codes transcribes once and writes
+                             one ``name.<code>.srt`` per language.
+            output_mode: "burn" renders the (first) language into the
+                         video, "soft" muxes every language as a
+                         selectable subtitle track without re-encoding.
+            encoder_preset: Name from ENCODER_PRESETS used by "burn".
+            decoding_profile: Name from DECODING_PROFILES; trades Whisper
+                              accuracy for speed.
 
         Returns:
             (srt_path or None, output_video_path or None, detected_language)
+            When a list of languages is given, the first item is a
+            {language: srt_path} dict instead.
         """
-        cb = self.progress_callback
+        if output_mode not in ("burn", "soft"):
+            raise ValueError(f"Unknown output mode: {output_mode!r}")
+        if decoding_profile not in DECODING_PROFILES:
+            raise ValueError(f"Unknown decoding profile: {decoding_profile!r}")
+        self._profile = DECODING_PROFILES[decoding_profile]
+        self._decode_options = decode_options(decoding_profile, self.resegment)
         sc = self.stop_check
-        audio_path = "temp_audio.wav"
+        multi = not isinstance(target_language, str)
+        targets = list(dict.fromkeys(target_language)) if multi else [target_language]
+        # Let Whisper translate only when English is all that is wanted;
+        # otherwise transcribe the spoken language and translate from it
+        # directly, rather than pivoting through Whisper's English.
+        base_language = "en" if set(targets) == {"en"} else "original"
+        self.timings = {}
+        self._spoken = None
+        self._progress = cb = self.progress_callback
+        self._audio_seconds = probe_duration(video_path)
+        job_started = time.perf_counter()
+        status = "failed"
+        workspace = Workspace(self.scratch_dir, self.scratch_quota_mb)
+        # Only used when srt_path asks for .ass output.
+        style = SubtitleStyle(subtitle_font, primary_color, background_box)
+        # Subtitles that are only needed to produce the video stay in the
+        # workspace instead of being written next to the output.
+        scratch_srt = do_burn and not do_srt
+        if scratch_srt:
+            srt_path = workspace.path(os.path.basename(srt_path))
+        self._checkpoint = checkpoint = None
 
         try:
-            extract_audio(video_path, audio_path, cb, sc)
-            model = load_model(model_size, cb, sc)
-            result = transcribe(model, audio_path, target_language, cb, sc)
-
-            # Post-translate if target is not English and not original
-            if target_language not in ("en", "original"):
-                translate_segments(result["segments"], target_language, cb, sc)
-
-            build_srt(result["segments"], srt_path, cb, sc)
-
-            if do_burn:
-                burn_subtitles(
-                    video_path, srt_path, output_video_path, cb, sc,
-                    font_name=subtitle_font,
-                    primary_color=primary_color,
-                    background_box=background_box,
+            if self.resume:
+                self._checkpoint = checkpoint = JobCheckpoint(
+                    video_path,
+                    [model_size, base_language, self._transcript_options(), self.resegment],
+                )
+                saved = checkpoint.describe()
+                if saved:
+                    print(f"Resuming interrupted job ({saved}).")
+
+            fingerprint = None
+            result = None
+            if self.transcript_cache:
+                fingerprint = file_fingerprint(video_path)
+                result = self._cached_transcript(fingerprint, model_size, base_language)
+            cached = result is not None
+            resumed = False
+            if not cached and checkpoint:
+                result = checkpoint.transcript()
+                resumed = result is not None
+            if result is not None:
+                self._spoken = result["language"]
+
+            paths = {
+                language: language_srt_path(srt_path, language) if multi else srt_path
+                for language in targets
+            }
+            if cb and self.stage_costs:
+                stages = {"srt", "mux" if output_mode == "soft" else "burn"}
+                if not (cached or resumed):
+                    stages |= {"extract", "model_load", "transcribe"}
+                if any(language != base_language for language in targets):
+                    stages.add("translate")
+                if not do_burn:
+                    stages -= {"mux", "burn"}
+                self._progress = cb = WeightedProgress(
+                    cb, stages, self.stage_costs,
+                    final_stage="mux" if output_mode == "soft" else "burn",
                 )
+            if cached:
+                print("Using cached transcript; skipping audio extraction and Whisper.")
+                if cb:
+                    cb(60, "Using cached transcript...")
+            elif resumed:
+                print("Using the transcript of the interrupted run.")
+                if cb:
+                    cb(60, "Using saved transcript...")
 
-            if not do_srt and do_burn:
-                os.remove(srt_path)
-                srt_path = None
+            if not (cached or resumed) and self.streaming:
+                result = self._stream(
+                    video_path, workspace, model_size, base_language, paths, style
+                )
+                srt_paths = paths
+                if checkpoint:
+                    checkpoint.save_transcript(result)
+            else:
+                if not (cached or resumed):
+                    result = self._transcribe(video_path, workspace, model_size, base_language)
+                    if checkpoint:
+                        checkpoint.save_transcript(result)
+
+                with self._stage("translate"):
+                    tracks = self._translate_all(result["segments"], targets, base_language, cb, sc)
+
+                srt_paths = {}
+                with self._stage("srt"):
+                    for language, segments in tracks.items():
+                        write_subtitles(segments, paths[language], cb, sc, style=style)
+                        srt_paths[language] = paths[language]
+
+            if fingerprint and not cached:
+                self.transcript_cache.put(
+                    self.transcript_cache.key(
+                        fingerprint, model_size, self._task_language(base_language),
+                        self._transcript_options(),
+                    ),
+                    result,
+                )
+
+            if do_burn and output_mode == "soft":
+                output_video_path = soft_subtitle_path(output_video_path)
+                with self._stage("mux"):
+                    mux_subtitles(
+                        video_path,
+                        [
+                            (path, result["language"] if lang == "original" else lang)
+                            for lang, path in srt_paths.items()
+                        ],
+                        output_video_path, cb, sc, duration=self._audio_seconds,
+                    )
+            elif do_burn:
+                burn = burn_subtitles
+                if self.burn_parts > 1:
+                    work_dir = None
+                    if checkpoint:
+                        # The subtitles are rewritten on every run, so they
+                        # are identified by content rather than mtime.
+                        work_dir = checkpoint.burn_dir({
+                            "subtitles": content_digest(srt_paths[targets[0]]),
+                            "style": list(style),
+                            "preset": encoder_preset,
+                            "parts": self.burn_parts,
+                            "output": os.path.splitext(output_video_path)[1],
+                        })
+                        # Parts outlive the workspace but still count against
+                        # its quota; together they are about the input's size.
+                        workspace.reserve(os.path.getsize(video_path), work_dir)
+                    burn = functools.partial(
+                        burn_subtitles_parallel, parts=self.burn_parts, work_dir=work_dir
+                    )
+                with self._stage("burn"):
+                    burn(
+                        video_path, srt_paths[targets[0]], output_video_path,
+                        progress_callback=cb, stop_check=sc,
+                        font_name=subtitle_font,
+                        primary_color=primary_color,
+                        background_box=background_box,
+                        encoder_preset=encoder_preset,
+                        duration=self._audio_seconds,
+                        workspace=workspace,
+                    )
+
+            if scratch_srt:
+                srt_paths = {}
 
-            os.remove(audio_path)
             if cb:
                 cb(100, "Complete!")
+            status = "done"
+            if checkpoint:
+                checkpoint.discard()
+            if self.stage_costs:
+                self.stage_costs.update(self.timings, self._audio_seconds)
 
-            return srt_path, output_video_path, result["language"]
+            if multi:
+                return srt_paths or None, output_video_path, result["language"]
+            return srt_paths.get(targets[0]), output_video_path, result["language"]
+
+        except InterruptedError:
+            status = "stopped"
+            raise
 
         finally:
-            if os.path.exists(audio_path):
-                os.remove(audio_path)
+            if checkpoint and status != "done":
+                self._checkpoint_audio(checkpoint, workspace)
+            self._extracted = None
+            workspace.cleanup()
+            if checkpoint and status != "done":
+                print("Progress saved; run the same job again to resume.")
+            wall = time.perf_counter() - job_started
+            self._emit({
+                "event": "job",
+                "input": video_path,
+                "status": status,
+                "time": time.time(),
+                "wall_seconds": round(wall, 3),
+                "audio_seconds": self._audio_seconds,
+                "rtf": round(wall / self._audio_seconds, 4) if self._audio_seconds else None,
+                "stages": {k: round(v, 3) for k, v in self.timings.items()},
+            })
+
+    def _checkpoint_audio(self, checkpoint, workspace):
+        """Save the extracted audio of an unfinished job for its next run.
+
+        Done only when a job stops or fails, so finished jobs never write
+        a second copy of their audio; the copy counts against the scratch
+        quota.
+        """
+        audio = self._extracted
+        if audio is None or checkpoint.stages.get("transcript", {}).get("done"):
+            return
+        try:
+            workspace.reserve(len(audio) * BYTES_PER_SAMPLE, checkpoint.directory)
+            checkpoint.save_audio(audio)
+        except (OSError, RuntimeError) as e:
+            print(f"Could not save the extracted audio for the next run: {e}")
+
+    def _cached_transcript(self, fingerprint, model_size, base_language):
+        """A cached transcript usable for ``base_language``, or None."""
+        options = self._transcript_options()
+        result = self.transcript_cache.get(
+            self.transcript_cache.key(fingerprint, model_size, base_language, options)
+        )
+        if result is None and base_language == "en":
+            # English speech is transcribed rather than translated; see _task_language.
+            result = self.transcript_cache.get(
+                self.transcript_cache.key(fingerprint, model_size, "original", options)
+            )
+            if result is not None and result["language"] != "en":
+                result = None
+        return result
+
+    def _task_language(self, base_language):
+        """``base_language`` adjusted to the detected speech: English audio
+        only needs transcribing, not translating to English."""
+        if base_language == "en" and self._spoken == "en":
+            return "original"
+        return base_language
+
+    def _is_transcript_language(self, language, base_language):
+        """Whether the transcript is already in ``language``."""
+        if language == base_language:
+            return True
+        return (
+            base_language == "original" and self._spoken is not None
+            and translation_code(self._spoken) == language
+        )
+
+    def _source_language(self, base_language):
+        """Source language code for translating the transcript."""
+        if base_language == "en":
+            return "en"
+        return translation_code(self._spoken) if self._spoken else "auto"
+
+    def _detect_language(self, audio, model_size, chunked=False):
+        """Detect the spoken language (or reuse the interrupted run's result)
+        and report it before the long decode starts."""
+        cb = self._progress
+        sc = self.stop_check
+        checkpoint = self._checkpoint
+        saved = checkpoint.stages.get("language") if checkpoint else None
+        if saved:
+            language, probability = saved
+        else:
+            with self._stage("model_load"):
+                model = load_model(
+                    self._detect_model(model_size, chunked), cb, sc,
+                    quantize=self._profile["quantize"], backend=self.asr_backend,
+                )
+            with self._stage("detect"):
+                language, probability = detect_language(
+                    model, audio, LANGUAGE_DETECT_WINDOWS, cb, sc
+                )
+            if checkpoint:
+                checkpoint.save_language(language, probability)
+        self._spoken = language
+        name = language_name(language)
+        print(f"Detected language: {name} ({probability:.0%} confidence).")
+        if cb:
+            cb(25, f"Detected language: {name}")
+        self._emit({
+            "event": "language",
+            "time": time.time(),
+            "language": language,
+            "name": name,
+            "probability": round(probability, 3),
+        })
+
+    @staticmethod
+    def _detect_model(model_size, chunked):
+        """Model to detect the spoken language with.
+
+        Chunked jobs would otherwise load the job's model in the main
+        process on top of one per worker, so they use a small one.
+        """
+        if LANGUAGE_DETECT_MODEL:
+            return LANGUAGE_DETECT_MODEL
+        if not chunked:
+            return model_size
+        size = MODEL_PARAMETERS.get(model_size.split("-")[0].split(".")[0], float("inf"))
+        if size <= MODEL_PARAMETERS[LANGUAGE_DETECT_CHUNKED_MODEL]:
+            return model_size
+        return LANGUAGE_DETECT_CHUNKED_MODEL
+
+    def _transcript_options(self):
+        """Settings besides model and task that change the transcript."""
+        options = dict(
+            self._decode_options, quantize=self._profile["quantize"], vad=self.vad,
+            asr=self.asr_backend.name,
+        )
+        if self.workers > 1:
+            options["chunk_seconds"] = self.chunk_seconds
+        elif self.streaming:
+            options["window_seconds"] = STREAM_WINDOW_SECONDS
+        return options
+
+    def _iter_transcribe(self, video_path, workspace, model_size, base_language):
+        """Extract audio, skip non-speech and run Whisper on the rest.
+
+        Yields (segments, language) batches with timestamps on the original
+        audio: one per window when streaming or chunked, otherwise a single
+        batch for the whole file.
+        """
+        cb = self._progress
+        sc = self.stop_check
+        checkpoint = self._checkpoint
+        restored = checkpoint.batches() if checkpoint else []
+        audio = checkpoint.load_audio() if checkpoint else None
+        if audio is not None:
+            print("Using the audio extracted by the interrupted run.")
+        else:
+            with self._stage("extract"):
+                # The file is only written when long inputs spill to a memory map.
+                audio = extract_audio(
+                    video_path, workspace.path("audio.f32"), cb, sc,
+                    reserve=workspace.reserve, duration=self._audio_seconds,
+                )
+            self._extracted = audio
+        timeline = None
+        if self.vad:
+            with self._stage("vad"):
+                audio, timeline = skip_silence(
+                    audio, cb, sc, workspace.path("speech.f32"), workspace.reserve,
+                )
+
+        if len(audio) == 0:
+            print("No speech found; nothing to transcribe.")
+            return
+
+        chunked = self.workers > 1 and len(audio) > self.chunk_seconds * SAMPLE_RATE
+        if LANGUAGE_DETECT_WINDOWS:
+            self._detect_language(audio, model_size, chunked)
+        base_language = self._task_language(base_language)
+        spoken = self._spoken
+
+        if chunked:
+            batches = iter_transcribe_chunked(
+                model_size, audio, base_language,
+                workers=self.workers, chunk_seconds=self.chunk_seconds,
+                progress_callback=cb, stop_check=sc, resume=restored, language=spoken,
+                options=self._decode_options, threads=self._profile["threads"],
+                quantize=self._profile["quantize"], backend=self.asr_backend,
+            )
+        elif restored and not self.streaming:
+            batches = restored
+        else:
+            with self._stage("model_load"):
+                model = load_model(
+                    model_size, cb, sc,
+                    quantize=self._profile["quantize"], backend=self.asr_backend,
+                )
+            model.set_threads(self._profile["threads"])
+            if self.streaming:
+                batches = iter_transcribe(
+                    model, audio, base_language, STREAM_WINDOW_SECONDS, cb, sc,
+                    resume=restored, language=spoken, options=self._decode_options,
+                )
+            else:
+                with self._stage("transcribe"):
+                    result = transcribe(
+                        model, audio, base_language, cb, sc,
+                        language=spoken, options=self._decode_options,
+                    )
+                batches = [(result["segments"], result["language"])]
+
+        with self._stage("transcribe"):
+            for index, (segments, language) in enumerate(batches):
+                # Saved before remapping, in the timeline the windows were cut on.
+                if checkpoint and index >= len(restored):
+                    checkpoint.add_batch(segments, language)
+                if timeline:
+                    timeline.remap_segments(segments)
+                yield segments, language
+        # The memory map (if any) is released when ``audio`` goes out of
+        # scope here and generate() drops ``_extracted``, before it cleans
+        # up the workspace.
+
+    def _transcribe(self, video_path, workspace, model_size, base_language):
+        return collect_segments(
+            self._iter_transcribe(video_path, workspace, model_size, base_language),
+            self._progress,
+        )
+
+    def _stream(self, video_path, workspace, model_size, base_language, paths, style=None):
+        """Transcribe window by window while translating and writing SRTs.
+
+        One consumer thread per language translates each window as soon as
+        it is decoded and appends it to that language's SRT file, so
+        translation and writing overlap with transcription. The files are
+        written beside their final paths and only moved into place when
+        every window is done.
+
+        Returns:
+            The full transcription result, as ``transcribe`` would.
+        """
+        cb = self._progress
+        sc = self.stop_check
+        queues = {language: queue.Queue() for language in paths}
+        writers = {}
+        errors = []
+
+        # One connection shared by the consumers, opened on first use.
+        caches = []
+        cache_lock = threading.Lock()
+
+        def shared_cache():
+            with cache_lock:
+                if not caches:
+                    caches.append(TranslationCache())
+                return caches[0]
+
+        def consume(language):
+            writer = writers[language]
+            try:
+                while True:
+                    batch = queues[language].get()
+                    if batch is None:
+                        return
+                    if errors:
+                        continue
+                    # The spoken language is detected before the first batch.
+                    if not self._is_transcript_language(language, base_language):
+                        batch = copy.deepcopy(batch)
+                        translate_segments(
+                            batch, language, None, sc,
+                            source_lang=self._source_language(base_language),
+                            backend=self.translation_backend,
+                            cache=shared_cache(), verbose=False,
+                        )
+                        self._wrap(batch)
+                    writer.write(batch)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                writer.close()
+
+        try:
+            for language in paths:
+                writers[language] = SubtitleWriter(paths[language], style)
+        except OSError:
+            for writer in writers.values():
+                writer.discard()
+            raise
+        threads = [
+            threading.Thread(target=consume, args=(language,), daemon=True)
+            for language in paths
+        ]
+        for thread in threads:
+            thread.start()
+
+        def batches():
+            try:
+                for batch in self._iter_transcribe(
+                    video_path, workspace, model_size, base_language
+                ):
+                    if errors:
+                        raise errors[0]
+                    cues = self._cues(batch[0])
+                    for q in queues.values():
+                        q.put(cues)
+                    yield batch
+            finally:
+                for q in queues.values():
+                    q.put(None)
+                with self._stage("translate"):
+                    if cb:
+                        cb(60, "Finishing translations and subtitles...")
+                    for thread in threads:
+                        thread.join()
+                    for cache in caches:
+                        cache.close()
+
+        try:
+            result = collect_segments(batches())
+            if errors:
+                raise errors[0]
+        except BaseException:
+            # Only complete files reach the output paths.
+            for writer in writers.values():
+                writer.discard()
+            raise
+        for writer in writers.values():
+            writer.commit()
+        print(f"Wrote {len(result['segments'])} subtitle(s) for {len(paths)} language(s).")
+        if cb:
+            cb(80)
+        return result
+
+    def _translate_all(self, segments, targets, base_language, cb, sc):
+        """Produce one segment list per target language.
+
+        Targets that match the transcription are used as-is; the rest are
+        translated from it in parallel, one thread per language.
+        """
+        source = self._source_language(base_language)
+        checkpoint = self._checkpoint
+        segments = self._cues(segments)
+        tracks = {}
+        pending = []
+        for language in targets:
+            saved = checkpoint.track(language) if checkpoint else None
+            if self._is_transcript_language(language, base_language):
+                tracks[language] = segments
+            elif saved is not None:
+                print(f"Using the '{language}' translation of the interrupted run.")
+                tracks[language] = saved
+            else:
+                tracks[language] = copy.deepcopy(segments)
+                pending.append(language)
+
+        def finish(language):
+            self._wrap(tracks[language])
+            if checkpoint:
+                checkpoint.save_track(language, tracks[language])
+
+        if len(pending) == 1:
+            translate_segments(
+                tracks[pending[0]], pending[0], cb, sc,
+                source_lang=source, backend=self.translation_backend,
+            )
+            finish(pending[0])
+        elif pending:
+            print(f"Translating into {len(pending)} languages in parallel...")
+            fractions = dict.fromkeys(pending, 0.0)
+
+            def progress_for(language):
+                def report(value, status_text=None):
+                    fractions[language] = (value - 60) / 10
+                    if cb:
+                        cb(60 + sum(fractions.values()) / len(fractions) * 10, status_text)
+                return report
+
+            with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                futures = [
+                    executor.submit(
+                        translate_segments, tracks[language], language,
+                        progress_for(language), sc,
+                        source_lang=source, backend=self.translation_backend,
+                    )
+                    for language in pending
+                ]
+                for language, future in zip(pending, futures):
+                    future.result()
+                    finish(language)
+
+        return {language: tracks[language] for language in targets}
+
+    def _cues(self, segments):
+        """Subtitle cues for transcribed segments, re-cut if enabled."""
+        return resegment(segments) if self.resegment else segments
+
+    def _wrap(self, segments):
+        """Re-wrap translated cue text to the line limits, in place."""
+        if self.resegment:
+            for segment in segments:
+                segment["text"] = wrap_text(segment["text"])
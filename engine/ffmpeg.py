@@ -0,0 +1,172 @@
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from collections import namedtuple
+
+# How often running encodes are checked for progress and stop requests;
+# this bounds how long a stop takes to kill ffmpeg.
+POLL_SECONDS = 0.2
+
+EncodeProgress = namedtuple("EncodeProgress", "position duration fps speed eta")
+
+
+def _platform_options():
+    # Keep ffmpeg from flashing a console window under the Windows GUI.
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NO_WINDOW}
+    return {}
+
+
+def popen(cmd, **kwargs):
+    """subprocess.Popen for ffmpeg/ffprobe on any platform.
+
+    stdin defaults to /dev/null so ffmpeg never reads from the terminal.
+    """
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    return subprocess.Popen(cmd, **_platform_options(), **kwargs)
+
+
+def run(cmd, **kwargs):
+    """subprocess.run counterpart of ``popen``."""
+    kwargs.setdefault("stdin", subprocess.DEVNULL)
+    return subprocess.run(cmd, **_platform_options(), **kwargs)
+
+
+def format_clock(seconds):
+    """Format seconds as H:MM:SS, or M:SS under an hour."""
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{secs:02d}"
+    return f"{minutes}:{secs:02d}"
+
+
+def describe(progress):
+    """Human-readable summary of an EncodeProgress, for status lines."""
+    parts = [f"{format_clock(progress.position)} / {format_clock(progress.duration)}"]
+    if progress.fps:
+        parts.append(f"{progress.fps:.0f} fps")
+    if progress.speed:
+        parts.append(f"{progress.speed:.2f}x")
+    if progress.eta is not None:
+        parts.append(f"ETA {format_clock(progress.eta)}")
+    return " · ".join(parts)
+
+
+def encode_summary(processes, duration, elapsed):
+    """"N frames in Xs (Y fps, Zx realtime)" for finished encodes."""
+    frames = sum(p.frames for p in processes)
+    line = f"{frames} frames in {elapsed:.1f}s"
+    if elapsed:
+        line += f" ({frames / elapsed:.1f} fps"
+        if duration:
+            line += f", {duration / elapsed:.2f}x realtime"
+        line += ")"
+    return line
+
+
+def _number(value):
+    try:
+        return float(value.rstrip("x"))
+    except ValueError:  # "N/A" before the first frame
+        return None
+
+
+class FFmpegProcess:
+    """An ffmpeg run whose ``-progress`` output is parsed in the background.
+
+    A reader thread consumes the key=value blocks ffmpeg writes to stdout,
+    so the caller never blocks on the pipe and can poll ``position``,
+    ``frames``, ``fps`` and ``speed`` (and check for stop requests) at its own pace.
+    stderr goes to a temporary file and is only read on failure.
+    """
+
+    def __init__(self, cmd):
+        self.position = 0.0
+        self.frames = 0
+        self.fps = None
+        self.speed = None
+        self._stderr = tempfile.TemporaryFile(mode="w+", encoding="utf-8", errors="replace")
+        self.process = popen(
+            [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]],
+            stdout=subprocess.PIPE,
+            stderr=self._stderr,
+            text=True,
+        )
+        self._reader = threading.Thread(target=self._read, daemon=True)
+        self._reader.start()
+
+    def _read(self):
+        for line in self.process.stdout:
+            key, _, value = line.strip().partition("=")
+            if key == "out_time_us" and value.isdigit():
+                self.position = int(value) / 1_000_000
+            elif key == "frame" and value.isdigit():
+                self.frames = int(value)
+            elif key == "fps":
+                self.fps = _number(value)
+            elif key == "speed":
+                self.speed = _number(value)
+
+    def running(self):
+        return self.process.poll() is None
+
+    @property
+    def returncode(self):
+        return self.process.returncode
+
+    def error_output(self):
+        """The tail of what ffmpeg wrote to stderr."""
+        self._stderr.seek(0)
+        return self._stderr.read()[-2000:].strip()
+
+    def close(self):
+        """Kill ffmpeg if it is still running and release its pipes."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        self._reader.join(timeout=1)
+        self._stderr.close()
+
+
+def watch(processes, duration, progress_callback=None, stop_check=None,
+          start=80, end=95, status="Encoding..."):
+    """Wait for ffmpeg processes, reporting their combined progress.
+
+    Progress maps the summed output position of ``processes`` over
+    ``duration`` seconds onto [start, end]. Status text carries elapsed and
+    total time, fps, speed and an ETA. Raises InterruptedError within
+    POLL_SECONDS of ``stop_check`` returning True; the caller is expected
+    to ``close()`` the processes.
+
+    Returns:
+        Wall-clock seconds until every process exited.
+    """
+    began = time.perf_counter()
+    while any(p.running() for p in processes):
+        if stop_check and stop_check():
+            raise InterruptedError("Process stopped by user.")
+        if progress_callback and duration:
+            progress = snapshot(processes, duration, time.perf_counter() - began)
+            progress_callback(
+                start + (end - start) * progress.position / duration,
+                f"{status} {describe(progress)}",
+            )
+        time.sleep(POLL_SECONDS)
+    return time.perf_counter() - began
+
+
+def snapshot(processes, duration, elapsed):
+    """Combine the progress of parallel encodes of one ``duration``."""
+    position = min(duration, sum(p.position for p in processes))
+    fps = sum(p.fps or 0 for p in processes) or None
+    speed = sum(p.speed or 0 for p in processes) or None
+    eta = None
+    if speed:
+        eta = (duration - position) / speed
+    elif position and elapsed:
+        eta = (duration - position) * elapsed / position
+    return EncodeProgress(position, duration, fps, speed, eta)
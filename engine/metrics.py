@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+
+from config import CACHE_DIR
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Progress bands the pipeline modules report in, and the stage each belongs
+# to. ``WeightedProgress`` rescales them by how long each stage takes.
+PROGRESS_BANDS = [
+    (0, 10, "extract"),
+    (10, 25, "model_load"),
+    (25, 60, "transcribe"),
+    (60, 70, "translate"),
+    (70, 80, "srt"),
+    (80, 95, "burn"),
+]
+
+# Seconds of work per second of audio, until real runs have been measured.
+DEFAULT_STAGE_COSTS = {
+    "extract": 0.01,
+    "vad": 0.005,
+    "model_load": 0.02,
+    "transcribe": 0.5,
+    "translate": 0.05,
+    "srt": 0.002,
+    "burn": 0.5,
+    "mux": 0.01,
+}
+
+
+def resource_usage():
+    """Return (cpu_seconds, child_cpu_seconds, peak_rss_mb) of this process.
+
+    Child CPU covers ffmpeg and worker processes that have exited. Peak RSS
+    is the high-water mark since the process started; both are None where
+    the ``resource`` module is unavailable.
+    """
+    cpu = time.process_time()
+    if resource is None:
+        return cpu, None, None
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but bytes on macOS.
+    peak_mb = peak / 2**20 if os.uname().sysname == "Darwin" else peak / 1024
+    return cpu, children.ru_utime + children.ru_stime, round(peak_mb, 1)
+
+
+class StageTimer:
+    """Measures one stage run and builds its event."""
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.started = time.perf_counter()
+        self.usage = resource_usage()
+
+    def event(self, audio_seconds=None, **extra):
+        wall = time.perf_counter() - self.started
+        cpu, child_cpu, peak_rss = resource_usage()
+        event = {
+            "event": "stage",
+            "stage": self.stage,
+            "time": time.time(),
+            "wall_seconds": round(wall, 3),
+            "cpu_seconds": round(cpu - self.usage[0], 3),
+            "child_cpu_seconds": (
+                round(child_cpu - self.usage[1], 3) if child_cpu is not None else None
+            ),
+            "peak_rss_mb": peak_rss,
+            "audio_seconds": audio_seconds,
+            "rtf": round(wall / audio_seconds, 4) if audio_seconds else None,
+        }
+        event.update(extra)
+        return event
+
+
+class JsonLinesSink:
+    """Appends every event as one JSON line to ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class MemorySink:
+    """Keeps events in a list, e.g. for tests or an end-of-run summary."""
+
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def stages(self):
+        """Total wall seconds per stage."""
+        totals = {}
+        for event in self.events:
+            if event["event"] == "stage":
+                totals[event["stage"]] = totals.get(event["stage"], 0.0) + event["wall_seconds"]
+        return totals
+
+
+class StageCosts:
+    """Measured seconds per audio second for each stage, kept across runs.
+
+    Each finished job nudges the stored figures towards what it measured
+    (exponential moving average), so progress weights follow the machine
+    and settings actually in use.
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, "stage_costs.json")
+        self.costs = dict(DEFAULT_STAGE_COSTS)
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self.costs.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def estimate(self, stage):
+        return self.costs.get(stage, 0.01)
+
+    def update(self, timings, audio_seconds):
+        if not audio_seconds:
+            return
+        for stage, seconds in timings.items():
+            measured = seconds / audio_seconds
+            old = self.costs.get(stage)
+            self.costs[stage] = (
+                measured if old is None
+                else old + self.SMOOTHING * (measured - old)
+            )
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.costs, f, indent=2)
+        os.replace(tmp, self.path)
+
+
+class WeightedProgress:
+    """Rescales the pipeline's fixed progress bands by expected stage cost.
+
+    Modules keep reporting in PROGRESS_BANDS; each band is mapped onto a
+    share of 0-100 proportional to the estimated cost of its stage among
+    the ``stages`` this job will run. Stages outside the plan get no
+    share, and progress never moves backwards.
+    """
+
+    def __init__(self, callback, stages, costs, final_stage="burn"):
+        self.callback = callback
+        self.final_stage = final_stage
+        weights = [
+            costs.estimate(self._stage(name)) if self._stage(name) in stages else 0.0
+            for _, _, name in PROGRESS_BANDS
+        ]
+        total = sum(weights) or 1.0
+        self.ranges = []
+        position = 0.0
+        for (low, high, _), weight in zip(PROGRESS_BANDS, weights):
+            share = weight / total * 100
+            self.ranges.append((low, high, position, share))
+            position += share
+        self.last = 0.0
+
+    def _stage(self, band):
+        return self.final_stage if band == "burn" else band
+
+    def __call__(self, value, status_text=None):
+        if value >= 100:
+            mapped = 100.0
+        else:
+            mapped = self.ranges[-1][2] + self.ranges[-1][3]
+            for low, high, start, share in self.ranges:
+                if low <= value < high:
+                    mapped = start + (value - low) / (high - low) * share
+                    break
+        self.last = max(self.last, mapped)
+        self.callback(self.last, status_text)
@@ -0,0 +1,184 @@
+import os
+import shutil
+
+from config import DEFAULT_ENCODER_PRESET, MIN_BURN_PART_SECONDS
+from .audio import probe_duration
+from .burn import encoder_args, subtitle_filter
+from .subtitles import SubtitleStyle, dump_subtitles, read_subtitles
+from . import ffmpeg
+from .ffmpeg import FFmpegProcess, encode_summary, watch
+from .workspace import Workspace
+
+
+def probe_keyframes(video_path):
+    """Return the timestamps (seconds) of the video's keyframes."""
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-show_entries", "frame=best_effort_timestamp_time",
+        "-of", "csv=p=0",
+        video_path,
+    ]
+    out = ffmpeg.run(cmd, capture_output=True, text=True).stdout
+    times = []
+    for line in out.splitlines():
+        try:
+            times.append(float(line.strip().rstrip(",")))
+        except ValueError:
+            continue
+    return sorted(set(times))
+
+
+def plan_ranges(keyframes, duration, parts):
+    """Split [0, duration) into up to ``parts`` ranges starting at keyframes.
+
+    Each cut is moved to the keyframe nearest its ideal position, so every
+    range can be decoded independently and concatenated without gaps.
+    """
+    parts = max(1, min(parts, int(duration // MIN_BURN_PART_SECONDS)))
+    candidates = [t for t in keyframes if 0 < t < duration]
+    cuts = []
+    for k in range(1, parts):
+        if not candidates:
+            break
+        ideal = duration * k / parts
+        cut = min(candidates, key=lambda t: abs(t - ideal))
+        if not cuts or cut > cuts[-1]:
+            cuts.append(cut)
+    bounds = [0.0] + cuts + [duration]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def shift_segments(segments, start, end):
+    """The segments overlapping [start, end), with times relative to ``start``."""
+    length = end - start
+    shifted = []
+    for segment in segments:
+        seg_start, seg_end = segment["start"] - start, segment["end"] - start
+        if seg_end <= 0 or seg_start >= length:
+            continue
+        shifted.append(dict(segment, start=max(0.0, seg_start), end=min(length, seg_end)))
+    return shifted
+
+
+def burn_subtitles_parallel(video_path, srt_path, output_video_path, parts,
+                            progress_callback=None, stop_check=None,
+                            font_name=None, primary_color=None, background_box=False,
+                            encoder_preset=DEFAULT_ENCODER_PRESET, work_dir=None,
+                            duration=None, workspace=None):
+    """Burn subtitles by encoding keyframe-aligned time ranges in parallel.
+
+    The video is split at keyframes into ``parts`` ranges. Each range is
+    encoded by its own ffmpeg process with styled ASS subtitles shifted to its start,
+    then the pieces are concatenated losslessly and the original audio is
+    copied in. Falls back to ``parts=1`` behaviour for short videos.
+
+    With a ``work_dir`` the parts are kept there: parts that finished
+    before a stop or crash are reused by the next call with the same
+    folder. Otherwise they go in the job's ``workspace`` (or one of their
+    own), reserved against its quota and deleted once joined.
+    ``duration`` (if known) saves probing the video again.
+    """
+    if progress_callback:
+        progress_callback(80, "Burning subtitles into video...")
+
+    if duration is None:
+        duration = probe_duration(video_path)
+    if not duration:
+        raise RuntimeError("Could not read the video duration with ffprobe.")
+    ranges = plan_ranges(probe_keyframes(video_path), duration, parts)
+    print(
+        f"Burning subtitles into video (ffmpeg, '{encoder_preset}' preset, "
+        f"{len(ranges)} parallel parts)..."
+    )
+
+    ext = os.path.splitext(output_video_path)[1]
+    threads = max(1, (os.cpu_count() or 1) // len(ranges))
+    preset_args = encoder_args(encoder_preset, output_video_path)
+    preset_args[preset_args.index("-threads") + 1] = str(threads)
+
+    segments = read_subtitles(srt_path)
+    style = SubtitleStyle(font_name, primary_color, background_box)
+    keep_parts = work_dir is not None
+    owned = None
+    processes = []
+    # (process, partial path, final path) of the parts being encoded.
+    running = []
+    try:
+        if not keep_parts:
+            if workspace is None:
+                workspace = owned = Workspace(prefix="subtitle-burn-")
+            # The parts add up to about the size of the input.
+            workspace.reserve(os.path.getsize(video_path))
+            work_dir = workspace.path("burn")
+            os.makedirs(work_dir, exist_ok=True)
+        part_paths = []
+        remaining = 0.0
+        for i, (start, end) in enumerate(ranges):
+            part_video = os.path.join(work_dir, f"part{i}{ext}")
+            part_paths.append(part_video)
+            if os.path.exists(part_video):
+                continue
+            part_ass = os.path.join(work_dir, f"part{i}.ass")
+            partial = os.path.join(work_dir, f"part{i}.partial{ext}")
+            dump_subtitles(shift_segments(segments, start, end), part_ass, style)
+            process = FFmpegProcess([
+                "ffmpeg", "-y", "-v", "error",
+                "-ss", f"{start:.6f}", "-i", video_path,
+                "-t", f"{end - start:.6f}",
+                "-an",
+                "-vf", subtitle_filter(part_ass),
+                *preset_args,
+                partial,
+            ])
+            processes.append(process)
+            running.append((process, partial, part_video))
+            remaining += end - start
+        if len(processes) < len(ranges):
+            print(f"Reusing {len(ranges) - len(processes)} part(s) burned by an earlier run.")
+
+        elapsed = watch(
+            processes, remaining, progress_callback, stop_check, start=80, end=94,
+            status=f"Burning subtitles into video ({len(processes)} parts)...",
+        )
+        for process in processes:
+            if process.returncode != 0:
+                raise RuntimeError(
+                    "ffmpeg failed to burn subtitles. "
+                    "Make sure ffmpeg is installed and in PATH.\n" + process.error_output()
+                )
+        for _, partial, part_video in running:
+            os.replace(partial, part_video)
+
+        list_path = os.path.join(work_dir, "parts.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            for path in part_paths:
+                f.write("file '{}'\n".format(path.replace("'", "'\\''")))
+        concat = ffmpeg.run(
+            [
+                "ffmpeg", "-y", "-nostdin", "-v", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-i", video_path,
+                "-map", "0:v", "-map", "1:a?",
+                "-c", "copy",
+                output_video_path,
+            ],
+            capture_output=True, text=True,
+        )
+        if concat.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed to join burned parts: {concat.stderr.strip()}")
+    finally:
+        for process, partial, part_video in running:
+            # Parts that completed survive a stop, for the next run to reuse.
+            if process.process.poll() == 0 and os.path.exists(partial):
+                os.replace(partial, part_video)
+            process.close()
+        if not keep_parts and work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        if owned:
+            owned.cleanup()
+
+    print(f"Subtitles burned successfully: {encode_summary(processes, remaining, elapsed)}.")
+    if progress_callback:
+        progress_callback(95)
@@ -0,0 +1,126 @@
+import math
+import textwrap
+from array import array
+
+from config import (
+    SUBTITLE_MAX_CHARS_PER_LINE,
+    SUBTITLE_MAX_LINES,
+    SUBTITLE_MAX_DURATION,
+    SUBTITLE_MIN_GAP,
+)
+
+# A pause between words at least this long always starts a new cue.
+SPLIT_PAUSE_SECONDS = 1.0
+SENTENCE_END = (".", "?", "!", "…", "。", "？", "！")
+
+
+class WordArray:
+    """Word timestamps of a run of segments in flat, typed arrays.
+
+    Start and end times live in ``array('d')`` buffers and the word texts
+    (with Whisper's leading space, if any) in one list, so long
+    transcripts cost a few bytes per word instead of a dict each.
+    """
+
+    __slots__ = ("starts", "ends", "texts")
+
+    def __init__(self):
+        self.starts = array("d")
+        self.ends = array("d")
+        self.texts = []
+
+    def extend(self, words):
+        for word in words:
+            self.starts.append(word["start"])
+            self.ends.append(word["end"])
+            self.texts.append(word["word"])
+
+    def __len__(self):
+        return len(self.texts)
+
+
+def wrap_text(text, max_chars=SUBTITLE_MAX_CHARS_PER_LINE, max_lines=SUBTITLE_MAX_LINES):
+    """Break text into lines of at most ``max_chars``, widening them
+    evenly if that would take more than ``max_lines`` lines."""
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return text
+    lines = textwrap.wrap(text, max_chars)
+    if len(lines) > max_lines:
+        lines = textwrap.wrap(text, math.ceil(len(text) / max_lines) + 2)
+    return "\n".join(lines)
+
+
+def _cues(words, max_chars, max_lines, max_duration):
+    """One linear pass over ``words``, yielding (start, end, text) cues."""
+    starts, ends, texts = words.starts, words.ends, words.texts
+    first = last = None
+    lines = []
+    chars = 0
+    for k in range(len(words)):
+        raw = texts[k]
+        word = raw.strip()
+        if not word:
+            continue
+        if first is not None:
+            line = lines[-1]
+            fits_line = len(line) + len(raw.rstrip()) <= max_chars
+            if (
+                ends[k] - starts[first] > max_duration
+                or starts[k] - ends[last] >= SPLIT_PAUSE_SECONDS
+                or (texts[last].rstrip().endswith(SENTENCE_END) and chars >= max_chars // 2)
+                or (not fits_line and len(lines) >= max_lines)
+            ):
+                yield starts[first], ends[last], "\n".join(lines)
+                first = None
+            elif not fits_line:
+                lines.append(word)
+                chars += len(word)
+                last = k
+                continue
+        if first is None:
+            first, lines, chars = k, [word], len(word)
+        else:
+            lines[-1] += raw.rstrip()
+            chars += len(raw.rstrip())
+        last = k
+    if first is not None:
+        yield starts[first], ends[last], "\n".join(lines)
+
+
+def resegment(segments, max_chars=SUBTITLE_MAX_CHARS_PER_LINE, max_lines=SUBTITLE_MAX_LINES,
+              max_duration=SUBTITLE_MAX_DURATION, min_gap=SUBTITLE_MIN_GAP):
+    """Re-cut segments into readable cues using their word timestamps.
+
+    Cues hold at most ``max_lines`` lines of ``max_chars`` characters,
+    last at most ``max_duration`` seconds and break after sentences and
+    long pauses. Consecutive cues are kept ``min_gap`` seconds apart.
+    Segments without word timestamps are kept as they are, with their
+    text wrapped.
+
+    Returns:
+        New segment dicts (id, start, end, text); the input is not changed.
+    """
+    cues = []
+    words = WordArray()
+
+    def flush():
+        nonlocal words
+        cues.extend(_cues(words, max_chars, max_lines, max_duration))
+        words = WordArray()
+
+    for segment in segments:
+        if segment.get("words"):
+            words.extend(segment["words"])
+        else:
+            flush()
+            cues.append((segment["start"], segment["end"],
+                         wrap_text(segment["text"], max_chars, max_lines)))
+    flush()
+
+    result = []
+    for i, (start, end, text) in enumerate(cues):
+        if i + 1 < len(cues):
+            end = max(start, min(end, cues[i + 1][0] - min_gap))
+        result.append({"id": i, "start": start, "end": end, "text": text})
+    return result
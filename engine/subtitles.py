@@ -0,0 +1,225 @@
+"""Subtitle serialization: SRT, WebVTT and ASS.
+
+Timestamps are computed with integer millisecond arithmetic and a whole
+file is assembled in memory and written in one call, so even 100k-cue
+transcripts take a fraction of a second. The format follows the file
+extension.
+"""
+
+import os
+import re
+from collections import namedtuple
+
+FORMATS = {".srt": "srt", ".vtt": "vtt", ".ass": "ass"}
+
+# Progress is reported about this many times per file, not per cue.
+PROGRESS_STEPS = 50
+
+# Font, colour (ASS &H00BBGGRR) and background box for ASS output. None
+# fields keep the defaults ffmpeg/libass use for plain SRT files.
+SubtitleStyle = namedtuple(
+    "SubtitleStyle", "font_name primary_color background_box", defaults=(None, None, False)
+)
+
+_TIME_RE = re.compile(r"(\d+):(\d{2}):(\d{2})[,.](\d{3})")
+
+
+def subtitle_format(path):
+    """Return "srt", "vtt" or "ass" for a subtitle path."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in FORMATS:
+        raise ValueError(f"Unsupported subtitle format: {ext or path!r}")
+    return FORMATS[ext]
+
+
+def _ms(seconds):
+    return int(seconds * 1000 + 0.5)
+
+
+def _clock(ms, separator):
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{separator}{ms:03d}"
+
+
+def _ass_clock(ms):
+    cs = (ms + 5) // 10
+    hours, cs = divmod(cs, 360_000)
+    minutes, cs = divmod(cs, 6000)
+    seconds, cs = divmod(cs, 100)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{cs:02d}"
+
+
+def ass_header(style=None):
+    """Script info and a single "Default" style built from ``style``."""
+    style = style or SubtitleStyle()
+    font = (style.font_name or "Arial").replace(",", "")
+    primary = style.primary_color or "&H00FFFFFF"
+    if style.background_box:
+        border_style, back = 3, "&H80000000"
+    else:
+        border_style, back = 1, "&H00000000"
+    return (
+        "[Script Info]\n"
+        "ScriptType: v4.00+\n"
+        "PlayResX: 384\n"
+        "PlayResY: 288\n"
+        "WrapStyle: 0\n"
+        "ScaledBorderAndShadow: yes\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, "
+        "OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, "
+        "ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, "
+        "MarginL, MarginR, MarginV, Encoding\n"
+        f"Style: Default,{font},16,{primary},&H000000FF,&H00000000,{back},"
+        f"0,0,0,0,100,100,0,0,{border_style},1,0,2,10,10,10,1\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+
+def _header(fmt, style):
+    if fmt == "vtt":
+        return "WEBVTT\n\n"
+    if fmt == "ass":
+        return ass_header(style)
+    return ""
+
+
+def _cue(fmt, index, segment):
+    start, end = _ms(segment["start"]), _ms(segment["end"])
+    text = segment["text"].strip()
+    if fmt == "srt":
+        return f"{index}\n{_clock(start, ',')} --> {_clock(end, ',')}\n{text}\n\n"
+    if fmt == "vtt":
+        return f"{index}\n{_clock(start, '.')} --> {_clock(end, '.')}\n{text}\n\n"
+    text = text.replace("{", "\\{").replace("}", "\\}").replace("\n", "\\N")
+    return f"Dialogue: 0,{_ass_clock(start)},{_ass_clock(end)},Default,,0,0,0,,{text}\n"
+
+
+def write_subtitles(segments, path, progress_callback=None, stop_check=None, style=None):
+    """Write segments as an SRT, WebVTT or ASS file (chosen by extension).
+
+    ``style`` (a SubtitleStyle) only applies to ASS. Progress moves from
+    70 to 80 in at most PROGRESS_STEPS updates.
+    """
+    fmt = subtitle_format(path)
+    if progress_callback:
+        progress_callback(70, "Building subtitle data...")
+    total = len(segments)
+    print(f"Processing segments... ({total} segments)")
+
+    step = max(1, total // PROGRESS_STEPS)
+    parts = [_header(fmt, style)]
+    for i, segment in enumerate(segments):
+        parts.append(_cue(fmt, i + 1, segment))
+        if (i + 1) % step == 0:
+            if stop_check and stop_check():
+                raise InterruptedError("Process stopped by user.")
+            if progress_callback:
+                progress_callback(70 + (i + 1) / total * 10)
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("".join(parts))
+
+    if progress_callback:
+        progress_callback(80)
+    if stop_check and stop_check():
+        raise InterruptedError("Process stopped by user.")
+
+
+def dump_subtitles(segments, path, style=None):
+    """Write segments to ``path`` without progress reporting or logging."""
+    fmt = subtitle_format(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(_header(fmt, style) + "".join(
+            _cue(fmt, i + 1, segment) for i, segment in enumerate(segments)
+        ))
+
+
+def _ass_seconds(clock):
+    hours, minutes, seconds = clock.split(":")
+    return (int(hours) * 60 + int(minutes)) * 60 + float(seconds)
+
+
+def read_subtitles(path):
+    """Parse an SRT, WebVTT or ASS file into segment dicts."""
+    with open(path, encoding="utf-8-sig") as f:
+        content = f.read().replace("\r\n", "\n")
+    segments = []
+    if subtitle_format(path) == "ass":
+        for line in content.split("\n"):
+            if not line.startswith("Dialogue:"):
+                continue
+            fields = line[len("Dialogue:"):].split(",", 9)
+            text = fields[9].replace("\\N", "\n").replace("\\{", "{").replace("\\}", "}")
+            segments.append({
+                "id": len(segments), "start": _ass_seconds(fields[1]),
+                "end": _ass_seconds(fields[2]), "text": text,
+            })
+        return segments
+
+    for block in content.split("\n\n"):
+        lines = block.strip("\n").split("\n")
+        for i, line in enumerate(lines):
+            if "-->" not in line:
+                continue
+            times = _TIME_RE.findall(line)
+            if len(times) != 2:
+                break
+            start, end = (
+                ((int(h) * 60 + int(m)) * 60 + int(s)) + int(ms) / 1000
+                for h, m, s, ms in times
+            )
+            segments.append({
+                "id": len(segments), "start": start, "end": end,
+                "text": "\n".join(lines[i + 1:]),
+            })
+            break
+    return segments
+
+
+class SubtitleWriter:
+    """Appends cues to a subtitle file as they become available.
+
+    Cues go to ``<path>.partial``, flushed on each ``write`` so it is a
+    valid (partial) subtitle file while the rest of the video is still
+    being processed. ``commit`` moves it to ``path`` once the job is
+    complete; ``discard`` deletes it, so a failed or stopped job never
+    leaves a truncated file where the output belongs.
+    """
+
+    def __init__(self, path, style=None):
+        self.path = path
+        self.partial_path = path + ".partial"
+        self.count = 0
+        self._format = subtitle_format(path)
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self._file.write(_header(self._format, style))
+
+    def write(self, segments):
+        parts = []
+        for segment in segments:
+            self.count += 1
+            parts.append(_cue(self._format, self.count, segment))
+        self._file.write("".join(parts))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+    def commit(self):
+        """Close the file and move it into place."""
+        self.close()
+        os.replace(self.partial_path, self.path)
+
+    def discard(self):
+        """Close and delete the unfinished file."""
+        self.close()
+        try:
+            os.remove(self.partial_path)
+        except OSError:
+            pass
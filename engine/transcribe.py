@@ -1,13 +1,181 @@
-import whisper
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
 
+# The speech recognition engines take seconds to import, so the backends
+# import them when a model is first loaded; importing the engine (and
+# opening the GUI) stays fast.
+from config import (
+    MODEL_CACHE_BUDGET_MB,
+    CHUNK_OVERLAP_SECONDS,
+    STREAM_WINDOW_SECONDS,
+    RESEGMENT_ENABLED,
+    LANGUAGE_DETECT_WINDOWS,
+    DECODING_PROFILES,
+    DEFAULT_DECODING_PROFILE,
+)
+from .asr import get_asr_backend
+from .audio import SAMPLE_RATE
+from .chunking import SegmentStitcher, pad_windows, split_on_silence
 
-def load_model(model_size, progress_callback=None, stop_check=None):
-    """Load a Whisper model by size name."""
+# Profile settings that apply to the model and process, not to decoding.
+RUNTIME_SETTINGS = ("threads", "quantize")
+
+# Whisper decodes (and detects the language on) 30 s of audio at a time.
+LANGUAGE_WINDOW_SAMPLES = 30 * SAMPLE_RATE
+
+
+def decode_options(profile=DEFAULT_DECODING_PROFILE, word_timestamps=RESEGMENT_ENABLED):
+    """Keyword arguments for ``AsrBackend.transcribe`` from a DECODING_PROFILES entry.
+
+    They are also part of the transcript cache key. Word timestamps feed
+    the subtitle re-segmentation, so pass whether the job re-segments.
+    """
+    if profile not in DECODING_PROFILES:
+        raise ValueError(f"Unknown decoding profile: {profile!r}")
+    options = {
+        key: value for key, value in DECODING_PROFILES[profile].items()
+        if key not in RUNTIME_SETTINGS
+    }
+    options["word_timestamps"] = word_timestamps
+    return options
+
+
+class ModelCache:
+    """Process-wide registry of loaded Whisper models.
+
+    Models are loaded through an ASR backend (see ``asr.ASR_BACKENDS``),
+    keyed by (backend, size, device, load-time variant) and kept warm
+    across jobs. When the total size of cached models exceeds
+    ``budget_mb`` the least recently used ones are evicted. Concurrent
+    requests for the same model wait for a single load instead of loading
+    it twice.
+    """
+
+    def __init__(self, budget_mb=MODEL_CACHE_BUDGET_MB):
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self._models = OrderedDict()  # key -> (model, nbytes)
+        self._loading = {}  # key -> threading.Event
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.load_seconds = 0.0
+
+    @staticmethod
+    def _key(model_size, device, quantize, threads, backend):
+        backend = get_asr_backend(backend)
+        device = device or backend.default_device()
+        return backend, model_size, device, backend.variant(device, quantize, threads)
+
+    def get(self, model_size, device=None, quantize=False, threads=None, backend=None):
+        """Return a loaded model (an AsrBackend), loading it on a cache miss."""
+        key = self._key(model_size, device, quantize, threads, backend)
+        while True:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    self.hits += 1
+                    return self._models[key][0]
+                event = self._loading.get(key)
+                if event is None:
+                    self._loading[key] = threading.Event()
+                    self.misses += 1
+                    break
+            event.wait()
+
+        try:
+            backend, size, device, variant = key
+            start = time.perf_counter()
+            model = backend(size, device, quantize, threads)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.load_seconds += elapsed
+                self._models[key] = (model, model.nbytes)
+                self._evict()
+            print(
+                f"Loaded Whisper model '{size}' on {device} with {backend.name}"
+                f"{' (' + ', '.join(variant) + ')' if variant else ''} in {elapsed:.1f}s."
+            )
+            return model
+        finally:
+            with self._lock:
+                self._loading.pop(key).set()
+
+    def preload(self, model_size, device=None, quantize=False, backend=None):
+        """Load a model in a background thread so a later ``get`` is a hit."""
+        def run():
+            try:
+                self.get(model_size, device, quantize, backend=backend)
+            except Exception as e:
+                print(f"Preloading Whisper model '{model_size}' failed: {e}")
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, model_size, device=None, quantize=False, threads=None, backend=None):
+        key = self._key(model_size, device, quantize, threads, backend)
+        with self._lock:
+            return key in self._models
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "load_seconds": round(self.load_seconds, 3),
+                "cached": [
+                    f"{backend.name}:{size}@{device}" + "".join(f"+{v}" for v in variant)
+                    for backend, size, device, variant in self._models
+                ],
+                "cached_mb": round(
+                    sum(n for _, n in self._models.values()) / 1024 / 1024, 1
+                ),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def _evict(self):
+        total = sum(n for _, n in self._models.values())
+        # Always keep the most recently used model, even if it alone is over budget.
+        while total > self.budget_bytes and len(self._models) > 1:
+            (_, size, device, _), (_, nbytes) = self._models.popitem(last=False)
+            total -= nbytes
+            print(f"Evicted Whisper model '{size}' ({device}) from cache.")
+
+
+model_cache = ModelCache()
+
+
+def preload_model(model_size, quantize=False, backend=None):
+    """Warm the model cache in the background (e.g. on dropdown change)."""
+    return model_cache.preload(model_size, quantize=quantize, backend=backend)
+
+
+def load_model(model_size, progress_callback=None, stop_check=None, quantize=False,
+               backend=None):
+    """Load a Whisper model by size name, reusing a cached one if possible.
+
+    ``backend`` names the ASR engine (default: ASR_BACKEND); ``quantize``
+    asks it for its int8 variant.
+    """
     if progress_callback:
         progress_callback(10, "Loading Whisper model...")
-    print("Loading Whisper model...")
 
-    model = whisper.load_model(model_size)
+    if model_cache.is_loaded(model_size, quantize=quantize, backend=backend):
+        print(f"Using cached Whisper model '{model_size}'.")
+    else:
+        print("Loading Whisper model...")
+    model = model_cache.get(model_size, quantize=quantize, backend=backend)
+    stats = model_cache.stats()
+    print(
+        f"Model cache: {stats['hits']} hit(s), {stats['misses']} miss(es), "
+        f"{stats['load_seconds']:.1f}s spent loading."
+    )
 
     if progress_callback:
         progress_callback(25)
@@ -16,31 +184,77 @@ def load_model(model_size, progress_callback=None, stop_check=None):
     return model
 
 
-def transcribe(model, audio_path, target_language="en",
-               progress_callback=None, stop_check=None):
-    """Transcribe audio using a loaded Whisper model.
+def language_name(code):
+    """English name of a Whisper language code, e.g. "de" -> "German"."""
+    try:
+        from whisper.tokenizer import LANGUAGES
+    except ImportError:  # other ASR backends do not ship the names
+        return code
+    return LANGUAGES.get(code, code).title()
+
+
+def detect_language(model, audio, windows=LANGUAGE_DETECT_WINDOWS,
+                    progress_callback=None, stop_check=None):
+    """Identify the spoken language from a few 30 s windows of the audio.
+
+    The windows are spread evenly over the (speech-only) audio and the
+    language probabilities of all of them are averaged, so a quiet intro
+    or a short passage in another language does not decide on its own.
+
+    Returns:
+        (language code, probability)
+    """
+    if progress_callback:
+        progress_callback(25, "Detecting language...")
+    window = LANGUAGE_WINDOW_SAMPLES
+    count = max(1, windows)
+    if len(audio) <= window:
+        starts = [0]
+    else:
+        starts = sorted({(len(audio) - window) * (k + 1) // (count + 1) for k in range(count)})
+
+    totals = Counter()
+    for start in starts:
+        if stop_check and stop_check():
+            raise InterruptedError("Process stopped by user.")
+        totals.update(model.language_probs(audio[start:start + window]))
+    language, total = totals.most_common(1)[0]
+    return language, total / len(starts)
+
+
+def _task_for(target_language):
+    if target_language == "original":
+        return "transcribe", "Transcribing (original language)..."
+    return "translate", "Transcribing & translating to English..."
+
+
+def transcribe(model, audio, target_language="en",
+               progress_callback=None, stop_check=None, language=None, options=None):
+    """Transcribe audio using a loaded model (see ``load_model``).
 
     Args:
+        audio: 16 kHz mono float32 samples from ``extract_audio``
+               (a file path is also accepted).
         target_language: "original" keeps the spoken language as-is,
                          "en" uses Whisper's built-in translate-to-English,
                          any other code triggers transcribe (then translate later).
+        language: Spoken language if already known (see ``detect_language``);
+                  None lets Whisper detect it.
+        options: Decoding options from ``decode_options`` (default profile
+                 if None).
     """
-    if target_language == "original":
-        task = "transcribe"
-        status = "Transcribing (original language)..."
-    else:
-        task = "translate"
-        status = "Transcribing & translating to English..."
+    task, status = _task_for(target_language)
 
     if progress_callback:
         progress_callback(25, status)
     print(status)
 
     result = model.transcribe(
-        audio_path,
+        audio,
         task=task,
-        beam_size=5,
-        verbose=True
+        language=language,
+        verbose=True,
+        **(options or decode_options())
     )
 
     if progress_callback:
@@ -48,3 +262,196 @@ def transcribe(model, audio_path, target_language="en",
     if stop_check and stop_check():
         raise InterruptedError("Process stopped by user.")
     return result
+
+
+def _replay(resume, stitcher, total, progress_callback=None):
+    """Yield already decoded windows, bringing ``stitcher`` up to date."""
+    for i, (segments, language) in enumerate(resume):
+        stitcher.skip(segments)
+        if progress_callback:
+            progress_callback(25 + (i + 1) / total * 35)
+        yield segments, language
+
+
+def iter_transcribe(model, audio, target_language="en",
+                    window_seconds=STREAM_WINDOW_SECONDS,
+                    progress_callback=None, stop_check=None, resume=(), language=None,
+                    options=None):
+    """Transcribe audio window by window, yielding segments as they decode.
+
+    The audio is cut at silences into ~``window_seconds`` windows. Each
+    window is prompted with the tail of the previous one's text to keep
+    context across the cut, unless the decoding ``options`` turn off
+    condition_on_previous_text. ``resume`` holds the (segments, language)
+    batches of the first windows from an interrupted run; they are
+    yielded again without decoding. A known ``language`` spares Whisper
+    from detecting it in every window.
+
+    Yields:
+        (segments, language) per window, with global timestamps.
+    """
+    task, status = _task_for(target_language)
+    options = options or decode_options()
+    carry_prompt = options.get("condition_on_previous_text", True)
+    windows = split_on_silence(audio, window_seconds)
+    padded = pad_windows(windows, CHUNK_OVERLAP_SECONDS, len(audio))
+    total = len(windows)
+
+    if progress_callback:
+        progress_callback(25, status)
+    print(status)
+    if resume:
+        print(f"Resuming after {len(resume)} of {total} window(s).")
+
+    stitcher = SegmentStitcher()
+    prompt = None
+    for segments, language in _replay(resume, stitcher, total, progress_callback):
+        prompt = "".join(s["text"] for s in segments)[-200:] or prompt
+        yield segments, language
+    for i, (start, end) in enumerate(padded):
+        if i < len(resume):
+            continue
+        if stop_check and stop_check():
+            raise InterruptedError("Process stopped by user.")
+        result = model.transcribe(
+            audio[start:end],
+            task=task,
+            language=language,
+            verbose=False,
+            initial_prompt=prompt if carry_prompt else None,
+            **options
+        )
+        segments = stitcher.add(windows[i], (start, end), result["segments"])
+        for segment in segments:
+            print(f"[{segment['start']:.2f} --> {segment['end']:.2f}] {segment['text'].strip()}")
+        prompt = "".join(s["text"] for s in segments)[-200:] or prompt
+        if progress_callback:
+            progress_callback(25 + (i + 1) / total * 35)
+        yield segments, result["language"]
+
+
+# ── Chunked, multi-process transcription ────────────────────────────
+
+_worker_model = None
+_worker_error = None
+
+
+def _init_worker(model_size, threads, quantize=False, backend=None):
+    global _worker_model, _worker_error
+    # A multiprocessing.Pool restarts workers whose initializer raises, over
+    # and over; keep the error and fail the first window with it instead.
+    try:
+        _worker_model = model_cache.get(model_size, "cpu", quantize, threads, backend)
+        _worker_model.set_threads(threads)
+    except Exception as e:
+        _worker_error = e
+
+
+def _transcribe_window(audio, task, language, options):
+    if _worker_error is not None:
+        raise _worker_error
+    result = _worker_model.transcribe(
+        audio, task=task, language=language, verbose=False, **options
+    )
+    return result["segments"], result["language"]
+
+
+def iter_transcribe_chunked(model_size, audio, target_language="en", workers=2,
+                            chunk_seconds=300, progress_callback=None, stop_check=None,
+                            resume=(), language=None, options=None, threads=None,
+                            quantize=False, backend=None):
+    """Transcribe long audio by splitting it into windows across processes.
+
+    Windows are cut at silence, padded with CHUNK_OVERLAP_SECONDS of context
+    and decoded in a process pool where each worker holds its own CPU copy
+    of the model. Windows covered by ``resume`` (see ``iter_transcribe``)
+    are not decoded again; ``language`` and the decoding ``options`` are
+    passed on to every window. ``threads`` per worker defaults to an even
+    share of the CPU cores; ``quantize`` and ``backend`` are passed on to
+    ``load_model`` in each worker.
+
+    Yields:
+        (segments, language) per window, in order, with global timestamps.
+        Windows that finish early are held back until their predecessors
+        are done.
+    """
+    task, status = _task_for(target_language)
+    windows = split_on_silence(audio, chunk_seconds)
+    padded = pad_windows(windows, CHUNK_OVERLAP_SECONDS, len(audio))
+    total = len(windows)
+
+    if progress_callback:
+        progress_callback(25, status)
+    print(f"{status} ({total} chunks on {workers} workers)")
+
+    stitcher = SegmentStitcher()
+    if resume:
+        print(f"Resuming after {len(resume)} of {total} chunk(s).")
+        yield from _replay(resume, stitcher, total, progress_callback)
+    next_index = len(resume)
+    if next_index >= total:
+        return
+
+    threads = threads or max(1, (os.cpu_count() or 1) // workers)
+    options = options or decode_options()
+    pool = multiprocessing.get_context("spawn").Pool(
+        processes=workers,
+        initializer=_init_worker,
+        initargs=(model_size, threads, quantize, backend),
+    )
+    pending = {
+        i: pool.apply_async(_transcribe_window, (audio[start:end], task, language, options))
+        for i, (start, end) in enumerate(padded)
+        if i >= next_index
+    }
+    finished = {}
+    completed = False
+    try:
+        while pending:
+            if stop_check and stop_check():
+                raise InterruptedError("Process stopped by user.")
+            # Wait on the next window in order; later ones are picked up
+            # as they finish.
+            pending[min(pending)].wait(0.5)
+            for i in sorted(i for i, result in pending.items() if result.ready()):
+                finished[i] = pending.pop(i).get()
+                start = windows[i][0] / SAMPLE_RATE
+                print(f"Chunk {i + 1}/{total} done at {start:.0f}s ({len(finished[i][0])} segments)")
+            while next_index in finished:
+                # Windows that finished together are handed out one at a
+                # time, so a stop is honoured between them too.
+                if stop_check and stop_check():
+                    raise InterruptedError("Process stopped by user.")
+                segments, language = finished.pop(next_index)
+                yield stitcher.add(windows[next_index], padded[next_index], segments), language
+                next_index += 1
+                if progress_callback:
+                    progress_callback(25 + next_index / total * 35)
+        completed = True
+    finally:
+        if completed:
+            pool.close()
+        else:
+            # Stopped or failed: workers may be deep inside a decode, so
+            # kill them rather than wait.
+            pool.terminate()
+        pool.join()
+
+    if stop_check and stop_check():
+        raise InterruptedError("Process stopped by user.")
+
+
+def collect_segments(batches, progress_callback=None):
+    """Drain a ``iter_transcribe*`` generator into a ``transcribe``-style result."""
+    segments = []
+    languages = Counter()
+    for batch, language in batches:
+        segments += batch
+        languages[language] += 1
+    if progress_callback:
+        progress_callback(60)
+    return {
+        "text": "".join(s["text"] for s in segments),
+        "segments": segments,
+        "language": languages.most_common(1)[0][0] if languages else None,
+    }
@@ -0,0 +1,119 @@
+import gzip
+import hashlib
+import json
+import os
+
+from config import CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB
+
+FINGERPRINT_SAMPLES = 16
+FINGERPRINT_SAMPLE_BYTES = 64 * 1024
+
+
+def file_fingerprint(path):
+    """Fast identity hash of a (possibly huge) file.
+
+    Combines size, modification time and a hash of a few evenly spaced
+    blocks, so it only reads ~1 MB regardless of file size.
+    """
+    stat = os.stat(path)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    with open(path, "rb") as f:
+        step = max(1, stat.st_size // FINGERPRINT_SAMPLES)
+        for offset in range(0, stat.st_size, step)[:FINGERPRINT_SAMPLES]:
+            f.seek(offset)
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        f.seek(max(0, stat.st_size - FINGERPRINT_SAMPLE_BYTES))
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+    return digest.hexdigest()
+
+
+def pack_transcript(result):
+    """Compact, JSON-ready form of a transcription result."""
+    segments = []
+    for s in result["segments"]:
+        row = [round(s["start"], 3), round(s["end"], 3), s["text"]]
+        if "words" in s:
+            row.append([[round(w["start"], 3), round(w["end"], 3), w["word"]] for w in s["words"]])
+        segments.append(row)
+    return {"language": result["language"], "segments": segments}
+
+
+def unpack_transcript(data):
+    """Inverse of ``pack_transcript``."""
+    segments = []
+    for i, row in enumerate(data["segments"]):
+        segment = {"id": i, "start": row[0], "end": row[1], "text": row[2]}
+        if len(row) > 3:
+            segment["words"] = [{"start": s, "end": e, "word": w} for s, e, w in row[3]]
+        segments.append(segment)
+    return {
+        "text": "".join(s["text"] for s in segments),
+        "segments": segments,
+        "language": data["language"],
+    }
+
+
+class TranscriptCache:
+    """On-disk cache of transcription results.
+
+    Each entry is a gzip-compressed JSON file holding only what the rest of
+    the pipeline needs (timestamps, text, language). Entries are keyed by
+    the input fingerprint plus everything that affects the transcript.
+    Least recently used files are evicted once the directory exceeds
+    ``max_mb``.
+    """
+
+    def __init__(self, directory=None, max_mb=TRANSCRIPT_CACHE_MAX_MB):
+        self.directory = directory or os.path.join(CACHE_DIR, "transcripts")
+        self.max_bytes = max_mb * 1024 * 1024
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(fingerprint, model_size, task, options=None):
+        blob = json.dumps(
+            [fingerprint, model_size, task, options or {}], sort_keys=True
+        )
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json.gz")
+
+    def get(self, key):
+        """Return the cached result for ``key`` or None."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        return unpack_transcript(data)
+
+    def put(self, key, result):
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            json.dump(pack_transcript(result), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        self._evict()
+
+    def _evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json.gz"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:  # evicted by a concurrent job
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -1,24 +1,274 @@
-from deep_translator import GoogleTranslator
+import random
+from abc import ABC, abstractmethod
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
+from config import (
+    TRANSLATION_BACKEND,
+    TRANSLATION_BATCH_CHARS,
+    TRANSLATION_CONCURRENCY,
+    TRANSLATION_MAX_RETRIES,
+    TRANSLATION_RETRY_BASE_SECONDS,
+)
+from .translation_cache import TranslationCache
 
-def translate_segments(segments, target_lang, progress_callback=None, stop_check=None):
-    """Translate segment texts from English to the target language.
+# Lines of a batch are joined with newlines; translators keep line breaks,
+# so the result can be split back into one translation per line.
+BATCH_DELIMITER = "\n"
 
-    Modifies segment dicts in-place, updating the 'text' field.
-    Uses Google Translate via deep-translator (no API key needed).
+# Whisper language codes that the translation services spell differently.
+WHISPER_LANGUAGE_CODES = {"zh": "zh-CN", "he": "iw"}
+
+
+def translation_code(whisper_language):
+    """Translation language code for a language detected by Whisper."""
+    return WHISPER_LANGUAGE_CODES.get(whisper_language, whisper_language)
+
+
+class TranslationBackend(ABC):
+    """Base class for machine translation services.
+
+    Subclasses must implement ``translate_text`` for a single request (an
+    incomplete one fails when it is created). Batching many lines into one
+    request is handled here.
+    """
+
+    name = "base"
+    max_chars = TRANSLATION_BATCH_CHARS
+    requests_per_second = None  # None means unlimited
+
+    @abstractmethod
+    def translate_text(self, text, source, target):
+        """Translate ``text`` (lines joined by BATCH_DELIMITER) in one request."""
+
+    def translate_batch(self, texts, source, target):
+        """Translate a list of single-line texts with as few requests as possible.
+
+        If a packed response does not split back into the expected number of
+        lines the batch is halved and retried, down to single lines.
+        """
+        if len(texts) == 1:
+            return [self.translate_text(texts[0], source, target).strip()]
+        packed = self.translate_text(BATCH_DELIMITER.join(texts), source, target)
+        lines = [line.strip() for line in (packed or "").split(BATCH_DELIMITER)]
+        if len(lines) == len(texts):
+            return lines
+        mid = len(texts) // 2
+        return (
+            self.translate_batch(texts[:mid], source, target)
+            + self.translate_batch(texts[mid:], source, target)
+        )
+
+
+class GoogleBackend(TranslationBackend):
+    """Google Translate via deep-translator (no API key needed)."""
+
+    name = "google"
+    requests_per_second = 5
+
+    def __init__(self):
+        self._translators = {}
+
+    def translate_text(self, text, source, target):
+        from deep_translator import GoogleTranslator
+
+        key = (source, target)
+        if key not in self._translators:
+            self._translators[key] = GoogleTranslator(source=source, target=target)
+        return self._translators[key].translate(text)
+
+
+class FakeBackend(TranslationBackend):
+    """Offline translator for tests: prefixes each line with the target code."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.requests = 0
+
+    def translate_text(self, text, source, target):
+        self.requests += 1
+        return BATCH_DELIMITER.join(
+            f"[{target}] {line}" for line in text.split(BATCH_DELIMITER)
+        )
+
+
+class RateLimiter:
+    """Token bucket shared by every request sent to one backend."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, cancel=None):
+        """Block until a request may be sent. Returns False if cancelled."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                delay = (1.0 - self._tokens) / self.rate
+            if cancel is not None and cancel.wait(delay):
+                return False
+            if cancel is None:
+                time.sleep(delay)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _rate_limiter(backend):
+    if not backend.requests_per_second:
+        return None
+    with _rate_limiters_lock:
+        if backend.name not in _rate_limiters:
+            _rate_limiters[backend.name] = RateLimiter(backend.requests_per_second)
+        return _rate_limiters[backend.name]
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "fake": FakeBackend,
+}
+
+
+def get_backend(backend=None):
+    """Resolve a backend name (or pass through an instance)."""
+    if isinstance(backend, TranslationBackend):
+        return backend
+    name = backend or TRANSLATION_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown translation backend: {name!r}")
+    return BACKENDS[name]()
+
+
+def _batches(texts, max_chars):
+    batch, size = [], 0
+    for text in texts:
+        if batch and size + len(text) + 1 > max_chars:
+            yield batch
+            batch, size = [], 0
+        batch.append(text)
+        size += len(text) + 1
+    if batch:
+        yield batch
+
+
+def _translate_with_retry(backend, batch, source, target, cancel):
+    """Translate one batch, retrying transient failures with exponential backoff."""
+    limiter = _rate_limiter(backend)
+    for attempt in range(TRANSLATION_MAX_RETRIES + 1):
+        if limiter and not limiter.acquire(cancel):
+            return None
+        if cancel.is_set():
+            return None
+        try:
+            return backend.translate_batch(batch, source, target)
+        except Exception as e:
+            if attempt == TRANSLATION_MAX_RETRIES:
+                raise
+            delay = TRANSLATION_RETRY_BASE_SECONDS * 2 ** attempt
+            delay *= random.uniform(0.5, 1.5)
+            print(f"Translation request failed ({e}); retrying in {delay:.1f}s...")
+            if cancel.wait(delay):
+                return None
+
+
+def translate_segments(segments, target_lang, progress_callback=None, stop_check=None,
+                       source_lang="en", backend=None, cache=None, verbose=True):
+    """Translate segment texts from ``source_lang`` to the target language.
+
+    Modifies segment dicts in-place, updating the 'text' field. Repeated
+    lines are translated once, lines already in the on-disk cache are not
+    sent at all, and the rest are packed into as few requests as possible.
+    Up to TRANSLATION_CONCURRENCY requests run at once, each rate limited
+    per backend and retried with exponential backoff. Finished batches are
+    written to the cache immediately, so a failed job resumes where it
+    stopped.
+
+    Args:
+        backend: TranslationBackend instance or name from BACKENDS
+                 (defaults to TRANSLATION_BACKEND).
+        cache: TranslationCache to use; False disables caching.
+        verbose: Log per-call summaries (off when called per streamed window).
     """
     if progress_callback:
         progress_callback(60, f"Translating to {target_lang}...")
-    print(f"Translating segments to '{target_lang}'...")
+    if verbose:
+        print(f"Translating segments to '{target_lang}'...")
+
+    backend = get_backend(backend)
+    owns_cache = cache is None
+    if owns_cache:
+        cache = TranslationCache()
+
+    texts = [" ".join(segment["text"].split()) for segment in segments]
+    unique = list(dict.fromkeys(t for t in texts if t))
+    translations = (
+        cache.get_many(unique, source_lang, target_lang, backend.name) if cache else {}
+    )
+    missing = [t for t in unique if t not in translations]
+    if verbose:
+        print(
+            f"{len(unique)} unique line(s): {len(translations)} cached, "
+            f"{len(missing)} to translate."
+        )
 
-    translator = GoogleTranslator(source="en", target=target_lang)
-    total = len(segments)
+    done = len(translations)
+    total = len(unique)
+    cancel = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=TRANSLATION_CONCURRENCY)
+    futures = {
+        executor.submit(
+            _translate_with_retry, backend, batch, source_lang, target_lang, cancel
+        ): batch
+        for batch in _batches(missing, backend.max_chars)
+    }
+    pending = set(futures)
+    try:
+        while pending:
+            if stop_check and stop_check():
+                raise InterruptedError("Process stopped by user.")
+            finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in finished:
+                batch = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Translation to '{target_lang}' failed after "
+                        f"{TRANSLATION_MAX_RETRIES} retries: {e}. "
+                        f"{done}/{total} lines were saved and will not be "
+                        "translated again on the next run."
+                    ) from e
+                translations.update(zip(batch, result))
+                # Checkpoint every finished batch so a later failure or a
+                # re-run doesn't repeat it.
+                if cache:
+                    cache.put_many(zip(batch, result), source_lang, target_lang, backend.name)
+                done += len(batch)
+                if progress_callback:
+                    progress_callback(
+                        60 + done / total * 10,
+                        f"Translating to {target_lang}... {done}/{total} lines",
+                    )
+    finally:
+        # Don't block on requests that are still in flight; their results
+        # are discarded and queued batches never start.
+        cancel.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if owns_cache:
+            cache.close()
 
-    for i, segment in enumerate(segments):
-        if stop_check and stop_check():
-            raise InterruptedError("Process stopped by user.")
-        segment["text"] = translator.translate(segment["text"].strip())
-        if progress_callback:
-            progress_callback(60 + (i + 1) / total * 10)
+    for segment, text in zip(segments, texts):
+        segment["text"] = translations.get(text, text)
 
-    print("Translation complete.")
+    if verbose:
+        print("Translation complete.")
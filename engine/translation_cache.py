@@ -0,0 +1,102 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+from config import CACHE_DIR, TRANSLATION_CACHE_MAX_MB
+
+
+def cache_key(text, source, target, backend):
+    return hashlib.sha256(f"{backend}\0{source}\0{target}\0{text}".encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """Content-addressed on-disk cache of translated lines (SQLite).
+
+    Entries are keyed by a hash of (source text, source language, target
+    language, backend name), so one service's output (or a test double's)
+    is never served as another's. When the stored text exceeds ``max_mb`` the least recently
+    used entries are evicted.
+    """
+
+    def __init__(self, path=None, max_mb=TRANSLATION_CACHE_MAX_MB):
+        self.path = path or os.path.join(CACHE_DIR, "translations.sqlite3")
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.max_bytes = max_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            " key TEXT PRIMARY KEY,"
+            " translation TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS translations_last_used"
+            " ON translations (last_used)"
+        )
+        self._db.commit()
+
+    def get_many(self, texts, source, target, backend):
+        """Return {text: translation} for every text ``backend`` translated before."""
+        keys = {cache_key(text, source, target, backend): text for text in texts}
+        found = {}
+        with self._lock:
+            items = list(keys)
+            # Stay well below SQLite's bound-parameter limit.
+            for i in range(0, len(items), 500):
+                batch = items[i:i + 500]
+                marks = ",".join("?" * len(batch))
+                rows = self._db.execute(
+                    f"SELECT key, translation FROM translations WHERE key IN ({marks})",
+                    batch,
+                ).fetchall()
+                for key, translation in rows:
+                    found[keys[key]] = translation
+                self._db.executemany(
+                    "UPDATE translations SET last_used = ? WHERE key = ?",
+                    [(time.time(), key) for key, _ in rows],
+                )
+            self._db.commit()
+        return found
+
+    def put_many(self, pairs, source, target, backend):
+        """Store (text, translation) pairs and evict if over budget."""
+        now = time.time()
+        rows = [
+            (cache_key(text, source, target, backend), translation,
+             len(text.encode("utf-8")) + len(translation.encode("utf-8")), now)
+            for text, translation in pairs
+        ]
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO translations (key, translation, size, last_used)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM translations").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% of the budget so we don't evict on every insert.
+        excess = total - int(self.max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in self._db.execute(
+            "SELECT key, size FROM translations ORDER BY last_used"
+        ):
+            doomed.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._db.executemany("DELETE FROM translations WHERE key = ?", doomed)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
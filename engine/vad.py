@@ -0,0 +1,196 @@
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from config import (
+    VAD_ENERGY_MARGIN_DB,
+    VAD_MIN_SPEECH_SECONDS,
+    VAD_MIN_SILENCE_SECONDS,
+    VAD_PAD_SECONDS,
+)
+from .audio import BYTES_PER_SAMPLE, SAMPLE_RATE
+from .chunking import FRAME_SECONDS, frame_energy
+
+ABSOLUTE_FLOOR_DB = -60.0
+DYNAMIC_RANGE_DB = 30.0
+SPEECH_BAND_HZ = (300, 3400)
+MIN_SPEECH_BAND_RATIO = 0.3
+MAX_SPECTRAL_FLATNESS = 0.5
+# Regions longer than this with almost constant loudness are treated as
+# music or steady noise: speech has strong syllable-rate modulation.
+MODULATION_CHECK_SECONDS = 3.0
+MIN_ENERGY_MODULATION = 0.3
+FFT_BLOCK_FRAMES = 8192
+
+
+def _frame_features(audio, frame, sample_rate=SAMPLE_RATE):
+    """Per-frame energy (dB), speech-band energy ratio and spectral flatness."""
+    rms = frame_energy(audio, FRAME_SECONDS, sample_rate)
+    energy_db = 10 * np.log10(rms * rms + 1e-10)
+    n_frames = len(rms)
+    band_ratio = np.empty(n_frames, dtype=np.float32)
+    flatness = np.empty(n_frames, dtype=np.float32)
+
+    freqs = np.fft.rfftfreq(frame, 1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    window = np.hanning(frame).astype(np.float32)
+
+    # Work in blocks so the spectrum of a multi-hour input never sits in RAM.
+    for lo in range(0, n_frames, FFT_BLOCK_FRAMES):
+        hi = min(n_frames, lo + FFT_BLOCK_FRAMES)
+        frames = np.asarray(audio[lo * frame:hi * frame], dtype=np.float32).reshape(-1, frame)
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2 + 1e-12
+        total = spectrum.sum(axis=1)
+        band_ratio[lo:hi] = spectrum[:, band].sum(axis=1) / total
+        flatness[lo:hi] = np.exp(np.mean(np.log(spectrum), axis=1)) / (total / spectrum.shape[1])
+
+    return energy_db, band_ratio, flatness
+
+
+def _runs(mask):
+    """Return (start, end) frame index pairs of consecutive True values."""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[::2], edges[1::2]))
+
+
+def detect_speech(audio, sample_rate=SAMPLE_RATE):
+    """Find the regions of ``audio`` that likely contain speech.
+
+    Frames count as speech when they are loud relative to the recording's
+    noise floor, keep most of their energy in the speech band and are not
+    noise-like (flat spectrum). Long regions with nearly constant loudness
+    are dropped as music. Runs are smoothed, padded and merged.
+
+    Returns:
+        List of (start_seconds, end_seconds) intervals in ascending order.
+    """
+    frame = int(FRAME_SECONDS * sample_rate)
+    if len(audio) < frame:
+        return []
+
+    energy_db, band_ratio, flatness = _frame_features(audio, frame, sample_rate)
+    floor = np.percentile(energy_db, 10)
+    peak = np.percentile(energy_db, 95)
+    threshold = max(ABSOLUTE_FLOOR_DB, min(floor + VAD_ENERGY_MARGIN_DB, peak - DYNAMIC_RANGE_DB))
+
+    voiced = (
+        (energy_db > threshold)
+        & (band_ratio > MIN_SPEECH_BAND_RATIO)
+        & (flatness < MAX_SPECTRAL_FLATNESS)
+    )
+
+    # Bridge short pauses between words, then drop blips.
+    min_silence = int(VAD_MIN_SILENCE_SECONDS / FRAME_SECONDS)
+    for start, end in _runs(~voiced):
+        if start > 0 and end < len(voiced) and end - start < min_silence:
+            voiced[start:end] = True
+
+    min_speech = int(VAD_MIN_SPEECH_SECONDS / FRAME_SECONDS)
+    long_region = int(MODULATION_CHECK_SECONDS / FRAME_SECONDS)
+    linear = 10 ** (energy_db / 10)
+    pad = VAD_PAD_SECONDS
+    duration = len(audio) / sample_rate
+
+    intervals = []
+    for start, end in _runs(voiced):
+        if end - start < min_speech:
+            continue
+        if end - start >= long_region:
+            region = linear[start:end]
+            if region.std() / (region.mean() + 1e-12) < MIN_ENERGY_MODULATION:
+                continue
+        begin = max(0.0, start * FRAME_SECONDS - pad)
+        finish = min(duration, end * FRAME_SECONDS + pad)
+        if intervals and begin <= intervals[-1][1]:
+            intervals[-1] = (intervals[-1][0], finish)
+        else:
+            intervals.append((begin, finish))
+    return intervals
+
+
+class SpeechTimeline:
+    """Maps times in the compacted speech-only audio back to the original."""
+
+    def __init__(self, intervals):
+        self.original_starts = [start for start, _ in intervals]
+        self.lengths = [end - start for start, end in intervals]
+        self.compact_starts = []
+        offset = 0.0
+        for length in self.lengths:
+            self.compact_starts.append(offset)
+            offset += length
+
+    def to_original(self, t, is_end=False):
+        # An end time exactly on a junction belongs to the earlier interval.
+        find = bisect_left if is_end else bisect_right
+        i = max(0, find(self.compact_starts, t) - 1)
+        return self.original_starts[i] + min(t - self.compact_starts[i], self.lengths[i])
+
+    def remap_segments(self, segments):
+        """Shift segment (and word) timestamps back onto the original audio in-place."""
+        for segment in segments:
+            for item in [segment] + segment.get("words", []):
+                item["start"] = self.to_original(item["start"])
+                item["end"] = self.to_original(item["end"], is_end=True)
+        return segments
+
+
+def compact_speech(audio, intervals, sample_rate=SAMPLE_RATE, path=None, reserve=None):
+    """Concatenate the speech intervals of ``audio`` into one array.
+
+    When ``audio`` is a memory map and ``path`` is given, the result is
+    written to a memory-mapped file there instead of being held in RAM;
+    ``reserve`` (if given) is called with its size in bytes first.
+
+    Returns:
+        (compact_audio, SpeechTimeline)
+    """
+    bounds = [
+        (int(start * sample_rate), int(end * sample_rate)) for start, end in intervals
+    ]
+    samples = sum(end - start for start, end in bounds)
+    if path is not None and isinstance(audio, np.memmap) and samples:
+        if reserve:
+            reserve(samples * BYTES_PER_SAMPLE)
+        compact = np.memmap(path, dtype=np.float32, mode="w+", shape=(samples,))
+    else:
+        compact = np.empty(samples, dtype=np.float32)
+    offset = 0
+    for start, end in bounds:
+        compact[offset:offset + end - start] = audio[start:end]
+        offset += end - start
+    timeline = SpeechTimeline([
+        (start / sample_rate, end / sample_rate) for start, end in bounds
+    ])
+    return compact, timeline
+
+
+def skip_silence(audio, progress_callback=None, stop_check=None, path=None, reserve=None):
+    """Run the VAD pre-pass and log how much audio it removed.
+
+    ``path`` and ``reserve`` are passed on to ``compact_speech``, so audio
+    that was spilled to disk stays there once compacted.
+
+    Returns:
+        (speech_audio, SpeechTimeline) — the timeline is None when nothing
+        was skipped and the original audio is returned unchanged.
+    """
+    if progress_callback:
+        progress_callback(10, "Detecting speech...")
+    print("Detecting speech regions...")
+
+    intervals = detect_speech(audio)
+    total = len(audio) / SAMPLE_RATE
+    speech = sum(end - start for start, end in intervals)
+    skipped = 1 - speech / total if total else 0.0
+    print(
+        f"VAD: {speech:.1f}s of speech in {total:.1f}s of audio "
+        f"across {len(intervals)} region(s), {skipped:.0%} skipped."
+    )
+
+    if stop_check and stop_check():
+        raise InterruptedError("Process stopped by user.")
+    if skipped <= 0:
+        return audio, None
+    return compact_speech(audio, intervals, path=path, reserve=reserve)
@@ -0,0 +1,49 @@
+import importlib
+import threading
+import time
+
+from .asr import ASR_BACKENDS, get_asr_backend
+from .transcribe import model_cache
+
+TRANSLATION_MODULES = ("deep_translator",)
+
+# Imported lazily by the engine; each takes from a fraction of a second
+# (deep_translator) to several seconds (torch) on a cold start.
+HEAVY_MODULES = tuple(dict.fromkeys(
+    [name for backend in ASR_BACKENDS.values() for name in backend.modules]
+    + list(TRANSLATION_MODULES)
+))
+
+
+def warm_up(model_size=None, modules=None, quantize=False, backend=None):
+    """Import the heavy dependencies in a background thread.
+
+    Meant to run once the window is up, so the first Generate does not
+    pay for the imports. ``modules`` defaults to those of the ASR
+    ``backend`` and the translator. If ``model_size`` is given that model
+    is loaded into the model cache as well (int8 with ``quantize``).
+    Missing optional modules are skipped.
+
+    Returns:
+        The started (daemon) thread.
+    """
+    if modules is None:
+        modules = get_asr_backend(backend).modules + TRANSLATION_MODULES
+
+    def run():
+        start = time.perf_counter()
+        for name in modules:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass
+        print(f"Speech and translation libraries loaded in {time.perf_counter() - start:.1f}s.")
+        if model_size:
+            try:
+                model_cache.get(model_size, quantize=quantize, backend=backend)
+            except Exception as e:
+                print(f"Preloading Whisper model '{model_size}' failed: {e}")
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
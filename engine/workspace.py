@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+
+from config import SCRATCH_DIR, SCRATCH_QUOTA_MB
+
+
+class Workspace:
+    """Private scratch folder for the intermediate files of one job.
+
+    Every job gets a fresh, uniquely named folder under ``root`` (the
+    system temp folder by default), so concurrent jobs never share paths.
+    Files are handed out with ``path()`` and everything is removed by
+    ``cleanup()``, which also runs when used as a context manager.
+    ``reserve()`` checks a size against the quota and the free disk space
+    before a large file is written.
+    """
+
+    def __init__(self, root=SCRATCH_DIR, quota_mb=SCRATCH_QUOTA_MB, prefix="subtitle-job-"):
+        if root:
+            os.makedirs(root, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix=prefix, dir=root)
+        self.quota_bytes = quota_mb * 1024 * 1024 if quota_mb else None
+        self.artifacts = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cleanup()
+
+    def path(self, name):
+        """Return a tracked path for ``name`` inside the workspace."""
+        path = os.path.join(self.directory, name)
+        self.artifacts.append(path)
+        return path
+
+    def usage(self):
+        """Bytes currently used by files in the workspace."""
+        total = 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                try:
+                    total += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return total
+
+    def reserve(self, nbytes, directory=None):
+        """Raise RuntimeError if ``nbytes`` more would not fit.
+
+        ``directory`` is where the bytes will be written, if not in the
+        workspace (e.g. a job checkpoint); they still count against the
+        quota.
+        """
+        directory = directory or self.directory
+        if self.quota_bytes is not None and self.usage() + nbytes > self.quota_bytes:
+            raise RuntimeError(
+                f"Scratch space quota exceeded: {nbytes / 2**20:.0f} MB needed, "
+                f"{self.quota_bytes / 2**20:.0f} MB allowed (SCRATCH_QUOTA_MB)."
+            )
+        free = shutil.disk_usage(directory).free
+        if nbytes > free:
+            raise RuntimeError(
+                f"Not enough free space in {directory}: "
+                f"{nbytes / 2**20:.0f} MB needed, {free / 2**20:.0f} MB free."
+            )
+
+    def cleanup(self):
+        """Delete every artifact and the workspace folder itself."""
+        for path in self.artifacts:
+            try:
+                if os.path.isdir(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+            except OSError:
+                pass
+        self.artifacts.clear()
+        shutil.rmtree(self.directory, ignore_errors=True)
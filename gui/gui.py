@@ -3,11 +3,27 @@ from tkinter import filedialog, messagebox
 from tkinter.colorchooser import askcolor
 from tkinter.font import families as tk_font_families
 import os
+import subprocess
 import sys
 import threading
 
-from config import MODEL_OPTIONS, SUPPORTED_VIDEO_FORMATS, WINDOW_TITLE, WINDOW_SIZE, LANGUAGE_OPTIONS
-from engine import SubtitleEngine
+from config import (
+    MODEL_OPTIONS,
+    SUPPORTED_VIDEO_FORMATS,
+    WINDOW_TITLE,
+    WINDOW_SIZE,
+    LANGUAGE_OPTIONS,
+    OUTPUT_MODES,
+    ENCODER_PRESETS,
+    DEFAULT_ENCODER_PRESET,
+    DECODING_PROFILES,
+    DEFAULT_DECODING_PROFILE,
+    LOG_MAX_LINES,
+    WARMUP_ON_START,
+    WARMUP_DELAY_MS,
+)
+from engine import SubtitleEngine, hex_to_ass, preload_model, warm_up
+from .ui_channel import UiChannel, open_session_log
 
 
 class SubtitleApp:
@@ -21,6 +37,8 @@ class SubtitleApp:
         self.video_path = None
         self.output_dir = None
         self._stop_event = threading.Event()
+        self._stage_times = {}
+        self._spoken_language = None
 
         self._build_header()
         self._build_file_selection()
@@ -31,8 +49,14 @@ class SubtitleApp:
         self._build_progress_section()
         self._build_log_section()
 
+        self.log_file = open_session_log()
+        self.ui = UiChannel(self.root, self._append_log, self._set_progress, self.log_file)
         sys.stdout = self
 
+        # Import the ML libraries and load the default model once the window is up.
+        if WARMUP_ON_START:
+            self.root.after(WARMUP_DELAY_MS, self._warm_up)
+
     # ── UI Builder Methods ──────────────────────────────────────────
 
     def _build_header(self):
@@ -136,6 +160,7 @@ class SubtitleApp:
             settings_grid,
             variable=self.model_var,
             values=list(MODEL_OPTIONS.keys()),
+            command=self._on_model_selected,
             width=300,
             height=32,
         )
@@ -158,6 +183,42 @@ class SubtitleApp:
         )
         self.lang_combo.grid(row=1, column=1, sticky="ew")
 
+        # Additional languages (one transcription, one SRT per language)
+        ctk.CTkLabel(
+            settings_grid,
+            text="Also translate to:",
+            font=ctk.CTkFont(size=13),
+        ).grid(row=2, column=0, sticky="w", padx=(0, 12), pady=(8, 0))
+
+        self.extra_languages = []
+        self.extra_lang_btn = ctk.CTkButton(
+            settings_grid,
+            text="None",
+            command=self._pick_extra_languages,
+            height=32,
+            fg_color="#4a4a4a",
+            hover_color="#5a5a5a",
+        )
+        self.extra_lang_btn.grid(row=2, column=1, sticky="ew", pady=(8, 0))
+
+        # Decoding profile (speed vs. accuracy of Whisper)
+        ctk.CTkLabel(
+            settings_grid,
+            text="Decoding:",
+            font=ctk.CTkFont(size=13),
+        ).grid(row=3, column=0, sticky="w", padx=(0, 12), pady=(8, 0))
+
+        self.profile_var = ctk.StringVar(value=DEFAULT_DECODING_PROFILE)
+        self.profile_combo = ctk.CTkOptionMenu(
+            settings_grid,
+            variable=self.profile_var,
+            values=list(DECODING_PROFILES.keys()),
+            command=self._on_profile_selected,
+            width=300,
+            height=32,
+        )
+        self.profile_combo.grid(row=3, column=1, sticky="ew", pady=(8, 0))
+
     def _build_output_options(self):
         card = ctk.CTkFrame(self.root, corner_radius=10)
         card.pack(fill="x", padx=20, pady=5)
@@ -185,13 +246,35 @@ class SubtitleApp:
 
         self.burn_check = ctk.CTkCheckBox(
             options_inner,
-            text="Burn subtitles into video",
+            text="Add subtitles to video",
             variable=self.burn_var,
             command=self._validate_options,
             font=ctk.CTkFont(size=13),
         )
         self.burn_check.pack(anchor="w")
 
+        mode_row = ctk.CTkFrame(options_inner, fg_color="transparent")
+        mode_row.pack(fill="x", pady=(8, 0))
+
+        self.output_mode_var = ctk.StringVar(value=next(iter(OUTPUT_MODES)))
+        self.output_mode_seg = ctk.CTkSegmentedButton(
+            mode_row,
+            values=list(OUTPUT_MODES.keys()),
+            variable=self.output_mode_var,
+            command=self._on_output_mode_changed,
+        )
+        self.output_mode_seg.pack(side="left")
+
+        self.preset_var = ctk.StringVar(value=DEFAULT_ENCODER_PRESET)
+        self.preset_combo = ctk.CTkOptionMenu(
+            mode_row,
+            variable=self.preset_var,
+            values=list(ENCODER_PRESETS.keys()),
+            width=110,
+            height=28,
+        )
+        self.preset_combo.pack(side="right")
+
     def _build_subtitle_style(self):
         card = ctk.CTkFrame(self.root, corner_radius=10)
         card.pack(fill="x", padx=20, pady=5)
@@ -306,6 +389,17 @@ class SubtitleApp:
         )
         self.stop_btn.pack(side="right")
 
+        self.stage_label = ctk.CTkLabel(
+            self.root,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color="#666666",
+            anchor="w",
+            justify="left",
+            wraplength=580,
+        )
+        self.stage_label.pack(fill="x", padx=20, pady=(2, 0))
+
     def _build_log_section(self):
         log_header = ctk.CTkFrame(self.root, fg_color="transparent")
         log_header.pack(fill="x", padx=20, pady=(10, 4))
@@ -314,7 +408,17 @@ class SubtitleApp:
             log_header,
             text="Logs",
             font=ctk.CTkFont(size=13, weight="bold"),
-        ).pack(anchor="w")
+        ).pack(side="left")
+
+        ctk.CTkButton(
+            log_header,
+            text="Full log",
+            command=self._open_full_log,
+            width=70,
+            height=22,
+            fg_color="transparent",
+            border_width=1,
+        ).pack(side="right")
 
         self.log_text = ctk.CTkTextbox(
             self.root,
@@ -331,7 +435,7 @@ class SubtitleApp:
 
     def write(self, text):
         self.original_stdout.write(text)
-        self.root.after(0, self._append_log, text)
+        self.ui.log(text)
 
     def flush(self):
         self.original_stdout.flush()
@@ -339,13 +443,24 @@ class SubtitleApp:
     def _append_log(self, text):
         self.log_text.configure(state="normal")
         self.log_text.insert("end", text)
+        # Keep only the last LOG_MAX_LINES lines; the log file has the rest.
+        excess = int(self.log_text.index("end-1c").split(".")[0]) - LOG_MAX_LINES
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
         self.log_text.see("end")
         self.log_text.configure(state="disabled")
 
+    def _open_full_log(self):
+        path = os.path.abspath(self.log_file.name)
+        if sys.platform == "win32":
+            os.startfile(path)
+        else:
+            subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", path])
+
     # ── Progress ─────────────────────────────────────────────────────
 
     def _on_progress(self, value, status_text=None):
-        self.root.after(0, self._set_progress, value, status_text)
+        self.ui.progress(value, status_text)
 
     def _set_progress(self, value, status_text):
         self.progress_bar.set(value / 100.0)
@@ -353,6 +468,26 @@ class SubtitleApp:
         if status_text:
             self.status_label.configure(text=status_text)
 
+    def _on_metrics_event(self, event):
+        self.ui.call(self._show_metrics_event, event)
+
+    def _show_metrics_event(self, event):
+        if event["event"] == "language":
+            self._spoken_language = f"{event['name']} ({event['probability']:.0%})"
+        elif event["event"] == "stage":
+            self._stage_times[event["stage"]] = (
+                self._stage_times.get(event["stage"], 0.0) + event["wall_seconds"]
+            )
+        parts = [f"{stage} {seconds:.1f}s" for stage, seconds in self._stage_times.items()]
+        if self._spoken_language:
+            parts.insert(0, f"speech: {self._spoken_language}")
+        audio = event.get("audio_seconds")
+        if event["event"] == "job" and audio:
+            parts.append(f"total {event['wall_seconds']:.1f}s ({event['rtf']:.2f}x audio length)")
+        if event.get("peak_rss_mb"):
+            parts.append(f"peak RAM {event['peak_rss_mb']:.0f} MB")
+        self.stage_label.configure(text="Stages: " + " · ".join(parts))
+
     # ── Event Handlers ───────────────────────────────────────────────
 
     def _validate_options(self):
@@ -361,6 +496,52 @@ class SubtitleApp:
         else:
             self.generate_btn.configure(state="disabled")
 
+    def _on_output_mode_changed(self, choice):
+        state = "normal" if OUTPUT_MODES[choice] == "burn" else "disabled"
+        self.preset_combo.configure(state=state)
+
+    def _pick_extra_languages(self):
+        dialog = ctk.CTkToplevel(self.root)
+        dialog.title("Additional Languages")
+        dialog.geometry("300x460")
+        dialog.transient(self.root)
+        dialog.grab_set()
+
+        frame = ctk.CTkScrollableFrame(dialog, height=360)
+        frame.pack(fill="both", expand=True, padx=12, pady=(12, 6))
+
+        choices = {}
+        for name in LANGUAGE_OPTIONS:
+            var = ctk.BooleanVar(value=name in self.extra_languages)
+            ctk.CTkCheckBox(
+                frame, text=name, variable=var, font=ctk.CTkFont(size=13)
+            ).pack(anchor="w", pady=2)
+            choices[name] = var
+
+        def done():
+            self.extra_languages = [n for n, v in choices.items() if v.get()]
+            self.extra_lang_btn.configure(
+                text=", ".join(self.extra_languages) if self.extra_languages else "None"
+            )
+            dialog.destroy()
+
+        ctk.CTkButton(dialog, text="Done", command=done, height=32).pack(
+            fill="x", padx=12, pady=(0, 12)
+        )
+
+    def _quantize(self):
+        return DECODING_PROFILES[self.profile_var.get()]["quantize"]
+
+    def _on_model_selected(self, choice):
+        preload_model(MODEL_OPTIONS[choice], self._quantize())
+
+    def _on_profile_selected(self, choice):
+        # The fast profile runs a quantized copy of the model.
+        preload_model(MODEL_OPTIONS[self.model_var.get()], self._quantize())
+
+    def _warm_up(self):
+        warm_up(MODEL_OPTIONS[self.model_var.get()], quantize=self._quantize())
+
     def _pick_color(self):
         result = askcolor(color=self.primary_color_hex, title="Choose Subtitle Color")
         if result and result[1]:
@@ -377,13 +558,6 @@ class SubtitleApp:
                 text_color=text_color,
             )
 
-    @staticmethod
-    def _hex_to_ass(hex_color):
-        """Convert #RRGGBB to ASS &H00BBGGRR format used by FFmpeg."""
-        h = hex_color.lstrip("#")
-        r, g, b = h[0:2], h[2:4], h[4:6]
-        return f"&H00{b}{g}{r}".upper()
-
     def select_video(self):
         file_path = filedialog.askopenfilename(
             filetypes=[
@@ -446,10 +620,15 @@ class SubtitleApp:
         do_srt = self.srt_var.get()
         do_burn = self.burn_var.get()
         srt_path, output_video_path = self._resolve_output_paths()
+        targets = list(dict.fromkeys(
+            LANGUAGE_OPTIONS[name]
+            for name in [self.lang_var.get()] + self.extra_languages
+        ))
 
         engine = SubtitleEngine(
             progress_callback=self._on_progress,
-            stop_check=self._stop_event.is_set
+            stop_check=self._stop_event.is_set,
+            sinks=[self._on_metrics_event],
         )
 
         try:
@@ -457,24 +636,25 @@ class SubtitleApp:
                 video_path=self.video_path,
                 model_size=MODEL_OPTIONS[self.model_var.get()],
                 srt_path=srt_path,
-                target_language=LANGUAGE_OPTIONS[self.lang_var.get()],
+                target_language=targets if len(targets) > 1 else targets[0],
                 output_video_path=output_video_path if do_burn else None,
                 do_srt=do_srt,
                 do_burn=do_burn,
                 subtitle_font=self.font_var.get() or None,
-                primary_color=self._hex_to_ass(self.primary_color_hex),
+                primary_color=hex_to_ass(self.primary_color_hex),
                 background_box=self.bg_box_var.get(),
+                output_mode=OUTPUT_MODES[self.output_mode_var.get()],
+                encoder_preset=self.preset_var.get(),
+                decoding_profile=self.profile_var.get(),
             )
-            self.root.after(
-                0, self._on_success, srt_path, output_video_path, language
-            )
+            self.ui.call(self._on_success, srt_path, output_video_path, language)
 
         except InterruptedError:
             print("Process stopped.")
-            self.root.after(0, self._on_stopped)
+            self.ui.call(self._on_stopped)
 
         except Exception as e:
-            self.root.after(0, self._on_error, str(e))
+            self.ui.call(self._on_error, str(e))
 
     # ── Control State ────────────────────────────────────────────────
 
@@ -488,13 +668,23 @@ class SubtitleApp:
         self.srt_check.configure(state=state)
         self.burn_check.configure(state=state)
         self.model_combo.configure(state=state)
+        self.profile_combo.configure(state=state)
         self.lang_combo.configure(state=state)
+        self.extra_lang_btn.configure(state=state)
         self.font_combo.configure(state=state)
         self.color_btn.configure(state=state)
         self.bg_check.configure(state=state)
+        self.output_mode_seg.configure(state=state)
+        self.preset_combo.configure(state=state)
         self.stop_btn.configure(state=stop_state)
 
+        if not locked:
+            self._on_output_mode_changed(self.output_mode_var.get())
+
         if locked:
+            self._stage_times = {}
+            self._spoken_language = None
+            self.stage_label.configure(text="")
             self.progress_bar.set(0)
             self.progress_label.configure(text="0%")
             self.status_label.configure(text="Processing video... Please wait")
@@ -506,7 +696,9 @@ class SubtitleApp:
         self.status_label.configure(text=f"Done! Detected language: {language}")
 
         msg_parts = []
-        if srt_path:
+        if isinstance(srt_path, dict):
+            msg_parts.append("SRT files:\n" + "\n".join(srt_path.values()))
+        elif srt_path:
             msg_parts.append(f"SRT file:\n{srt_path}")
         if output_video_path:
             msg_parts.append(f"Video with subtitles:\n{output_video_path}")
@@ -0,0 +1,79 @@
+import os
+import queue
+import time
+
+from config import UI_TICK_MS, GUI_LOG_DIR, GUI_LOG_FILES_KEPT
+
+
+def open_session_log(directory=GUI_LOG_DIR, keep=GUI_LOG_FILES_KEPT):
+    """Open a new timestamped log file, deleting all but the newest ``keep``."""
+    os.makedirs(directory, exist_ok=True)
+    old = sorted(name for name in os.listdir(directory) if name.endswith(".log"))
+    for name in old[:max(0, len(old) - keep + 1)]:
+        try:
+            os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+    path = os.path.join(directory, time.strftime("session-%Y%m%d-%H%M%S.log"))
+    return open(path, "a", encoding="utf-8")
+
+
+class UiChannel:
+    """Buffered hand-off of worker-thread updates to the Tk main loop.
+
+    Workers only put items on a thread-safe queue. Every ``UI_TICK_MS`` the
+    main loop drains it: log text is joined into a single insert (and
+    appended to the session log file), progress collapses to the latest
+    value and status, and queued calls run in order. Tk never sees more
+    than one batch of updates per tick, however chatty the workers are.
+    """
+
+    def __init__(self, root, on_log, on_progress, log_file=None, tick_ms=UI_TICK_MS):
+        self.root = root
+        self.on_log = on_log
+        self.on_progress = on_progress
+        self.log_file = log_file
+        self.tick_ms = tick_ms
+        self._queue = queue.SimpleQueue()
+        self.root.after(self.tick_ms, self._drain)
+
+    def log(self, text):
+        self._queue.put(("log", text))
+
+    def progress(self, value, status_text=None):
+        self._queue.put(("progress", value, status_text))
+
+    def call(self, fn, *args):
+        """Run ``fn(*args)`` on the main loop at the next tick."""
+        self._queue.put(("call", fn, args))
+
+    def _drain(self):
+        logs = []
+        value = status = None
+        calls = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == "log":
+                logs.append(item[1])
+            elif item[0] == "progress":
+                value = item[1]
+                status = item[2] or status
+            else:
+                calls.append(item[1:])
+
+        try:
+            if logs:
+                text = "".join(logs)
+                if self.log_file:
+                    self.log_file.write(text)
+                    self.log_file.flush()
+                self.on_log(text)
+            if value is not None:
+                self.on_progress(value, status)
+            for fn, args in calls:
+                fn(*args)
+        finally:
+            self.root.after(self.tick_ms, self._drain)
@@ -0,0 +1,10 @@
+import os
+import sys
+import tempfile
+
+# Caches, job checkpoints and logs live under the home folder (see
+# config.CACHE_DIR); point it at a scratch folder before config is imported.
+_home = tempfile.mkdtemp(prefix="subtitle-tests-")
+os.environ["HOME"] = os.environ["USERPROFILE"] = _home
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
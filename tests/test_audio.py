@@ -0,0 +1,49 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+import engine.audio as audio_module
+from engine.audio import BYTES_PER_SAMPLE, SAMPLE_RATE, extract_audio
+
+SECONDS = 75.3
+
+
+@pytest.fixture
+def decoder(monkeypatch):
+    """Stands in for ffmpeg: streams SECONDS of 0.25 as raw float32."""
+    script = (
+        "import sys, numpy as np; "
+        f"sys.stdout.buffer.write(np.full({int(SECONDS * SAMPLE_RATE)}, 0.25, np.float32).tobytes())"
+    )
+
+    def popen(cmd, **kwargs):
+        return subprocess.Popen([sys.executable, "-c", script], **kwargs)
+
+    monkeypatch.setattr(audio_module.ffmpeg, "popen", popen)
+    monkeypatch.setattr(audio_module, "probe_duration", lambda path: SECONDS)
+
+
+def test_audio_in_memory_keeps_no_spare_capacity(decoder):
+    audio = extract_audio("talk.mp4")
+
+    assert len(audio) == int(SECONDS * SAMPLE_RATE)
+    assert audio.base is None
+    assert np.all(audio == 0.25)
+
+
+@pytest.mark.parametrize("probed", [SECONDS, SECONDS - 20])
+def test_spilled_audio_file_holds_just_the_samples(decoder, tmp_path, monkeypatch, probed):
+    monkeypatch.setattr(audio_module, "AUDIO_MEMMAP_THRESHOLD_SECONDS", 30)
+    monkeypatch.setattr(audio_module, "probe_duration", lambda path: probed)
+    path = tmp_path / "audio.f32"
+    reserved = []
+    audio = extract_audio("talk.mp4", str(path), reserve=reserved.append)
+
+    assert isinstance(audio, np.memmap)
+    assert len(audio) == int(SECONDS * SAMPLE_RATE)
+    assert path.stat().st_size == len(audio) * BYTES_PER_SAMPLE
+    # A duration probed too short grows the file once; an accurate one never.
+    assert len(reserved) == (1 if probed == SECONDS else 2)
+    assert audio[-1] == 0.25
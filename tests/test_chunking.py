@@ -0,0 +1,74 @@
+"""Chunked transcription must give the same timeline as decoding the audio whole."""
+
+import numpy as np
+import pytest
+
+from config import CHUNK_OVERLAP_SECONDS
+from engine.asr import FakeAsrBackend
+from engine.audio import SAMPLE_RATE
+from engine.chunking import SegmentStitcher, pad_windows, split_on_silence
+from engine.transcribe import collect_segments, decode_options, iter_transcribe_chunked
+
+# Bursts of sound, some of them close to where the windows get cut.
+SOUNDS = [(1.0, 4.0), (9.5, 11.5), (18.0, 24.5), (29.0, 31.0), (38.5, 41.0), (47.0, 52.0)]
+DURATION = 60.0
+CHUNK_SECONDS = 10
+
+
+def make_audio():
+    rng = np.random.default_rng(1)
+    audio = np.zeros(int(DURATION * SAMPLE_RATE), dtype=np.float32)
+    for start, end in SOUNDS:
+        span = slice(int(start * SAMPLE_RATE), int(end * SAMPLE_RATE))
+        audio[span] = rng.choice([-0.3, 0.3], span.stop - span.start)
+    return audio
+
+
+def timeline(segments):
+    return [(round(s["start"], 3), round(s["end"], 3), s["text"]) for s in segments]
+
+
+def serial(audio):
+    return FakeAsrBackend("tiny", "cpu").transcribe(audio)["segments"]
+
+
+def test_stitched_windows_match_a_single_window():
+    audio = make_audio()
+    model = FakeAsrBackend("tiny", "cpu")
+    windows = split_on_silence(audio, CHUNK_SECONDS)
+    padded = pad_windows(windows, CHUNK_OVERLAP_SECONDS, len(audio))
+    assert len(windows) > 2
+
+    stitcher = SegmentStitcher()
+    stitched = []
+    for owned, (start, end) in zip(windows, padded):
+        segments = model.transcribe(audio[start:end])["segments"]
+        stitched += stitcher.add(owned, (start, end), segments)
+
+    assert timeline(stitched) == timeline(serial(audio))
+    assert [s["id"] for s in stitched] == list(range(len(stitched)))
+
+
+def test_chunked_transcription_matches_the_serial_path():
+    audio = make_audio()
+    result = collect_segments(iter_transcribe_chunked(
+        "tiny", audio, "original", workers=2, chunk_seconds=CHUNK_SECONDS,
+        options=decode_options(), backend=FakeAsrBackend,
+    ))
+
+    assert timeline(result["segments"]) == timeline(serial(audio))
+    assert result["language"] == FakeAsrBackend.language
+
+
+def test_stopping_chunked_transcription_ends_the_workers():
+    audio = make_audio()
+    batches = []
+
+    with pytest.raises(InterruptedError):
+        for batch in iter_transcribe_chunked(
+            "tiny", audio, "original", workers=2, chunk_seconds=CHUNK_SECONDS,
+            stop_check=lambda: bool(batches), backend=FakeAsrBackend,
+        ):
+            batches.append(batch)
+
+    assert len(batches) == 1
@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from engine.checkpoint import JobCheckpoint
+from engine.cli import is_up_to_date, plan_outputs
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "talk.mp4"
+    path.write_bytes(b"not really a video")
+    os.utime(path, (1000, 1000))
+    return str(path)
+
+
+def write(path, mtime=2000):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("1\n00:00:01,000 --> 00:00:02,000\nhi\n")
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+def test_single_language_outputs(video, tmp_path):
+    srt_path, video_out, expected = plan_outputs(
+        video, None, ["es"], do_srt=True, do_burn=True, output_mode="burn",
+    )
+
+    assert srt_path == str(tmp_path / "talk.srt")
+    assert video_out == str(tmp_path / "talk_subtitled.mp4")
+    assert expected == [srt_path, video_out]
+
+
+def test_outputs_per_language_in_another_folder(video, tmp_path):
+    srt_path, _, expected = plan_outputs(
+        video, str(tmp_path / "out"), ["en", "es"], do_srt=True, do_burn=False,
+        output_mode="burn", subtitle_format="vtt",
+    )
+
+    assert srt_path == str(tmp_path / "out" / "talk.vtt")
+    assert expected == [str(tmp_path / "out" / "talk.en.vtt"), str(tmp_path / "out" / "talk.es.vtt")]
+
+
+def test_soft_subtitles_switch_to_mkv_when_the_container_cannot_hold_them(tmp_path):
+    video = str(tmp_path / "talk.avi")
+    _, video_out, expected = plan_outputs(
+        video, None, ["es"], do_srt=False, do_burn=True, output_mode="soft",
+    )
+
+    assert video_out == str(tmp_path / "talk_subtitled.mkv")
+    assert expected == [video_out]
+
+
+def test_up_to_date_needs_every_output_newer_than_the_input(video, tmp_path):
+    outputs = [str(tmp_path / "talk.en.srt"), str(tmp_path / "talk.es.srt")]
+    assert not is_up_to_date(video, [])
+
+    write(outputs[0])
+    assert not is_up_to_date(video, outputs)
+
+    write(outputs[1], mtime=500)
+    assert not is_up_to_date(video, outputs)
+
+    write(outputs[1])
+    assert is_up_to_date(video, outputs)
+
+
+def test_interrupted_job_is_not_up_to_date(video, tmp_path):
+    outputs = [write(str(tmp_path / "talk.srt"))]
+    checkpoint = JobCheckpoint(video, ["tiny", "original"])
+    checkpoint.save_language("en", 1.0)
+    assert not is_up_to_date(video, outputs)
+
+    checkpoint.discard()
+    assert is_up_to_date(video, outputs)
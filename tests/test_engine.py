@@ -0,0 +1,271 @@
+"""End-to-end runs of SubtitleEngine.generate with the offline fake backends.
+
+Audio extraction is replaced by a synthetic signal with bursts of sound at
+known times; FakeAsrBackend turns each burst into a cue, so the expected
+subtitles are known exactly.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import engine.engine as engine_module
+import engine.translate as translate_module
+from config import SUBTITLE_MIN_GAP
+from engine import FakeAsrBackend, FakeBackend, MemorySink, SubtitleEngine
+from engine.audio import SAMPLE_RATE
+from engine.checkpoint import JobCheckpoint
+from engine.subtitles import read_subtitles
+from engine.transcribe import model_cache
+from engine.transcript_cache import TranscriptCache
+
+DURATION = 150.0
+# Bursts longer than FakeAsrBackend.segment_seconds are split evenly; the
+# first half ends SUBTITLE_MIN_GAP early to keep the cues apart.
+SOUNDS = [(2.0, 5.0), (8.0, 12.0), (20.0, 26.0), (70.0, 73.0), (130.0, 134.0)]
+EXPECTED = [
+    (2.0, 5.0, "Sound of 3.0 seconds."),
+    (8.0, 12.0, "Sound of 4.0 seconds."),
+    (20.0, 23.0 - SUBTITLE_MIN_GAP, "Sound of 3.0 seconds."),
+    (23.0, 26.0, "Sound of 3.0 seconds."),
+    (70.0, 73.0, "Sound of 3.0 seconds."),
+    (130.0, 134.0, "Sound of 4.0 seconds."),
+]
+
+
+def make_audio():
+    rng = np.random.default_rng(0)
+    audio = np.zeros(int(DURATION * SAMPLE_RATE), dtype=np.float32)
+    for start, end in SOUNDS:
+        span = slice(int(start * SAMPLE_RATE), int(end * SAMPLE_RATE))
+        audio[span] = rng.choice([-0.3, 0.3], span.stop - span.start)
+    return audio
+
+
+@pytest.fixture
+def video(tmp_path, monkeypatch):
+    """A dummy input file whose "extracted" audio is ``make_audio()``."""
+    path = tmp_path / "talk.mp4"
+    path.write_bytes(b"not really a video")
+    audio = make_audio()
+    monkeypatch.setattr(engine_module, "extract_audio", lambda *args, **kwargs: audio.copy())
+    monkeypatch.setattr(engine_module, "probe_duration", lambda path: DURATION)
+    return str(path)
+
+
+def make_engine(streaming, **kwargs):
+    return SubtitleEngine(
+        vad=False,
+        streaming=streaming,
+        translation_backend=FakeBackend(),
+        asr_backend=FakeAsrBackend,
+        transcript_cache=False,
+        stage_costs=False,
+        **kwargs,
+    )
+
+
+def output(tmp_path, folder):
+    directory = tmp_path / folder
+    directory.mkdir()
+    return str(directory / "talk.srt")
+
+
+def cues(path):
+    return [(s["start"], s["end"], s["text"]) for s in read_subtitles(path)]
+
+
+def assert_cues(path, prefix=""):
+    actual = cues(path)
+    assert [text for _, _, text in actual] == [prefix + text for _, _, text in EXPECTED]
+    for (start, end, _), (want_start, want_end, _) in zip(actual, EXPECTED):
+        assert start == pytest.approx(want_start, abs=0.002)
+        assert end == pytest.approx(want_end, abs=0.002)
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_cues_follow_the_audio(video, tmp_path, streaming):
+    sink = MemorySink()
+    engine = make_engine(streaming, sinks=[sink])
+    srt_path, video_path, language = engine.generate(
+        video, "tiny", output(tmp_path, "out"), target_language="original",
+    )
+
+    assert language == "en"
+    assert video_path is None
+    assert_cues(srt_path)
+    assert {"extract", "transcribe"} <= set(sink.stages())
+    jobs = [e for e in sink.events if e["event"] == "job"]
+    assert [job["status"] for job in jobs] == ["done"]
+    assert [e["language"] for e in sink.events if e["event"] == "language"] == ["en"]
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_several_target_languages(video, tmp_path, streaming):
+    engine = make_engine(streaming)
+    paths, _, _ = engine.generate(
+        video, "tiny", output(tmp_path, "out"), target_language=["en", "es", "fr"],
+    )
+
+    assert sorted(paths) == ["en", "es", "fr"]
+    assert paths["es"].endswith("talk.es.srt")
+    assert_cues(paths["en"])
+    assert_cues(paths["es"], prefix="[es] ")
+    assert_cues(paths["fr"], prefix="[fr] ")
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_stopped_job_resumes_with_identical_output(video, tmp_path, streaming):
+    targets = ["en", "es"]
+    reference, _, _ = make_engine(streaming).generate(
+        video, "tiny", output(tmp_path, "reference"), target_language=targets,
+    )
+
+    model = model_cache.get("tiny", backend=FakeAsrBackend)
+    model.calls.clear()
+    sink = MemorySink()
+
+    def stop_check():
+        if streaming:
+            # After the first window: later windows are still to decode.
+            return len(model.calls) > 0
+        # After the transcript is saved, before the translations.
+        return "transcribe" in sink.stages()
+
+    srt_path = output(tmp_path, "resumed")
+    with pytest.raises(InterruptedError):
+        make_engine(streaming, stop_check=stop_check, sinks=[sink]).generate(
+            video, "tiny", srt_path, target_language=targets,
+        )
+    decoded_before_stop = sum(call["samples"] for call in model.calls)
+    model.calls.clear()
+
+    resumed, _, _ = make_engine(streaming).generate(
+        video, "tiny", srt_path, target_language=targets,
+    )
+
+    decoded_after_resume = sum(call["samples"] for call in model.calls)
+    if streaming:
+        assert 0 < decoded_after_resume < len(make_audio())
+    else:
+        assert decoded_before_stop and decoded_after_resume == 0
+    for language in targets:
+        assert cues(resumed[language]) == cues(reference[language])
+
+
+def test_stopped_parallel_burn_keeps_its_finished_parts(video, tmp_path, monkeypatch):
+    seen = []
+
+    def burn(video_path, srt_path, output_video_path, parts, work_dir, **kwargs):
+        # Stands in for burn_subtitles_parallel: the first run finishes one
+        # part and is stopped; the second must find it again.
+        part = os.path.join(work_dir, "part0.mp4")
+        seen.append(os.path.exists(part))
+        if len(seen) == 1:
+            with open(part, "wb") as f:
+                f.write(b"encoded")
+            raise InterruptedError("Process stopped by user.")
+        with open(output_video_path, "wb") as f:
+            f.write(b"video")
+
+    monkeypatch.setattr(engine_module, "burn_subtitles_parallel", burn)
+    srt_path = output(tmp_path, "out")
+    output_video = str(tmp_path / "out" / "talk_subtitled.mp4")
+    for _ in range(2):
+        try:
+            make_engine(False, burn_parts=2).generate(
+                video, "tiny", srt_path, target_language="original",
+                output_video_path=output_video, do_burn=True,
+            )
+        except InterruptedError:
+            pass
+
+    assert seen == [False, True]
+    assert os.path.exists(output_video)
+
+
+@pytest.mark.parametrize("fail_on", ["translate", "stop"])
+def test_failed_stream_leaves_no_partial_subtitles(video, tmp_path, monkeypatch, fail_on):
+    class Failing(FakeBackend):
+        def translate_text(self, text, source, target):
+            if fail_on == "translate":
+                raise RuntimeError("service unavailable")
+            return super().translate_text(text, source, target)
+
+    monkeypatch.setattr(translate_module, "TRANSLATION_MAX_RETRIES", 0)
+    model = model_cache.get("tiny", backend=FakeAsrBackend)
+    model.calls.clear()
+    engine = make_engine(True, stop_check=lambda: fail_on == "stop" and len(model.calls) > 1)
+    engine.translation_backend = Failing()
+    srt_path = output(tmp_path, "out")
+
+    with pytest.raises((RuntimeError, InterruptedError)):
+        # A language no other test translates into, so nothing is cached.
+        engine.generate(video, "tiny", srt_path, target_language=["en", "ja"])
+
+    assert os.listdir(tmp_path / "out") == []
+
+
+@pytest.mark.parametrize("enabled", [False, True])
+def test_word_timestamps_follow_the_engine_setting(video, tmp_path, enabled):
+    model = model_cache.get("tiny", backend=FakeAsrBackend)
+    model.calls.clear()
+    make_engine(False, resegment=enabled).generate(
+        video, "tiny", output(tmp_path, "out"), target_language="original",
+    )
+
+    decodes = [call for call in model.calls if call["samples"]]
+    assert decodes and all(call["word_timestamps"] is enabled for call in decodes)
+
+
+def test_audio_is_checkpointed_only_when_the_job_does_not_finish(video, tmp_path, monkeypatch):
+    saved = []
+    save_audio = JobCheckpoint.save_audio
+    monkeypatch.setattr(
+        JobCheckpoint, "save_audio",
+        lambda self, audio: saved.append(len(audio)) or save_audio(self, audio),
+    )
+    model = model_cache.get("tiny", backend=FakeAsrBackend)
+    srt_path = output(tmp_path, "out")
+
+    make_engine(True).generate(video, "tiny", srt_path, target_language="original")
+    assert saved == []
+
+    model.calls.clear()
+    with pytest.raises(InterruptedError):
+        make_engine(True, stop_check=lambda: len(model.calls) > 0).generate(
+            video, "tiny", output(tmp_path, "stopped"), target_language="original",
+        )
+    assert saved == [len(make_audio())]
+
+
+def test_chunked_job_detects_the_language_with_a_small_model(video, tmp_path):
+    model_cache.clear()
+    paths, _, language = make_engine(False, workers=2, chunk_seconds=30).generate(
+        video, "small", output(tmp_path, "out"), target_language=["en", "es"],
+    )
+
+    assert language == "en"
+    assert_cues(paths["es"], prefix="[es] ")
+    # Only the workers load the job's model.
+    assert model_cache.is_loaded("base", backend=FakeAsrBackend)
+    assert not model_cache.is_loaded("small", backend=FakeAsrBackend)
+
+
+def test_second_run_reuses_the_cached_transcript(video, tmp_path):
+    model = model_cache.get("tiny", backend=FakeAsrBackend)
+    first = make_engine(False)
+    first.transcript_cache = TranscriptCache(str(tmp_path / "transcripts"))
+    first.generate(video, "tiny", output(tmp_path, "first"), target_language="original")
+
+    model.calls.clear()
+    second = make_engine(False)
+    second.transcript_cache = first.transcript_cache
+    srt_path, _, language = second.generate(
+        video, "tiny", output(tmp_path, "second"), target_language="es",
+    )
+
+    assert model.calls == []
+    assert language == "en"
+    assert_cues(srt_path, prefix="[es] ")
@@ -0,0 +1,74 @@
+import pytest
+
+from engine.metrics import PROGRESS_BANDS, MemorySink, StageCosts, StageTimer, WeightedProgress
+
+
+@pytest.fixture
+def costs(tmp_path):
+    costs = StageCosts(str(tmp_path / "stage_costs.json"))
+    costs.costs.update({
+        "extract": 1.0, "model_load": 1.0, "transcribe": 6.0,
+        "translate": 1.0, "srt": 1.0, "burn": 10.0, "mux": 0.0,
+    })
+    return costs
+
+
+def run(values, stages, costs, **kw):
+    reported = []
+    progress = WeightedProgress(lambda value, status: reported.append((value, status)), stages, costs, **kw)
+    for value in values:
+        progress(value, f"at {value}")
+    return [value for value, _ in reported]
+
+
+def test_bands_are_rescaled_by_stage_cost(costs):
+    stages = {"extract", "model_load", "transcribe", "srt"}
+    # Band starts, the middle of transcription, and the end.
+    reported = run([0, 10, 25, 42.5, 60, 70, 100], stages, costs)
+
+    assert reported == pytest.approx([0, 100 / 9, 200 / 9, 200 / 9 + 100 / 3, 800 / 9, 800 / 9, 100])
+
+
+def test_final_stage_takes_the_burn_band(costs):
+    burn = run([80], {"transcribe", "burn"}, costs)
+    mux = run([80], {"transcribe", "mux"}, costs, final_stage="mux")
+
+    assert burn == pytest.approx([37.5])
+    assert mux == pytest.approx([100])
+
+
+def test_progress_never_moves_backwards(costs):
+    reported = run([30, 20, 95, 50], {"extract", "transcribe"}, costs)
+
+    assert reported == sorted(reported)
+    assert reported[-1] == 100
+
+
+def test_every_band_value_maps_inside_0_100(costs):
+    values = [low + step * (high - low) / 4 for low, high, _ in PROGRESS_BANDS for step in range(4)]
+    reported = run(values, {name for _, _, name in PROGRESS_BANDS}, costs)
+
+    assert reported == sorted(reported)
+    assert all(0 <= value <= 100 for value in reported)
+
+
+def test_stage_costs_move_towards_measurements_and_persist(costs):
+    costs.update({"transcribe": 20.0}, audio_seconds=10.0)
+
+    assert costs.estimate("transcribe") == pytest.approx(6.0 + StageCosts.SMOOTHING * (2.0 - 6.0))
+    assert StageCosts(costs.path).estimate("transcribe") == pytest.approx(costs.estimate("transcribe"))
+    assert costs.estimate("unknown") == 0.01
+
+
+def test_memory_sink_totals_stage_time():
+    sink = MemorySink()
+    for stage in ["extract", "transcribe", "transcribe"]:
+        sink(StageTimer(stage).event(audio_seconds=10.0))
+    sink({"event": "job", "wall_seconds": 99.0})
+
+    totals = sink.stages()
+    assert set(totals) == {"extract", "transcribe"}
+    assert totals["transcribe"] == pytest.approx(
+        sink.events[1]["wall_seconds"] + sink.events[2]["wall_seconds"]
+    )
+    assert sink.events[0]["audio_seconds"] == 10.0
@@ -0,0 +1,80 @@
+import threading
+import time
+
+from engine import FakeAsrBackend
+from engine.transcribe import ModelCache
+
+MB = 1024 * 1024
+SIZES_MB = {"tiny": 40, "base": 80, "small": 250}
+
+
+class SizedBackend(FakeAsrBackend):
+    """FakeAsrBackend that reports a model size and counts its loads."""
+
+    loads = []
+
+    def __init__(self, model_size, device, quantize=False, threads=None):
+        super().__init__(model_size, device, quantize, threads)
+        self.nbytes = SIZES_MB[model_size] * MB
+        self.loads.append(model_size)
+        time.sleep(0.05)
+
+
+def make_cache(budget_mb):
+    SizedBackend.loads = []
+    return ModelCache(budget_mb=budget_mb)
+
+
+def loaded(cache):
+    return [size for size in SIZES_MB if cache.is_loaded(size, backend=SizedBackend)]
+
+
+def test_least_recently_used_model_is_evicted_over_budget():
+    cache = make_cache(budget_mb=300)
+    tiny = cache.get("tiny", backend=SizedBackend)
+    cache.get("base", backend=SizedBackend)
+    assert cache.get("tiny", backend=SizedBackend) is tiny  # tiny is now the newest
+
+    cache.get("small", backend=SizedBackend)
+
+    assert loaded(cache) == ["tiny", "small"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 3)
+    assert stats["cached_mb"] == 290
+
+
+def test_a_model_over_budget_alone_is_still_kept():
+    cache = make_cache(budget_mb=100)
+    cache.get("tiny", backend=SizedBackend)
+    cache.get("small", backend=SizedBackend)
+
+    assert loaded(cache) == ["small"]
+    assert cache.get("small", backend=SizedBackend).model_size == "small"
+    assert SizedBackend.loads == ["tiny", "small"]
+
+
+def test_concurrent_requests_share_one_load():
+    cache = make_cache(budget_mb=300)
+    models = []
+    threads = [
+        threading.Thread(target=lambda: models.append(cache.get("base", backend=SizedBackend)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert SizedBackend.loads == ["base"]
+    assert len(models) == 4 and all(model is models[0] for model in models)
+
+
+def test_preload_makes_the_next_get_a_hit():
+    cache = make_cache(budget_mb=300)
+    cache.preload("tiny", backend=SizedBackend).join()
+
+    cache.get("tiny", backend=SizedBackend)
+
+    assert cache.stats()["hits"] == 1
+    cache.clear()
+    assert loaded(cache) == []
@@ -0,0 +1,64 @@
+import pytest
+
+from engine.resegment import SPLIT_PAUSE_SECONDS, resegment, wrap_text
+
+
+def words(text, start, step=0.3):
+    return [
+        {"word": " " + word, "start": start + i * step, "end": start + (i + 1) * step - 0.05}
+        for i, word in enumerate(text.split())
+    ]
+
+
+def segment(text, start, with_words=True):
+    items = words(text, start)
+    result = {"start": items[0]["start"], "end": items[-1]["end"], "text": " " + text}
+    if with_words:
+        result["words"] = items
+    return result
+
+
+def test_cues_break_after_sentences_and_long_pauses():
+    first = "This is the first sentence of the talk and it is long enough."
+    pause_at = 4.0 + SPLIT_PAUSE_SECONDS + 10
+    segments = [
+        segment(first + " Then another one", 0.0),
+        segment("after a pause.", pause_at),
+    ]
+
+    cues = resegment(segments)
+
+    assert [cue["text"].replace("\n", " ") for cue in cues] == [
+        first, "Then another one", "after a pause.",
+    ]
+    assert cues[2]["start"] == pytest.approx(pause_at)
+    assert cues[0]["end"] <= cues[1]["start"]
+
+
+def test_cues_respect_line_limits_and_duration():
+    text = " ".join(f"word{i}" for i in range(60))
+    cues = resegment([segment(text, 0.0)], max_chars=20, max_lines=2, max_duration=3.0)
+
+    for cue in cues:
+        lines = cue["text"].split("\n")
+        assert len(lines) <= 2
+        assert all(len(line) <= 20 for line in lines)
+        assert cue["end"] - cue["start"] <= 3.0
+    assert " ".join(cue["text"].replace("\n", " ") for cue in cues) == text
+
+
+def test_segments_without_words_are_only_wrapped():
+    text = "A segment decoded without word timestamps that is too long for one line."
+    cues = resegment([segment(text, 5.0, with_words=False)])
+
+    assert len(cues) == 1
+    assert cues[0]["text"] == wrap_text(text)
+    assert "\n" in cues[0]["text"]
+
+
+def test_consecutive_cues_keep_the_minimum_gap():
+    segments = [segment("One.", 0.0, with_words=False), segment("Two.", 0.26, with_words=False)]
+    cues = resegment(segments, min_gap=0.1)
+
+    assert cues[1]["start"] - cues[0]["end"] == pytest.approx(0.1)
+
@@ -0,0 +1,90 @@
+import pytest
+
+from engine.subtitles import (
+    SubtitleStyle,
+    SubtitleWriter,
+    read_subtitles,
+    subtitle_format,
+    write_subtitles,
+)
+
+SEGMENTS = [
+    {"id": 0, "start": 1.0, "end": 2.5, "text": " Hello there."},
+    {"id": 1, "start": 3661.2345, "end": 3662.0, "text": "Two lines,\nwith {braces}."},
+]
+
+
+def texts(segments):
+    return [(s["start"], s["end"], s["text"]) for s in segments]
+
+
+def test_srt_layout(tmp_path):
+    path = str(tmp_path / "talk.srt")
+    write_subtitles(SEGMENTS, path)
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == (
+            "1\n00:00:01,000 --> 00:00:02,500\nHello there.\n\n"
+            "2\n01:01:01,235 --> 01:01:02,000\nTwo lines,\nwith {braces}.\n\n"
+        )
+
+
+def test_vtt_layout(tmp_path):
+    path = str(tmp_path / "talk.vtt")
+    write_subtitles(SEGMENTS, path)
+
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    assert content.startswith("WEBVTT\n\n1\n00:00:01.000 --> 00:00:02.500\nHello there.\n")
+
+
+def test_ass_carries_the_style_and_escapes_text(tmp_path):
+    path = str(tmp_path / "talk.ass")
+    write_subtitles(SEGMENTS, path, style=SubtitleStyle("Verdana", "&H0000FFFF", True))
+
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+    assert "Style: Default,Verdana,16,&H0000FFFF," in content
+    assert ",&H80000000,0,0,0,0,100,100,0,0,3," in content  # background box
+    assert "Dialogue: 0,0:00:01.00,0:00:02.50,Default,,0,0,0,,Hello there.\n" in content
+    assert "Two lines,\\Nwith \\{braces\\}." in content
+
+
+@pytest.mark.parametrize("ext", [".srt", ".vtt", ".ass"])
+def test_written_files_read_back(tmp_path, ext):
+    path = str(tmp_path / ("talk" + ext))
+    write_subtitles(SEGMENTS, path)
+
+    # ASS keeps centiseconds, the others milliseconds.
+    precision = 0.01 if ext == ".ass" else 0.001
+    for (start, end, text), segment in zip(texts(read_subtitles(path)), SEGMENTS):
+        assert start == pytest.approx(segment["start"], abs=precision)
+        assert end == pytest.approx(segment["end"], abs=precision)
+        assert text == segment["text"].strip()
+
+
+def test_unknown_extension_is_rejected():
+    with pytest.raises(ValueError):
+        subtitle_format("talk.sub")
+
+
+def test_writer_only_replaces_the_output_on_commit(tmp_path):
+    path = tmp_path / "talk.srt"
+    path.write_text("previous run\n", encoding="utf-8")
+
+    writer = SubtitleWriter(str(path))
+    writer.write(SEGMENTS[:1])
+    assert path.read_text(encoding="utf-8") == "previous run\n"
+    writer.write(SEGMENTS[1:])
+    writer.commit()
+
+    assert [s["text"] for s in read_subtitles(str(path))] == ["Hello there.", "Two lines,\nwith {braces}."]
+    assert not (tmp_path / "talk.srt.partial").exists()
+
+
+def test_discarded_writer_leaves_nothing(tmp_path):
+    writer = SubtitleWriter(str(tmp_path / "talk.vtt"))
+    writer.write(SEGMENTS)
+    writer.discard()
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,86 @@
+import os
+
+from engine.transcript_cache import TranscriptCache, file_fingerprint
+
+RESULT = {
+    "text": " Hello there. Bye.",
+    "language": "en",
+    "segments": [
+        {
+            "id": 0, "start": 0.5, "end": 1.7501, "text": " Hello there.",
+            "words": [
+                {"start": 0.5, "end": 0.9, "word": " Hello"},
+                {"start": 1.0, "end": 1.7501, "word": " there."},
+            ],
+        },
+        {"id": 1, "start": 2.0, "end": 2.5, "text": " Bye."},
+    ],
+}
+
+
+def test_results_round_trip(tmp_path):
+    cache = TranscriptCache(str(tmp_path))
+    key = cache.key("fingerprint", "tiny", "transcribe")
+    assert cache.get(key) is None
+
+    cache.put(key, RESULT)
+    result = cache.get(key)
+
+    assert result["language"] == "en"
+    assert result["text"] == RESULT["text"]
+    assert result["segments"][0]["end"] == 1.75
+    assert result["segments"][0]["words"][1] == {"start": 1.0, "end": 1.75, "word": " there."}
+    assert "words" not in result["segments"][1]
+
+
+def test_key_covers_everything_that_changes_the_transcript():
+    key = TranscriptCache.key("fingerprint", "tiny", "transcribe", {"beam_size": 5, "vad": True})
+
+    assert key == TranscriptCache.key("fingerprint", "tiny", "transcribe", {"vad": True, "beam_size": 5})
+    assert len({
+        key,
+        TranscriptCache.key("other", "tiny", "transcribe", {"beam_size": 5, "vad": True}),
+        TranscriptCache.key("fingerprint", "base", "transcribe", {"beam_size": 5, "vad": True}),
+        TranscriptCache.key("fingerprint", "tiny", "translate", {"beam_size": 5, "vad": True}),
+        TranscriptCache.key("fingerprint", "tiny", "transcribe", {"beam_size": 1, "vad": True}),
+    }) == 5
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = TranscriptCache(str(tmp_path))
+    for i, name in enumerate(["a", "b"]):
+        cache.put(name, RESULT)
+        os.utime(cache._path(name), (1000 + i, 1000 + i))
+    cache.get("a")  # now the most recently used
+
+    cache.max_bytes = os.path.getsize(cache._path("a")) * 2
+    cache.put("c", RESULT)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json.gz", "c.json.gz"]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = TranscriptCache(str(tmp_path))
+    with open(cache._path("broken"), "wb") as f:
+        f.write(b"not gzip")
+
+    assert cache.get("broken") is None
+
+
+def test_fingerprint_follows_content_and_mtime(tmp_path):
+    path = tmp_path / "talk.mp4"
+    path.write_bytes(os.urandom(3 * 1024 * 1024))
+    os.utime(path, (1000, 1000))
+    fingerprint = file_fingerprint(str(path))
+    assert file_fingerprint(str(path)) == fingerprint
+
+    os.utime(path, (2000, 2000))
+    assert file_fingerprint(str(path)) != fingerprint
+
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    os.utime(path, (2000, 2000))
+    changed = file_fingerprint(str(path))
+    os.utime(path, (1000, 1000))
+    assert changed != fingerprint and file_fingerprint(str(path)) != fingerprint
@@ -0,0 +1,51 @@
+import pytest
+
+from engine.translate import BATCH_DELIMITER, FakeBackend, TranslationBackend, translate_segments
+from engine.translation_cache import TranslationCache
+
+
+def test_incomplete_backend_fails_on_creation():
+    class Incomplete(TranslationBackend):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_lines_are_packed_into_few_requests(tmp_path):
+    backend = FakeBackend()
+    segments = [{"id": i, "start": i, "end": i + 1, "text": f" line {i}"} for i in range(50)]
+    translate_segments(
+        segments, "de", backend=backend, cache=TranslationCache(str(tmp_path / "cache.sqlite")),
+        verbose=False,
+    )
+
+    assert [s["text"] for s in segments] == [f"[de] line {i}" for i in range(50)]
+    assert backend.requests == 1
+
+
+def test_batch_is_split_when_lines_do_not_come_back_one_to_one():
+    class Merging(FakeBackend):
+        def translate_text(self, text, source, target):
+            # Glues two-line requests together, as services sometimes do.
+            lines = super().translate_text(text, source, target).split(BATCH_DELIMITER)
+            return " ".join(lines) if len(lines) == 2 else BATCH_DELIMITER.join(lines)
+
+    assert Merging().translate_batch(["a", "b"], "en", "de") == ["[de] a", "[de] b"]
+
+
+def test_cached_lines_are_not_shared_between_backends(tmp_path):
+    class Other(FakeBackend):
+        name = "other"
+
+        def translate_text(self, text, source, target):
+            return super().translate_text(text, source, target).replace("[de]", "<de>")
+
+    cache = TranslationCache(str(tmp_path / "cache.sqlite"))
+    fake, other = FakeBackend(), Other()
+    for backend, expected in [(fake, "[de] hello"), (other, "<de> hello"), (fake, "[de] hello")]:
+        segments = [{"id": 0, "start": 0, "end": 1, "text": " hello"}]
+        translate_segments(segments, "de", backend=backend, cache=cache, verbose=False)
+        assert segments[0]["text"] == expected
+
+    assert (fake.requests, other.requests) == (1, 1)
@@ -0,0 +1,95 @@
+import os
+import threading
+
+import pytest
+
+pytest.importorskip("customtkinter")
+
+from gui.ui_channel import UiChannel, open_session_log  # noqa: E402
+
+
+class FakeRoot:
+    """Records ``after`` callbacks instead of running a Tk main loop."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, fn):
+        self.scheduled.append((ms, fn))
+
+    def tick(self):
+        _, fn = self.scheduled.pop(0)
+        fn()
+
+
+@pytest.fixture
+def channel():
+    calls = []
+    root = FakeRoot()
+    channel = UiChannel(
+        root,
+        on_log=lambda text: calls.append(("log", text)),
+        on_progress=lambda value, status: calls.append(("progress", value, status)),
+        tick_ms=10,
+    )
+    channel.root_calls = calls
+    return channel
+
+
+def test_updates_are_batched_once_per_tick(channel):
+    channel.log("a\n")
+    channel.progress(10, "Extracting")
+    channel.log("b\n")
+    channel.progress(20)
+    channel.call(channel.root_calls.append, ("done",))
+    assert channel.root_calls == []
+
+    channel.root.tick()
+
+    assert channel.root_calls == [("log", "a\nb\n"), ("progress", 20, "Extracting"), ("done",)]
+    assert channel.root.scheduled[0][0] == 10
+
+
+def test_idle_tick_updates_nothing_and_reschedules(channel):
+    channel.root.tick()
+    channel.root.tick()
+
+    assert channel.root_calls == []
+    assert len(channel.root.scheduled) == 1
+
+
+def test_failing_call_still_reschedules(channel):
+    channel.call(lambda: 1 / 0)
+
+    with pytest.raises(ZeroDivisionError):
+        channel.root.tick()
+    assert len(channel.root.scheduled) == 1
+
+
+def test_updates_from_many_threads_all_arrive(channel):
+    def worker(n):
+        for i in range(100):
+            channel.log(f"{n}:{i}\n")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    channel.root.tick()
+
+    (kind, text), = channel.root_calls
+    assert kind == "log"
+    assert len(text.splitlines()) == 400
+
+
+def test_session_logs_keep_the_newest_files(tmp_path):
+    for i in range(5):
+        (tmp_path / f"session-2024010{i}-000000.log").write_text("old")
+
+    with open_session_log(str(tmp_path), keep=3) as f:
+        f.write("new")
+
+    names = sorted(os.listdir(tmp_path))
+    assert len(names) == 3
+    assert names[:2] == ["session-20240103-000000.log", "session-20240104-000000.log"]
@@ -0,0 +1,35 @@
+import numpy as np
+
+from engine.audio import SAMPLE_RATE
+from engine.vad import compact_speech
+
+INTERVALS = [(1.0, 2.0), (5.0, 6.5)]
+
+
+def make_audio(path):
+    audio = np.memmap(path, dtype=np.float32, mode="w+", shape=(10 * SAMPLE_RATE,))
+    audio[:] = np.arange(len(audio), dtype=np.float32)
+    return audio
+
+
+def test_spilled_audio_is_compacted_on_disk(tmp_path):
+    audio = make_audio(str(tmp_path / "audio.f32"))
+    reserved = []
+    compact, timeline = compact_speech(
+        audio, INTERVALS, path=str(tmp_path / "speech.f32"), reserve=reserved.append,
+    )
+
+    assert isinstance(compact, np.memmap)
+    assert reserved == [len(compact) * 4]
+    assert len(compact) == int(2.5 * SAMPLE_RATE)
+    assert compact[0] == 1 * SAMPLE_RATE
+    assert compact[SAMPLE_RATE] == 5 * SAMPLE_RATE
+    assert timeline.to_original(1.5) == 5.5
+
+
+def test_audio_in_memory_stays_in_memory(tmp_path):
+    audio = np.array(make_audio(str(tmp_path / "audio.f32")))
+    compact, _ = compact_speech(audio, INTERVALS, path=str(tmp_path / "speech.f32"))
+
+    assert not isinstance(compact, np.memmap)
+    assert not (tmp_path / "speech.f32").exists()